@@ -1,14 +1,20 @@
-import heapq
+import argparse
 import math
+import os
 import random
 import sys
-from collections import defaultdict
+import time
 from pathlib import Path
 from typing import ClassVar
 
 import pygame
 
-from src.blood_particle import BloodParticle
+from src import game_clock
+from src.asset_cache import AssetCache, AssetLoader, finish_each
+from src.audio import AudioManager
+from src.background import Background
+from src.benchmark import Benchmark, BenchmarkScenario
+from src.blood_particle import BloodParticles
 from src.chest import Chest
 from src.constants import (
     COLORS,
@@ -18,17 +24,46 @@ from src.constants import (
     PLAY_AREA,
     UPGRADE_OPTIONS,
 )
+from src.contact_collision import ContactCollisions
 from src.cursor import Cursor
+from src.decal_layer import DecalLayer
 from src.energy_orb import EnergyOrb
 from src.floating_text import FloatingText
+from src.flow_field import FlowField, FlowFieldCache
 from src.muzzle_flash import MuzzleFlash
-from src.weapons import Weapon, WeaponCategory
+from src.navigation import HierarchicalPathfinder, NavGrid
+from src.pool import PooledSprite
+from src.profiler import Profiler, ProfilerOverlay
+from src.registry import ContentRegistry
+from src.renderer import DirtyRenderer, FullRenderer
+from src.replay import FrameInput, InputRecorder, InputReplay
+from src.scheduler import scheduler
+from src.screen_cache import ScreenCache
+from src.spatial_grid import SpatialGrid
+from src.swept_collision import SweptCollisions
+from src.text_cache import text_cache
+from src.zombie_swarm import ZombieSwarm
 
 if getattr(sys, 'frozen', False) and hasattr(sys, '_MEIPASS'):
     BASE_DIR = Path(sys._MEIPASS)
 else:
     BASE_DIR = Path(__file__).parent
 
+ASSET_CACHE_PATH = (
+    Path(os.environ.get('XDG_CACHE_HOME', Path.home() / '.cache'))
+    / 'pygameTDS'
+    / 'assets.pack'
+)
+
+CONTENT = ContentRegistry.load(BASE_DIR / 'data/content.json')
+"""Zombie classes, weapons and sound effects in `sfx/`."""
+
+CULL_MARGIN = 32
+"""Pixels around the view within which sprites are drawn, covering interpolation."""
+
+REPLAY_SETTINGS = ('swarm', 'max_zombies', 'sim_rate', 'map')
+"""Options which change the simulation, so are recorded along with the input."""
+
 
 class Camera:
     """Manages the camera's position and movement."""
@@ -60,15 +95,23 @@ class Camera:
 class Player(pygame.sprite.Sprite):
     """Represents the player character."""
 
-    INITIAL_SPEED: ClassVar = 0.7
+    INITIAL_SPEED: ClassVar = 2.0
+    """Pixels per step."""
     MAX_HEALTH: ClassVar = 7500
+    SHAKE_DURATION: ClassVar = 1000 / GAME_WINDOW['FPS']
+    """Milliseconds."""
 
-    def __init__(self, x, y, image):
+    def __init__(self, x, y, atlas):
         super().__init__()
-        self.original_image = image
-        self.image = self.original_image
+        self.atlas = atlas
+        self.original_image = atlas.image
+        self.half_size = (atlas.image.get_width() / 2, atlas.image.get_height() / 2)
+        """Pixels from the center to the edges which collide with obstacles."""
+        self.image = atlas.frames[0]
         self.rect = self.image.get_rect(center=(x, y))
-        self.mask = player_mask
+        self.pos = pygame.math.Vector2(self.rect.center)
+        self.mask = atlas.masks[0]
+        self.radius = atlas.radius
         self.speed = self.INITIAL_SPEED
         self.max_health = self.MAX_HEALTH
         self.health = self.max_health
@@ -79,6 +122,7 @@ class Player(pygame.sprite.Sprite):
         self.total_kills = 0
         self.shake_offset = (1, 1)
         self.shake_duration = 0.0
+        """Milliseconds of shake left."""
         self.shake_intensity = 0
         self.weapon_categories = weapon_categories
         self.current_category_index = 0
@@ -139,13 +183,18 @@ class Player(pygame.sprite.Sprite):
         if keys[pygame.K_d]:
             self.dx += self.speed
 
-        new_x = self.rect.x + self.dx
-        new_y = self.rect.y + self.dy
+        scale = game_clock.step_scale()
+        start = tuple(self.pos)
+        half_width, half_height = self.rect.width / 2, self.rect.height / 2
+        new_x = self.pos.x - half_width + self.dx * scale
+        new_y = self.pos.y - half_height + self.dy * scale
 
         if 0 <= new_x < PLAY_AREA['WIDTH'] - self.rect.width:
-            self.rect.x = new_x
+            self.pos.x = new_x + half_width
         if 0 <= new_y < PLAY_AREA['HEIGHT'] - self.rect.height:
-            self.rect.y = new_y
+            self.pos.y = new_y + half_height
+        self.pos.update(nav_grid.slide(start, self.pos, self.half_size))
+        self.rect.center = self.pos
 
         angle = math.atan2(
             mouse_pos[1] - self.rect.centery, mouse_pos[0] - self.rect.centerx
@@ -154,9 +203,10 @@ class Player(pygame.sprite.Sprite):
 
     def rotate(self, angle):
         """Rotates the player's image."""
-        self.image = pygame.transform.rotate(self.original_image, -math.degrees(angle))
+        index = self.atlas.index(-math.degrees(angle))
+        self.image = self.atlas.frames[index]
         self.rect = self.image.get_rect(center=self.rect.center)
-        self.mask = pygame.mask.from_surface(self.image)
+        self.mask = self.atlas.masks[index]
 
     def take_damage(self, amount):
         """Reduces the player's health."""
@@ -169,13 +219,15 @@ class Player(pygame.sprite.Sprite):
             random.randint(-self.shake_intensity, self.shake_intensity),
             random.randint(-self.shake_intensity, self.shake_intensity),
         )
-        self.shake_duration = 1
+        self.shake_duration = self.SHAKE_DURATION
 
     def update_shake(self):
         if self.shake_duration > 0:
-            self.rect.x += self.shake_offset[0]
-            self.rect.y += self.shake_offset[1]
-            self.shake_duration -= 1
+            # Spread the offset over the shake's game time, whatever the step
+            step = min(game_clock.step_ms(), self.shake_duration)
+            self.pos += pygame.Vector2(self.shake_offset) * (step / self.SHAKE_DURATION)
+            self.rect.center = self.pos
+            self.shake_duration -= step
         else:
             self.shake_offset = (0, 0)
 
@@ -188,14 +240,28 @@ class Player(pygame.sprite.Sprite):
             self.level += 1
             self.xp -= LEVEL_THRESHOLDS[self.level]
             show_upgrade_panel = True
+            ui_screens.invalidate('upgrade_panel')
 
 
-class Projectile(pygame.sprite.Sprite):
-    def __init__(self, x, y, angle, speed, penetration, damage, blast_radius=0):
-        super().__init__()
-        self.image = pygame.Surface((3, 3))
-        self.image.fill(COLORS['YELLOW'])
+class Projectile(PooledSprite):
+    SIZE: ClassVar = 3
+    """Pixels."""
+    _images: ClassVar = {}
+
+    @classmethod
+    def image_for(cls, color):
+        """Returns the shared projectile surface for `color`."""
+        if color not in cls._images:
+            image = pygame.Surface((cls.SIZE, cls.SIZE))
+            image.fill(color)
+            cls._images[color] = image
+        return cls._images[color]
+
+    def reset(self, x, y, angle, speed, penetration, damage, blast_radius=0):
+        self.image = self.image_for(COLORS['YELLOW'])
         self.rect = self.image.get_rect(center=(x, y))
+        self.pos = pygame.math.Vector2(x, y)
+        self.previous_pos = pygame.math.Vector2(x, y)
         self.speed = speed
         self.dx = self.speed * math.cos(angle)
         self.dy = self.speed * math.sin(angle)
@@ -203,28 +269,28 @@ class Projectile(pygame.sprite.Sprite):
         self.penetration = penetration
         self.initial_damage = damage
         self.damage = damage
-        self.zombies_hit = []
+        self.zombies_hit = set()
         self.blast_radius = blast_radius
 
     def update(self):
-        self.rect.x += self.dx
-        self.rect.y += self.dy
+        scale = game_clock.step_scale()
+        self.previous_pos.update(self.pos)
+        self.pos.x += self.dx * scale
+        self.pos.y += self.dy * scale
+        self.rect.center = self.pos
         if not pygame.Rect(0, 0, PLAY_AREA['WIDTH'], PLAY_AREA['HEIGHT']).colliderect(
             self.rect
-        ):
+        ) or nav_grid.is_blocked_at(self.pos, (self.SIZE / 2, self.SIZE / 2)):
             self.kill()
         else:
-            for zombie in zombies:
-                distance = math.sqrt(
-                    (self.rect.centerx - zombie.rect.centerx) ** 2
-                    + (self.rect.centery - zombie.rect.centery) ** 2
-                )
-                if distance <= self.blast_radius:
+            for zombie in zombie_grid.query_radius(self.rect.center, self.blast_radius):
+                if zombie.alive():
                     current_damage = self.get_current_damage()
                     zombie.take_damage(current_damage)
 
                     damage_color = self.get_penetration_color()
-                    damage_text = FloatingText(
+                    damage_text = spawn_moving(
+                        FloatingText,
                         zombie.rect.centerx,
                         zombie.rect.top,
                         int(current_damage),
@@ -240,9 +306,10 @@ class Projectile(pygame.sprite.Sprite):
 
     def reduce_penetration(self, zombie):
         if zombie not in self.zombies_hit:
-            self.zombies_hit.append(zombie)
+            self.zombies_hit.add(zombie)
             self.penetration -= 1
             self.damage *= 0.9
+            self.image = self.image_for(self.get_penetration_color())
         if self.penetration <= 0:
             self.kill()
 
@@ -250,41 +317,55 @@ class Projectile(pygame.sprite.Sprite):
         return self.damage
 
 
-class ZombieClass:
-    a = {'HEALTH': 50, 'SPEED': 1.0}
-    b = {'HEALTH': 66, 'SPEED': 1.1}
-    c = {'HEALTH': 99, 'SPEED': 1.2}
-    d = {'HEALTH': 133, 'SPEED': 1.3}
-    e = {'HEALTH': 166, 'SPEED': 1.4}
-    f = {'HEALTH': 199, 'SPEED': 1.5}
-    g = {'HEALTH': 233, 'SPEED': 1.6}
-    h = {'HEALTH': 266, 'SPEED': 1.7}
-    i = {'HEALTH': 299, 'SPEED': 1.8}
-    j = {'HEALTH': 333, 'SPEED': 1.9}
-    k = {'HEALTH': 444, 'SPEED': 2.0}
-
-
 class Zombie(pygame.sprite.Sprite):
     FADE_DURATION: ClassVar = 150
+    """Milliseconds."""
+    FLASH_DURATION: ClassVar = 50
+    """Milliseconds a hit flashes the zombie for."""
     MAX_ALIVE_COUNT: ClassVar = 100
     HEALTH_BAR_VISIBLE_DURATION: ClassVar = 120
     AVOIDANCE_RADIUS: ClassVar = 5
+    CONTACT_DAMAGE: ClassVar = 1500
+    """Damage to the player per second of contact."""
+    HITBOX_MARGIN: ClassVar = 32
+    """Upper bound on hitbox extent from the center, pixels."""
     SPAWN_INTERVAL: ClassVar = 450
     WAVE_DELAY: ClassVar = 10000
+    GROAN_SOUNDS: ClassVar = tuple(CONTENT.sound_groups['groans'])
 
-    def __init__(self, x, y, player, zombie_image, zombie_class):
+    def __init__(self, x, y, player, zombie_atlas, zombie_class):
         super().__init__()
-        self.original_image = zombie_image
-        self.image = self.original_image.copy()
+        self.swarm_slot = None
+        self._last_damage_time = 0
+        self._show_health_bar = False
+        self.atlas = zombie_atlas
+        self.original_image = zombie_atlas.image
+        self.half_size = (
+            zombie_atlas.image.get_width() / 2,
+            zombie_atlas.image.get_height() / 2,
+        )
+        """Pixels from the center to the edges which collide with obstacles."""
+        self.frame_index = 0
+        self.image = zombie_atlas.frames[0]
         self.rect = self.image.get_rect(center=(x, y))
-        self.mask = pygame.mask.from_surface(self.image)
-        self.speed = zombie_class['SPEED']
+        self.pos = pygame.math.Vector2(self.rect.center)
+        self.mask = zombie_atlas.masks[0]
+        self.radius = zombie_atlas.radius
+        self.speed = zombie_class.speed
+        if zombie_swarm is not None:
+            zombie_swarm.add(
+                self,
+                pos=self.rect.center,
+                speed=self.speed,
+                size=self.original_image.get_size(),
+            )
         self.player = player
-        self.max_health = zombie_class['HEALTH']
+        self.max_health = zombie_class.health
         self.health = self.max_health
-        self.zombie_class_name = self.get_class_name(zombie_class)
+        self.zombie_class = zombie_class
         self.fading = False
         self.fade_start_time = 0
+        self.flash_until = 0
         self.last_damage_time = 0
         self.roaming = True
         self.roaming_target = self.get_new_roaming_target()
@@ -293,30 +374,46 @@ class Zombie(pygame.sprite.Sprite):
         hitbox_size = int(self.rect.width * 0.5)
         self.hitbox = pygame.Rect(0, 0, hitbox_size, hitbox_size)
         self.hitbox.center = self.rect.center
-        self.grid_size = (
-            PLAY_AREA['WIDTH'] // 16,
-            PLAY_AREA['HEIGHT'] // 16,
-        )
-        self.path = []
-        self.path_update_interval = 1500
-        self.path_update_offset = random.randint(0, self.path_update_interval)
-        self.last_path_update = pygame.time.get_ticks() - self.path_update_offset
+        self.next_cell = None
         self.show_health_bar = False
         self.last_damage_time = 0
-        self.last_groan_time = pygame.time.get_ticks()
-        self.next_groan_interval = random.randint(1000, 30000)
+        self.groan_timer = scheduler.call_later(
+            random.randint(1000, 30000), self.play_random_groan
+        )
 
-        self.groan_sounds = [
-            pygame.mixer.Sound(BASE_DIR / 'sfx/zombie_groan1.mp3'),
-            pygame.mixer.Sound(BASE_DIR / 'sfx/zombie_groan2.mp3'),
-            pygame.mixer.Sound(BASE_DIR / 'sfx/zombie_groan3.mp3'),
-        ]
+    @property
+    def last_damage_time(self):
+        """Game time of the last hit, held by the swarm if there is one."""
+        if self.swarm_slot is None:
+            return self._last_damage_time
+        return int(zombie_swarm.last_damage_times[self.swarm_slot])
+
+    @last_damage_time.setter
+    def last_damage_time(self, value):
+        if self.swarm_slot is None:
+            self._last_damage_time = value
+        else:
+            zombie_swarm.last_damage_times[self.swarm_slot] = value
+
+    @property
+    def show_health_bar(self):
+        """Whether the health bar is shown, held by the swarm if there is one."""
+        if self.swarm_slot is None:
+            return self._show_health_bar
+        return bool(zombie_swarm.show_health_bars[self.swarm_slot])
+
+    @show_health_bar.setter
+    def show_health_bar(self, value):
+        if self.swarm_slot is None:
+            self._show_health_bar = value
+        else:
+            zombie_swarm.show_health_bars[self.swarm_slot] = value
 
-    def get_class_name(self, zombie_class):
-        for name, cls in vars(ZombieClass).items():
-            if isinstance(cls, dict) and cls == zombie_class:
-                return name
-        return 'a'
+    def kill(self):
+        scheduler.cancel(self.groan_timer)
+        if self.swarm_slot is not None:
+            zombie_swarm.remove(self)
+        super().kill()
 
     def get_new_roaming_target(self):
         return random.randint(0, PLAY_AREA['WIDTH']), random.randint(
@@ -324,118 +421,66 @@ class Zombie(pygame.sprite.Sprite):
         )
 
     def update(self):
-        self.last_damage_time = pygame.time.get_ticks()
-        self.flash()
+        start = tuple(self.pos)
         if self.fading:
             self.fade_out()
-        elif not self.fading:
-            current_time = pygame.time.get_ticks()
+        elif zombie_swarm is None:
+            # Otherwise the swarm moves all zombies at once
+            current_time = game_clock.get_ticks()
             if (
                 self.show_health_bar
                 and current_time - self.last_damage_time
                 > self.HEALTH_BAR_VISIBLE_DURATION
             ):
                 self.show_health_bar = False
-            if current_time - self.last_path_update > self.path_update_interval:
-                self.update_path()
-                self.last_path_update = current_time
-
-            if self.path:
-                next_pos = self.path[0]
-                direction = pygame.math.Vector2(
-                    next_pos[0] * 32 - self.rect.centerx,
-                    next_pos[1] * 32 - self.rect.centery,
-                )
-                if direction.length() > 0:
-                    direction = direction.normalize() * self.speed
-                    self.rect.x += direction.x
-                    self.rect.y += direction.y
-                if (
-                    abs(self.rect.centerx - next_pos[0] * 32) < self.speed
-                    and abs(self.rect.centery - next_pos[1] * 32) < self.speed
-                ):
-                    self.path.pop(0)
-
-        self.avoid_other_zombies()
-        self.check_boundaries()
+            self.update_path()
+            target = self.get_target()
+            direction = pygame.math.Vector2(
+                target[0] - self.rect.centerx,
+                target[1] - self.rect.centery,
+            )
+            if direction.length() > 0:
+                direction = direction.normalize() * self.speed
+                self.pos += direction * game_clock.step_scale()
+                self.rect.center = self.pos
+
+        if zombie_swarm is None:
+            self.avoid_other_zombies()
+            self.check_boundaries()
+            self.pos.update(nav_grid.slide(start, self.pos, self.half_size))
+            self.rect.center = self.pos
         self.rotate_to_target()
+        self.image = self.current_frame()
         self.hitbox.center = self.rect.center
 
-        current_time = pygame.time.get_ticks()
-        if current_time - self.last_groan_time > self.next_groan_interval:
-            self.play_random_groan()
-
     def play_random_groan(self):
         if not self.killed and not self.fading:
-            groan_sound = random.choice(self.groan_sounds)
-            groan_sound.play()
+            audio.play(random.choice(self.GROAN_SOUNDS))
 
-            self.last_groan_time = pygame.time.get_ticks()
-            self.next_groan_interval = random.randint(1000, 30000)
+            self.groan_timer = scheduler.call_later(
+                random.randint(1000, 30000), self.play_random_groan
+            )
 
     def update_path(self):
-        start = (self.rect.centerx // 32, self.rect.centery // 32)
-        goal = (self.player.rect.centerx // 32, self.player.rect.centery // 32)
-        self.path = self.a_star(start, goal)
-
-    def get_neighbors(self, pos):
-        x, y = pos
-        neighbors = [
-            (x + 1, y),
-            (x - 1, y),
-            (x, y + 1),
-            (x, y - 1),
-            (x + 1, y + 1),
-            (x - 1, y - 1),
-            (x + 1, y - 1),
-            (x - 1, y + 1),
-        ]
-        return [
-            (nx, ny)
-            for nx, ny in neighbors
-            if 0 <= nx < self.grid_size[0] and 0 <= ny < self.grid_size[1]
-        ]
-
-    def manhattan_distance(self, a, b):
-        return max(abs(a[0] - b[0]), abs(a[1] - b[1]))
-
-    def a_star(self, start, goal):
-        frontier = []
-        heapq.heappush(frontier, (0, start))
-        came_from = {}
-        cost_so_far = defaultdict(lambda: float('inf'))
-        came_from[start] = None
-        cost_so_far[start] = 0
-
-        while frontier:
-            current = heapq.heappop(frontier)[1]
-
-            if current == goal:
-                break
-
-            for next in self.get_neighbors(current):
-                new_cost = cost_so_far[current] + (
-                    1 if (next[0] - current[0]) * (next[1] - current[1]) == 0 else 1.414
-                )
-                if new_cost < cost_so_far[next]:
-                    cost_so_far[next] = new_cost
-                    priority = new_cost + self.manhattan_distance(goal, next)
-                    heapq.heappush(frontier, (priority, next))
-                    came_from[next] = current
-
-        path = []
-        current = goal
-        while current != start:
-            path.append(current)
-            current = came_from.get(current)
-            if current is None:
-                break
-        path.reverse()
-        return path
+        """Looks up the next step towards the player in the shared flow field."""
+        self.next_cell = flow_field.next_cell(FlowField.cell_at(self.rect.center))
+
+    def get_target(self):
+        """Returns the position the zombie is currently heading for."""
+        if self.swarm_slot is not None:
+            return tuple(zombie_swarm.targets[self.swarm_slot])
+        if self.next_cell is not None:
+            return (
+                self.next_cell[0] * FlowField.CELL_SIZE,
+                self.next_cell[1] * FlowField.CELL_SIZE,
+            )
+        return self.player.rect.center
 
     def avoid_other_zombies(self):
         avoidance_force = pygame.math.Vector2(0, 0)
-        for other_zombie in zombies:
+        for other_zombie in zombie_grid.query_radius(
+            self.rect.center, self.AVOIDANCE_RADIUS
+        ):
             if other_zombie != self:
                 distance = pygame.math.Vector2(self.rect.center) - pygame.math.Vector2(
                     other_zombie.rect.center
@@ -445,27 +490,43 @@ class Zombie(pygame.sprite.Sprite):
 
         if avoidance_force.length() > 0:
             avoidance_force = avoidance_force.normalize() * self.speed * 0.6
-            self.rect.x += avoidance_force.x
-            self.rect.y += avoidance_force.y
+            self.pos += avoidance_force * game_clock.step_scale()
+            self.rect.center = self.pos
 
     def check_boundaries(self):
-        self.rect.clamp_ip(pygame.Rect(0, 0, PLAY_AREA['WIDTH'], PLAY_AREA['HEIGHT']))
+        play_area = pygame.Rect(0, 0, PLAY_AREA['WIDTH'], PLAY_AREA['HEIGHT'])
+        if not play_area.contains(self.rect):
+            self.rect.clamp_ip(play_area)
+            self.pos.update(self.rect.center)
 
     def rotate_to_target(self):
-        if self.path:
-            target = (self.path[0][0] * 32, self.path[0][1] * 32)
+        if self.swarm_slot is not None:
+            index = zombie_swarm.frame_indices[self.swarm_slot]
         else:
-            target = (self.player.rect.centerx, self.player.rect.centery)
-
-        dx = target[0] - self.rect.centerx
-        dy = target[1] - self.rect.centery
-        if dx != 0 or dy != 0:
-            angle = math.degrees(math.atan2(-dy, dx))
-            self.image = pygame.transform.rotate(self.original_image, angle)
-            self.rect = self.image.get_rect(center=self.rect.center)
+            target = self.get_target()
+            dx = target[0] - self.rect.centerx
+            dy = target[1] - self.rect.centery
+            index = -1
+            if dx != 0 or dy != 0:
+                index = self.atlas.index(math.degrees(math.atan2(-dy, dx)))
+        if index >= 0:
+            self.frame_index = index
+            self.rect = self.atlas.frames[index].get_rect(center=self.rect.center)
+            self.mask = self.atlas.masks[index]
+
+    def current_frame(self):
+        """Returns the atlas frame to show, tinted by any active effect."""
+        current_time = game_clock.get_ticks()
+        if self.fading:
+            elapsed_time = current_time - self.fade_start_time
+            alpha = 255 - (elapsed_time / self.FADE_DURATION) * 255
+            return self.atlas.faded_frame(self.frame_index, max(alpha, 0))
+        if current_time < self.flash_until:
+            return self.atlas.flash_frame(self.frame_index)
+        return self.atlas.frames[self.frame_index]
 
     def draw_health_bar(self, camera):
-        current_time = pygame.time.get_ticks()
+        current_time = game_clock.get_ticks()
         if self.health < self.max_health and not self.killed:
             time_since_last_damage = current_time - self.last_damage_time
             if time_since_last_damage < self.HEALTH_BAR_VISIBLE_DURATION:
@@ -474,11 +535,12 @@ class Zombie(pygame.sprite.Sprite):
     def take_damage(self, amount):
         if not self.killed:
             self.health -= amount
-            self.last_damage_time = pygame.time.get_ticks()
+            self.last_damage_time = game_clock.get_ticks()
             self.show_health_bar = True
-            self.flash()
+            self.flash_until = self.last_damage_time + self.FLASH_DURATION
 
-            damage_text = FloatingText(
+            damage_text = spawn_moving(
+                FloatingText,
                 self.rect.centerx,
                 self.rect.top,
                 int(amount),
@@ -494,11 +556,13 @@ class Zombie(pygame.sprite.Sprite):
     def start_fading(self):
         if not self.fading:
             self.fading = True
-            self.fade_start_time = pygame.time.get_ticks()
+            self.fade_start_time = game_clock.get_ticks()
+            if self.swarm_slot is not None:
+                zombie_swarm.seeking[self.swarm_slot] = False
             self.player.total_kills += 1
-            score_gained = self.get_score_value()
+            score_gained = self.zombie_class.score
             self.player.score += score_gained
-            player.update_level_and_xp(score_gained + self.blood())
+            player.update_level_and_xp(score_gained + self.zombie_class.xp)
 
             energy_orbs.add(
                 EnergyOrb(
@@ -508,59 +572,12 @@ class Zombie(pygame.sprite.Sprite):
                 )
             )
 
-    def get_score_value(self):
-        score_table = {
-            'a': 5,
-            'b': 10,
-            'c': 15,
-            'd': 20,
-            'e': 25,
-            'f': 30,
-            'g': 35,
-            'h': 40,
-            'i': 45,
-            'j': 50,
-            'k': 55,
-        }
-        return score_table.get(self.zombie_class_name, 5)
-
-    def blood(self):
-        bloodline_table = {
-            'a': 1,
-            'b': 2,
-            'c': 3,
-            'd': 4,
-            'e': 5,
-            'f': 6,
-            'g': 7,
-            'h': 8,
-            'i': 9,
-            'j': 10,
-            'k': 11,
-        }
-        return bloodline_table.get(self.zombie_class_name, 1)
-
-    def flash(self):
-        self.image.fill(COLORS['WHITE'], special_flags=pygame.BLEND_ADD)
-        self.flash_active = True
-        self.flash_start_time = pygame.time.get_ticks()
-
-    def update_flash(self):
-        if self.flash_active:
-            elapsed_time = pygame.time.get_ticks() - self.flash_start_time
-            if elapsed_time > 50:
-                self.image = self.original_image.copy()
-                self.flash_active = False
-
     def fade_out(self):
-        current_time = pygame.time.get_ticks()
-        elapsed_time = current_time - self.fade_start_time
-        if elapsed_time < self.FADE_DURATION:
-            alpha = 255 - (elapsed_time / self.FADE_DURATION) * 255
-            self.image.set_alpha(alpha)
-        else:
+        """Removes the zombie once it has faded; `current_frame` does the fading."""
+        elapsed_time = game_clock.get_ticks() - self.fade_start_time
+        if elapsed_time >= self.FADE_DURATION:
             self.kill()
-            pygame.mixer.Sound.play(hit_sound)
+            audio.play('splat')
 
 
 class HealthBar(pygame.sprite.Sprite):
@@ -581,16 +598,20 @@ class HealthBar(pygame.sprite.Sprite):
         fill_width = (entity.health / entity.max_health) * self.WIDTH
         fill_rect = outline_rect.copy()
         fill_rect.width = fill_width
-        pygame.draw.rect(
-            screen,
-            COLORS['NEON'],
-            camera.apply(fill_rect),
+        renderer.mark(
+            pygame.draw.rect(
+                screen,
+                COLORS['NEON'],
+                camera.apply(fill_rect),
+            )
         )
-        pygame.draw.rect(
-            screen,
-            COLORS['WHITE'],
-            camera.apply(outline_rect),
-            1,
+        renderer.mark(
+            pygame.draw.rect(
+                screen,
+                COLORS['WHITE'],
+                camera.apply(outline_rect),
+                1,
+            )
         )
 
 
@@ -608,6 +629,26 @@ def get_neighbors(pos, grid_size):
     ]
 
 
+def upgrade_panel_rect():
+    """Returns the screen rect of the upgrade panel."""
+    panel_width = 900
+    panel_height = 450
+    panel_x = (GAME_WINDOW['WIDTH'] - panel_width) // 2
+    panel_y = (GAME_WINDOW['HEIGHT'] - panel_height) // 2
+    return pygame.Rect(panel_x, panel_y, panel_width, panel_height)
+
+
+def upgrade_option_rects():
+    """Returns the screen rects of the upgrade options, as drawn on the panel."""
+    panel_rect = upgrade_panel_rect()
+    return [
+        pygame.Rect(
+            panel_rect.x + (i % 3) * 300 + 25, panel_rect.y + (i // 3) * 150, 250, 100
+        )
+        for i in range(len(UPGRADE_OPTIONS))
+    ]
+
+
 def render_upgrade_panel():
     # Create semi-transparent overlay for the whole screen
     overlay = pygame.Surface(
@@ -616,36 +657,40 @@ def render_upgrade_panel():
     overlay.fill((0, 0, 0, 180))  # Black with alpha=180
     screen.blit(overlay, (0, 0))
 
-    panel_width = 900
-    panel_height = 450
-    panel_x = (GAME_WINDOW['WIDTH'] - panel_width) // 2
-    panel_y = (GAME_WINDOW['HEIGHT'] - panel_height) // 2
+    panel_rect = upgrade_panel_rect()
 
     # Create semi-transparent panel surface with alpha channel
-    panel = pygame.Surface((panel_width, panel_height), pygame.SRCALPHA)
+    panel = pygame.Surface(panel_rect.size, pygame.SRCALPHA)
     panel.fill((0, 0, 0, 200))  # Black with alpha=200
-    screen.blit(panel, (panel_x, panel_y))
+    screen.blit(panel, panel_rect)
 
     render_text(
-        'Choose an Upgrade', base_font, panel_x + (panel_width // 2) - 100, panel_y - 50
+        'Choose an Upgrade', base_font, panel_rect.centerx - 100, panel_rect.y - 50
     )
 
-    option_rects = []
-    for i, option in enumerate(UPGRADE_OPTIONS):
-        x = panel_x + (i % 3) * 300 + 25
-        y = panel_y + (i // 3) * 150
-        rect = pygame.Rect(x, y, 250, 100)
-
+    for option, rect in zip(UPGRADE_OPTIONS, upgrade_option_rects(), strict=True):
         # Create semi-transparent option boxes with alpha channel
-        option_surface = pygame.Surface((250, 100), pygame.SRCALPHA)
+        option_surface = pygame.Surface(rect.size, pygame.SRCALPHA)
         option_surface.fill((0, 0, 0, 150))  # Black with alpha=150
-        screen.blit(option_surface, (x, y))
+        screen.blit(option_surface, rect)
 
         pygame.draw.rect(screen, COLORS['WHITE'], rect, 2)
-        render_text(option, base_font, x + 10, y + 40)
-        option_rects.append(rect)
+        render_text(option, base_font, rect.x + 10, rect.y + 40)
 
-    return option_rects
+
+def draw_upgrade_screen():
+    """Draws the game world, dimmed, under the upgrade panel."""
+    offset = interpolated_offset()
+    background.draw(surface=screen, offset=offset)
+    blood_particles.draw(surface=screen, offset=offset)
+    draw_sprites(offset)
+
+    overlay = pygame.Surface(
+        (GAME_WINDOW['WIDTH'], GAME_WINDOW['HEIGHT']), pygame.SRCALPHA
+    )
+    overlay.fill((0, 0, 0, 75))  # Adjust alpha value for desired transparency
+    screen.blit(overlay, (0, 0))
+    render_upgrade_panel()
 
 
 def apply_upgrade(index):
@@ -685,20 +730,22 @@ def apply_upgrade(index):
 def display_damage_text(damage, position, color):
     damage_text = base_font.render(f'-{int(damage)}', True, color)
     damage_rect = damage_text.get_rect(center=position)
-    screen.blit(damage_text, damage_rect)
+    renderer.blit(damage_text, damage_rect)
 
 
-def line_collision(start, end, zombie):
-    return zombie.hitbox.clipline(start, end)
+def render_text(text, font, x, y, color=COLORS['WHITE']):
+    text_surface = text_cache.render(font, text, color)
+    renderer.blit(text_surface, (x, y))
 
 
-def render_text(text, font, x, y, color=COLORS['WHITE']):
+def render_dynamic_text(text, font, x, y, color=COLORS['WHITE']):
+    """Renders text which changes too often to be worth caching."""
     text_surface = font.render(text, True, color)
-    screen.blit(text_surface, (x, y))
+    renderer.blit(text_surface, (x, y))
 
 
 def manage_waves():
-    global current_wave, zombies_to_spawn, wave_start_time
+    global current_wave, zombies_to_spawn, wave_start_time, spawn_timer
 
     current_wave += 1
     print(f'Starting Wave {current_wave}')
@@ -713,17 +760,13 @@ def manage_waves():
             zombies_to_spawn.append((zombie_type, spawn_count))
             count -= spawn_count
 
-    pygame.time.set_timer(SPAWN_ZOMBIE, Zombie.SPAWN_INTERVAL)
-    wave_start_time = pygame.time.get_ticks() + Zombie.WAVE_DELAY
+    scheduler.cancel(spawn_timer)
+    spawn_timer = scheduler.call_every(Zombie.SPAWN_INTERVAL, spawn_next_zombie)
+    wave_start_time = game_clock.get_ticks() + Zombie.WAVE_DELAY
 
     if current_wave > 1:
-        chests.add(
-            Chest(
-                x=PLAY_AREA['WIDTH'] // 2,
-                y=PLAY_AREA['HEIGHT'] // 2,
-                image=chest_image,
-            )
-        )
+        x, y = open_position((PLAY_AREA['WIDTH'] // 2, PLAY_AREA['HEIGHT'] // 2))
+        chests.add(Chest(x=x, y=y, image=chest_image))
 
 
 def unlock_random_weapon():
@@ -766,37 +809,81 @@ def spawn_zombie(zombie_type):
             PLAY_AREA['WIDTH'],
             random.randint(50, PLAY_AREA['HEIGHT']),
         )
-    zombie_classes = {
-        'a': (ZombieClass.a, zombie_images[0]),
-        'b': (ZombieClass.b, zombie_images[1]),
-        'c': (ZombieClass.c, zombie_images[2]),
-        'd': (ZombieClass.d, zombie_images[3]),
-        'e': (ZombieClass.e, zombie_images[4]),
-        'f': (ZombieClass.f, zombie_images[5]),
-        'g': (ZombieClass.g, zombie_images[6]),
-        'h': (ZombieClass.h, zombie_images[7]),
-        'i': (ZombieClass.i, zombie_images[8]),
-        'j': (ZombieClass.j, zombie_images[9]),
-        'k': (ZombieClass.k, zombie_images[10]),
-    }
-    zombie_class, zombie_image = zombie_classes.get(
-        zombie_type, (ZombieClass.a, zombie_images[0])
-    )
-    zombie = Zombie(x, y, player, zombie_image, zombie_class)
+    x, y = open_position((x, y))
+    zombie_class = CONTENT.zombie_class(zombie_type)
+    zombie_atlas = zombie_atlases[zombie_class.id]
+    zombie = Zombie(x, y, player, zombie_atlas, zombie_class)
     zombies.add(zombie)
 
 
+def spawn_next_zombie():
+    """Spawns the next zombie of the wave, or starts the next wave once it's cleared."""
+    global zombies_to_spawn, wave_delay_active
+    if game_clock.get_ticks() < wave_start_time:
+        return
+    wave_delay_active = False
+    if zombies_to_spawn and len(zombies) < Zombie.MAX_ALIVE_COUNT:
+        zombie_type, count = random.choice(zombies_to_spawn)
+        spawn_zombie(zombie_type)
+        count -= 1
+        if count > 0:
+            zombies_to_spawn = [
+                (t, c) if t != zombie_type else (t, count) for t, c in zombies_to_spawn
+            ]
+        else:
+            zombies_to_spawn = [(t, c) for t, c in zombies_to_spawn if t != zombie_type]
+    elif not zombies and not zombies_to_spawn:
+        wave_delay_active = True
+        manage_waves()
+
+
+def start_reload(weapon):
+    """Starts reloading `weapon`, refilling it once its reload time has passed."""
+    reloading[weapon.name] = True
+    audio.play('reload')
+    scheduler.call_later(weapon.reload_time, finish_reload, weapon)
+
+
+def finish_reload(weapon):
+    weapon.ammo = weapon.max_ammo
+    reloading[weapon.name] = False
+
+
+def open_position(pos):
+    """Returns `pos`, or the center of the nearest open cell if a sprite there
+    could overlap an obstacle.
+    """
+    half_cell = nav_grid.cell_size // 2
+    if not nav_grid.is_blocked_at(pos, (half_cell, half_cell)):
+        return pos
+    cell = nav_grid.nearest_open(FlowField.cell_at(pos))
+    if cell is None:
+        return pos
+    return (
+        cell[0] * nav_grid.cell_size + half_cell,
+        cell[1] * nav_grid.cell_size + half_cell,
+    )
+
+
 def restart_game():
     global current_wave
     current_wave = 0
+    scheduler.clear()
+    for weapon_name in reloading:
+        reloading[weapon_name] = False
     player.health = player.max_health
-    player.rect.center = (
-        PLAY_AREA['WIDTH'] // 2,
-        PLAY_AREA['HEIGHT'] // 2,
+    player.rect.center = open_position(
+        (PLAY_AREA['WIDTH'] // 2, PLAY_AREA['HEIGHT'] // 2)
     )
+    player.pos.update(player.rect.center)
 
     for group in all_sprites():
         group.empty()
+    blood_particles.clear()
+    decals.clear()
+    if zombie_swarm is not None:
+        zombie_swarm.clear()
+    zombie_grid.clear()
 
     players.add(player)
     player.set_initial_weapon()
@@ -816,11 +903,14 @@ def restart_game():
 
 
 def draw_progress_bar(surface, x, y, width, height, progress, color):
+    """Draws the XP bar; returns the area drawn."""
     bar_rect = pygame.Rect(x, y, width, height)
     fill_rect = pygame.Rect(x, y, int(width * progress), height)
     pygame.draw.rect(surface, COLORS['WHITE'], bar_rect, 2)
     pygame.draw.rect(surface, color, fill_rect)
-    level_text = base_font.render(f'Brain Power: {player.level}', True, COLORS['WHITE'])
+    level_text = text_cache.render(
+        base_font, f'Brain Power: {player.level}', COLORS['WHITE']
+    )
     level_text_rect = level_text.get_rect(midleft=(x + 10, y + height // 2))
     surface.blit(level_text, level_text_rect)
     xp_text = base_font.render(
@@ -828,6 +918,19 @@ def draw_progress_bar(surface, x, y, width, height, progress, color):
     )
     xp_text_rect = xp_text.get_rect(midright=(x + width - 10, y + height // 2))
     surface.blit(xp_text, xp_text_rect)
+    return bar_rect.unionall([level_text_rect, xp_text_rect])
+
+
+def render_loading_screen(progress):
+    """Renders the loading screen, with a bar showing `progress` from 0 to 1."""
+    center_x, center_y = GAME_WINDOW['WIDTH'] // 2, GAME_WINDOW['HEIGHT'] // 2
+    screen.fill(COLORS['BLACK'])
+    render_text('Loading...', base_font, center_x - 75, center_y - 50)
+    bar_rect = pygame.Rect(center_x - 200, center_y, 400, 20)
+    pygame.draw.rect(screen, COLORS['WHITE'], bar_rect, 2)
+    fill_rect = bar_rect.copy()
+    fill_rect.width = int(bar_rect.width * progress)
+    pygame.draw.rect(screen, COLORS['WHITE'], fill_rect)
 
 
 def render_text_screen(content):
@@ -888,13 +991,13 @@ def set_initial_weapon(self):
     self.current_weapon = first_pistol
 
 
-def get_adjusted_mouse_pos(camera):
-    mouse_pos = pygame.mouse.get_pos()
+def get_adjusted_mouse_pos(camera, mouse_pos):
     return (mouse_pos[0] - camera.rect.x, mouse_pos[1] - camera.rect.y)
 
 
 def create_projectile(pellet_angle):
-    return Projectile(
+    return spawn_moving(
+        Projectile,
         player.rect.centerx,
         player.rect.centery,
         pellet_angle,
@@ -905,11 +1008,168 @@ def create_projectile(pellet_angle):
     )
 
 
+def start_benchmark_scenario(scenario):
+    """Resets the game and spawns the zombies for a benchmark scenario."""
+    global current_wave
+    restart_game()
+    current_wave = scenario.wave
+    zombie_types = [zombie_type for zombie_type, _ in calculate_zombies(scenario.wave)]
+    for i in range(scenario.zombies):
+        spawn_zombie(zombie_types[i % len(zombie_types)])
+
+
+def parse_args(argv=None):
+    """Parses command line arguments."""
+    parser = argparse.ArgumentParser(description='Top-down zombie shooter.')
+    parser.add_argument(
+        '--headless',
+        action='store_true',
+        help='run without a window or audio device',
+    )
+    parser.add_argument('--seed', type=int, help='seed the random number generator')
+    parser.add_argument(
+        '--benchmark',
+        action='store_true',
+        help='run scripted waves headless and report milliseconds per frame',
+    )
+    parser.add_argument(
+        '--waves',
+        type=lambda value: [int(wave) for wave in value.split(',')],
+        default=[1, 10, 30],
+        help='comma-separated benchmark waves (default: 1,10,30)',
+    )
+    parser.add_argument(
+        '--zombies',
+        type=int,
+        help='zombies spawned per benchmark wave (default: --max-zombies)',
+    )
+    parser.add_argument(
+        '--frames',
+        type=int,
+        default=600,
+        help='frames run per benchmark wave (default: %(default)s)',
+    )
+    parser.add_argument(
+        '--trace',
+        type=Path,
+        help='record every profiled frame and write a Chrome trace to this file',
+    )
+    parser.add_argument(
+        '--swarm',
+        action='store_true',
+        help='move zombies in batches with NumPy, for large numbers of zombies',
+    )
+    parser.add_argument(
+        '--max-zombies',
+        type=int,
+        default=Zombie.MAX_ALIVE_COUNT,
+        help='zombies alive at once (default: %(default)s)',
+    )
+    parser.add_argument(
+        '--renderer',
+        choices=['full', 'dirty'],
+        default='full',
+        help='redraw the whole screen every frame, or only changed regions while '
+        'the view is still (default: %(default)s)',
+    )
+    parser.add_argument(
+        '--sim-rate',
+        type=float,
+        default=game_clock.FixedTimestep.BASE_RATE,
+        help='simulation steps per second, independent of frame rate '
+        '(default: %(default)s)',
+    )
+    parser.add_argument(
+        '--map',
+        type=Path,
+        help=f'load obstacles from a text map of {FlowField.CELL_SIZE} px cells, '
+        f'where {NavGrid.BLOCKED_CHAR} marks a blocked cell, e.g. maps/warehouse.txt',
+    )
+    replay_options = parser.add_mutually_exclusive_group()
+    replay_options.add_argument(
+        '--record',
+        type=Path,
+        help="write the random seed and every frame's input to this file",
+    )
+    replay_options.add_argument(
+        '--replay',
+        type=Path,
+        help='play back input written with --record, as fast as possible',
+    )
+    args = parser.parse_args(argv)
+    if args.benchmark and (args.record or args.replay):
+        parser.error('--benchmark scripts its own input, so cannot record or replay')
+    return args
+
+
+def export_trace(path=None):
+    """Writes the profiler's buffered frames to a Chrome trace file."""
+    if path is None:
+        path = Path(f'trace-{time.strftime("%Y%m%d-%H%M%S")}.json')
+    profiler.export_trace(path)
+    print(f'Wrote trace: {path}')
+
+
+def moving_sprites():
+    """Returns the sprites whose positions are interpolated when drawn."""
+    return [*zombies, *players, *projectiles, *floating_texts]
+
+
+def spawn_moving(sprite_class, *args, **kwargs):
+    """Spawns a pooled sprite whose position is interpolated when drawn.
+
+    A reused sprite may have been killed earlier in this step, so the position
+    snapshotted from its previous life is forgotten.
+    """
+    sprite = sprite_class.spawn(*args, **kwargs)
+    previous_centers.pop(sprite, None)
+    return sprite
+
+
+def interpolated_rect(sprite, offset):
+    """Returns the screen rect for `sprite`, between its last two simulated positions.
+
+    Drawing runs `timestep.alpha` of the way into the step after the latest one, so
+    the sprite is drawn that far from its previous position to its current one.
+    """
+    previous = previous_centers.get(sprite)
+    if previous is None:
+        return sprite.rect.move(offset)
+    lag = 1 - timestep.alpha
+    return sprite.rect.move(
+        offset[0] + round((previous[0] - sprite.rect.centerx) * lag),
+        offset[1] + round((previous[1] - sprite.rect.centery) * lag),
+    )
+
+
+def interpolated_offset():
+    """Returns the camera offset, between its last two simulated positions."""
+    lag = 1 - timestep.alpha
+    return (
+        camera.rect.x + round((previous_camera_pos[0] - camera.rect.x) * lag),
+        camera.rect.y + round((previous_camera_pos[1] - camera.rect.y) * lag),
+    )
+
+
+def draw_sprites(offset):
+    """Blits the sprites in view, one batch per group, in `all_sprites()` order."""
+    view = screen.get_rect(topleft=(-offset[0], -offset[1])).inflate(
+        2 * CULL_MARGIN, 2 * CULL_MARGIN
+    )
+    for group in all_sprites():
+        renderer.blits(
+            [
+                (sprite.image, interpolated_rect(sprite, offset))
+                for sprite in group
+                if view.colliderect(sprite.rect)
+            ]
+        )
+
+
 def all_sprites() -> list[pygame.sprite.Group]:
     """Returns a list of all sprite groups."""
     return [
         energy_orbs,
-        blood_particles,
         chests,
         zombies,
         players,
@@ -920,75 +1180,52 @@ def all_sprites() -> list[pygame.sprite.Group]:
 
 
 if __name__ == '__main__':
-    pistol = WeaponCategory(
-        'pistols',
-        [
-            Weapon('Glock(PDW)', 20, 200, 24, 0.080, 15, 1900, 1, locked=False),
-        ],
-    )
-    smg = WeaponCategory(
-        'SMG',
-        [
-            Weapon('Skorpian(SMG)', 20, 90, 24, 0.080, 30, 1900, 3, locked=True),
-        ],
-    )
-    rifles = WeaponCategory(
-        'Rifles',
-        [
-            Weapon('SVT-40(RIFLE)', 20, 440, 59, 0.068, 10, 2250, 5, locked=True),
-        ],
-    )
-    bolt_action = WeaponCategory(
-        'Bolt Action',
-        [
-            Weapon('Mosin(BOLT)', 20, 2500, 85, 0.002, 5, 2700, 7, locked=True),
-        ],
-    )
-    assault_rifles = WeaponCategory(
-        'Assault Rifle',
-        [
-            Weapon('AK-47(AR)', 20, 100, 35, 0.090, 31, 2000, 3, locked=True),
-        ],
-    )
-    lmgs = WeaponCategory(
-        'LMG',
-        [
-            Weapon('PKM(LMG)', 20, 170, 30, 0.2, 51, 3000, 5, locked=True),
-        ],
-    )
-    shotguns = WeaponCategory(
-        'Shotgun',
-        [
-            Weapon('Mossberg 500(SG)', 20, 1200, 25, 0.6, 5, 2500, 3, locked=False),
-            Weapon('Remington 870(SG)', 20, 1100, 28, 0.55, 6, 2600, 3, locked=True),
-        ],
-    )
-    launchers = WeaponCategory(
-        'Launchers',
-        [
-            Weapon(
-                'RPG-7(BLAST)',
-                20,
-                5000,
-                100,
-                0.1,
-                1,
-                5000,
-                0,
-                locked=True,
-                blast_radius=50,
-            ),
-        ],
+    args = parse_args()
+    replay = None
+    if args.replay:
+        replay = InputReplay(args.replay)
+        args.seed = replay.seed
+        for name, value in replay.settings.items():
+            setattr(args, name, value)
+    Zombie.MAX_ALIVE_COUNT = args.max_zombies
+    nav_grid = NavGrid.empty() if args.map is None else NavGrid.load(Path(args.map))
+    pathfinder = HierarchicalPathfinder(nav_grid)
+    zombie_swarm = (
+        ZombieSwarm(
+            avoidance_radius=Zombie.AVOIDANCE_RADIUS,
+            health_bar_duration=Zombie.HEALTH_BAR_VISIBLE_DURATION,
+        )
+        if args.swarm
+        else None
     )
-    weapon_categories = [
-        pistol,
-        smg,
-        bolt_action,
-        assault_rifles,
-        lmgs,
-        shotguns,
-        launchers,
-    ]
+    benchmark = None
+    if args.benchmark:
+        args.headless = True
+        zombie_count = args.max_zombies if args.zombies is None else args.zombies
+        benchmark = Benchmark(
+            [BenchmarkScenario(wave, zombie_count, args.frames) for wave in args.waves]
+        )
+        game_clock.install(game_clock.FixedStepClock())
+        if args.seed is None:
+            args.seed = 0
+    if args.headless:
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+        os.environ['SDL_AUDIODRIVER'] = 'dummy'
+    recorder = None
+    if args.record:
+        if args.seed is None:
+            args.seed = random.randrange(2**32)
+        recorder = InputRecorder(
+            args.record,
+            seed=args.seed,
+            settings={name: getattr(args, name) for name in REPLAY_SETTINGS},
+        )
+    if args.seed is not None:
+        random.seed(args.seed)
+    timestep = game_clock.FixedTimestep(rate=args.sim_rate)
+    game_clock.install_timestep(timestep)
+
+    weapon_categories = CONTENT.weapon_categories()
 
     pygame.init()
 
@@ -1000,32 +1237,78 @@ if __name__ == '__main__':
 
     screen = pygame.display.set_mode((GAME_WINDOW['WIDTH'], GAME_WINDOW['HEIGHT']))
     pygame.display.set_caption('TBBP Game')
+    renderer = (
+        DirtyRenderer(screen) if args.renderer == 'dirty' else FullRenderer(screen)
+    )
+    ui_screens = ScreenCache(screen)
 
-    player_image = pygame.image.load(BASE_DIR / 'images/player.png').convert_alpha()
-    player_mask = pygame.mask.from_surface(player_image)
-    zombie_images = [
-        pygame.image.load(BASE_DIR / f'images/zombie{i}.png').convert_alpha()
-        for i in range(1, 12)
-    ]
-    background_image = pygame.image.load(BASE_DIR / 'images/zombies.png').convert()
-    chest_image = pygame.image.load(BASE_DIR / 'images/chest.png').convert_alpha()
-    orb_image = pygame.image.load(BASE_DIR / 'images/orb.png').convert_alpha()
-    orb_image = pygame.transform.scale(orb_image, (20, 20))
-
+    asset_cache = AssetCache(ASSET_CACHE_PATH)
     pygame.mixer.init()
-    fire_sound_ak47 = pygame.mixer.Sound(BASE_DIR / 'sfx/bullet.mp3')
-    fire_sound_beretta = pygame.mixer.Sound(BASE_DIR / 'sfx/glock.mp3')
-    fire_sound_mossberg = pygame.mixer.Sound(BASE_DIR / 'sfx/mossberg.mp3')
-    fire_sound_mosin = pygame.mixer.Sound(BASE_DIR / 'sfx/mosin.mp3')
-    firing_sound_mosin = pygame.mixer.Sound(BASE_DIR / 'sfx/mosinshot.mp3')
-    fire_sound_pkm = pygame.mixer.Sound(BASE_DIR / 'sfx/pkm.mp3')
-    fire_sound_skorpian = pygame.mixer.Sound(BASE_DIR / 'sfx/skorpian.mp3')
-    fire_sound_svt = pygame.mixer.Sound(BASE_DIR / 'sfx/bullet.mp3')
-    fire_sound_rpg = pygame.mixer.Sound(BASE_DIR / 'sfx/bullet.mp3')
-    hit_sound = pygame.mixer.Sound(BASE_DIR / 'sfx/splat.mp3')
-    reload_sound = pygame.mixer.Sound(BASE_DIR / 'sfx/reload.mp3')
-
-    blood_particles = pygame.sprite.Group()
+    audio = AudioManager(load=asset_cache.sound)
+    for group, names in CONTENT.sound_groups.items():
+        for name in names:
+            audio.register(name, BASE_DIR / f'sfx/{name}.mp3', group=group)
+
+    # Load images and sounds on a background thread, behind a loading screen
+    asset_loader = AssetLoader(
+        {
+            'player_atlas': lambda: asset_cache.read_rotation_atlas(
+                BASE_DIR / 'images/player.png'
+            ),
+            'zombie_atlases': lambda: finish_each(
+                {
+                    zombie_class.id: asset_cache.read_rotation_atlas(
+                        BASE_DIR / zombie_class.image
+                    )
+                    for zombie_class in CONTENT.zombie_classes.values()
+                }
+            ),
+            'background_image': lambda: asset_cache.read_image(
+                BASE_DIR / 'images/zombies.png',
+                size=(PLAY_AREA['WIDTH'], PLAY_AREA['HEIGHT']),
+                alpha=False,
+            ),
+            'chest_image': lambda: asset_cache.read_image(
+                BASE_DIR / 'images/chest.png'
+            ),
+            'orb_image': lambda: asset_cache.read_image(
+                BASE_DIR / 'images/orb.png', size=(20, 20)
+            ),
+            'sounds': lambda: finish_each(
+                {
+                    name: asset_cache.read_sound(path)
+                    for name, path in audio.unloaded().items()
+                }
+            ),
+        }
+    )
+    asset_loader.start()
+    while not asset_loader.done:
+        pygame.event.pump()
+        render_loading_screen(asset_loader.progress)
+        pygame.display.flip()
+        pygame.time.wait(10)
+    assets = asset_loader.join()
+    try:
+        asset_cache.save()
+    except OSError:
+        # Cache location not writable, so load from source again next time
+        pass
+    asset_cache.close()
+    player_atlas = assets['player_atlas']
+    zombie_atlases = assets['zombie_atlases']
+    background_image = assets['background_image']
+    for rect in nav_grid.obstacle_rects():
+        pygame.draw.rect(background_image, COLORS['OBSTACLE'], rect)
+        pygame.draw.rect(background_image, COLORS['BLACK'], rect, 2)
+    background = Background(background_image)
+    chest_image = assets['chest_image']
+    orb_image = assets['orb_image']
+    for name, sound in assets['sounds'].items():
+        audio.add(name, sound)
+
+    decals = DecalLayer(background, fade_duration=BloodParticles.LIFETIME)
+    blood_particles = BloodParticles(decals=decals)
     projectiles = pygame.sprite.Group()
     zombies = pygame.sprite.Group()
     floating_texts = pygame.sprite.Group()
@@ -1035,17 +1318,26 @@ if __name__ == '__main__':
     players = pygame.sprite.Group()
 
     fps_color = COLORS['GAMMA']
-    clock = pygame.time.Clock()
-    camera = Camera(GAME_WINDOW['WIDTH'], GAME_WINDOW['HEIGHT'])
-    player = Player(
-        x=PLAY_AREA['WIDTH'] // 2,
-        y=PLAY_AREA['HEIGHT'] // 2,
-        image=player_image,
+    clock = game_clock.current()
+    profiler = Profiler(
+        window=max(args.frames, Profiler.WINDOW) if benchmark else Profiler.WINDOW,
+        trace_capacity=None if args.trace else Profiler.TRACE_CAPACITY,
     )
+    profiler_overlay = ProfilerOverlay(profiler, base_font)
+    camera = Camera(GAME_WINDOW['WIDTH'], GAME_WINDOW['HEIGHT'])
+    x, y = open_position((PLAY_AREA['WIDTH'] // 2, PLAY_AREA['HEIGHT'] // 2))
+    player = Player(x=x, y=y, atlas=player_atlas)
     players.add(player)
+    flow_field_cache = FlowFieldCache(compute=pathfinder.flow_field)
+    flow_field = flow_field_cache.get(FlowField.cell_at(player.rect.center))
+    flow_field_cache.prewarm(flow_field.goal)
+    zombie_grid = SpatialGrid()
+    projectile_collisions = SweptCollisions(zombie_grid, margin=Zombie.HITBOX_MARGIN)
+    zombie_contacts = ContactCollisions(
+        zombie_grid, max_radius=max(atlas.radius for atlas in zombie_atlases.values())
+    )
 
-    SPAWN_ZOMBIE = pygame.USEREVENT + 1
-    pygame.time.set_timer(SPAWN_ZOMBIE, Zombie.SPAWN_INTERVAL)
+    spawn_timer = None
     current_wave = 1
     zombies_to_spawn = []
 
@@ -1069,402 +1361,395 @@ if __name__ == '__main__':
         for weapon_name in [weapon.name]
     }
     reloading = {weapon_name: False for weapon_name in all_weapon_names}
-    reload_start_time = {weapon_name: 0 for weapon_name in all_weapon_names}
     start_time = 0
-    last_spawn_time = 0
     wave_start_time = 0
     wave_delay_active = False
     auto_firing = False
     show_upgrade_panel = False
 
-    while running:
-        mouse_pos = pygame.mouse.get_pos()
-        adjusted_mouse_pos = get_adjusted_mouse_pos(camera)
-        keys = pygame.key.get_pressed()
-        dt = clock.tick(GAME_WINDOW['FPS']) / 1000.0
-        current_time = pygame.time.get_ticks()
-        time_since_last_shot = (
-            current_time - last_fired_time[player.current_weapon.name]
-        )
+    previous_centers = {}
+    previous_camera_pos = camera.rect.topleft
 
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 3:
-                    auto_firing = not auto_firing
-                    print(
-                        'Auto-firing mode enabled'
-                        if auto_firing
-                        else 'Auto-firing mode disabled'
-                    )
-                elif event.button == 1 and show_upgrade_panel:
-                    panel_width = 1600
-                    panel_height = 900
-                    panel_x = (1920 - panel_width) // 2
-                    panel_y = (1080 - panel_height) // 2
-
-                    option_width = 450
-                    option_height = 200
-                    options_per_row = 3
-                    horizontal_padding = 50
-                    vertical_padding = 50
-
-                    for i, option in enumerate(UPGRADE_OPTIONS):
-                        row = i // options_per_row
-                        col = i % options_per_row
-
-                        x = (
-                            panel_x
-                            + col * (option_width + horizontal_padding)
-                            + horizontal_padding
-                        )
-                        y = (
-                            panel_y
-                            + row * (option_height + vertical_padding)
-                            + vertical_padding
-                        )
+    if benchmark is not None:
+        game_state = 'running'
+        auto_firing = True
+        start_benchmark_scenario(benchmark.scenario)
 
-                        if pygame.Rect(x, y, option_width, option_height).collidepoint(
-                            mouse_pos
-                        ):
-                            apply_upgrade(i)
-                            show_upgrade_panel = False
-                            break
-
-            elif event.type == pygame.KEYDOWN:
-                if game_state == 'main_menu':
-                    if event.key == pygame.K_RETURN:
-                        game_state = 'running'
-                        start_time = pygame.time.get_ticks()
-                        current_wave = 0
-                        manage_waves()
-                    elif event.key == pygame.K_h:
-                        game_state = 'how_to_play'
-                    elif event.key == pygame.K_c:
-                        game_state = 'credits'
-                    elif event.key == pygame.K_ESCAPE:
-                        running = False
-                elif game_state in ['how_to_play', 'credits']:
-                    if event.key == pygame.K_ESCAPE:
-                        game_state = 'main_menu'
-                elif game_state == 'running':
-                    if event.key == pygame.K_ESCAPE:
-                        game_state = 'paused'
-                    elif event.key in [
-                        pygame.K_1,
-                        pygame.K_2,
-                        pygame.K_3,
-                        pygame.K_4,
-                        pygame.K_5,
-                        pygame.K_6,
-                        pygame.K_7,
-                    ]:
-                        category_index = event.key - pygame.K_1
-                        player.switch_weapon_category(category_index)
-                    elif event.key == pygame.K_r:
-                        if (
-                            not reloading[player.current_weapon.name]
-                            and player.current_weapon.ammo
-                            < player.current_weapon.max_ammo
-                        ):
-                            reload_start_time[player.current_weapon.name] = current_time
-                            reloading[player.current_weapon.name] = True
-                            pygame.mixer.Sound.play(reload_sound)
-                elif game_state == 'paused':
-                    if event.key == pygame.K_RETURN:
-                        game_state = 'running'
-                    elif event.key == pygame.K_ESCAPE:
-                        game_state = 'main_menu'
-            elif event.type == pygame.MOUSEWHEEL and game_state == 'running':
-                player.cycle_weapon(event.y)
-            elif event.type == SPAWN_ZOMBIE and game_state == 'running':
-                if current_time >= wave_start_time:
-                    if wave_delay_active:
-                        wave_delay_active = False
-                    if current_time - last_spawn_time >= Zombie.SPAWN_INTERVAL:
-                        if zombies_to_spawn and len(zombies) < Zombie.MAX_ALIVE_COUNT:
-                            zombie_type, count = random.choice(zombies_to_spawn)
-                            spawn_zombie(zombie_type)
-                            count -= 1
-                            if count > 0:
-                                zombies_to_spawn = [
-                                    (t, c) if t != zombie_type else (t, count)
-                                    for t, c in zombies_to_spawn
-                                ]
-                            else:
-                                zombies_to_spawn = [
-                                    (t, c)
-                                    for t, c in zombies_to_spawn
-                                    if t != zombie_type
-                                ]
-                            last_spawn_time = current_time
-                        elif not zombies and not zombies_to_spawn:
-                            wave_delay_active = True
+    replay_start = time.perf_counter()
+    while running:
+        with profiler.scope(Profiler.IDLE):
+            # Replays run uncapped, taking frame times from the recording
+            frame_ms = clock.tick(GAME_WINDOW['FPS'] if replay is None else 0)
+
+        with profiler.scope('events'):
+            if replay is None:
+                frame_input = FrameInput.capture(frame_ms)
+            else:
+                pygame.event.pump()
+                frame_input = replay.next_frame()
+                if frame_input is None:
+                    break
+            if recorder is not None:
+                recorder.record(frame_input)
+
+            if game_state == 'running' and not show_upgrade_panel:
+                steps = timestep.advance(frame_input.frame_ms)
+            else:
+                timestep.skip(frame_input.frame_ms)
+                steps = 0
+
+            if benchmark is not None:
+                mouse_pos = benchmark.aim(camera.apply(player).center)
+                player.health = player.max_health
+                show_upgrade_panel = False
+            else:
+                mouse_pos = frame_input.mouse_pos
+            adjusted_mouse_pos = get_adjusted_mouse_pos(camera, mouse_pos)
+            keys = frame_input.held_keys
+            current_time = game_clock.get_ticks()
+
+            for event in frame_input.events:
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type == pygame.MOUSEBUTTONDOWN:
+                    if event.button == 3:
+                        auto_firing = not auto_firing
+                        print(
+                            'Auto-firing mode enabled'
+                            if auto_firing
+                            else 'Auto-firing mode disabled'
+                        )
+                    elif event.button == 1 and show_upgrade_panel:
+                        for i, rect in enumerate(upgrade_option_rects()):
+                            if rect.collidepoint(mouse_pos):
+                                apply_upgrade(i)
+                                show_upgrade_panel = False
+                                break
+
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_F3:
+                        profiler_overlay.toggle()
+                    elif event.key == pygame.K_F4:
+                        export_trace()
+                    elif game_state == 'main_menu':
+                        if event.key == pygame.K_RETURN:
+                            game_state = 'running'
+                            start_time = game_clock.get_ticks()
+                            current_wave = 0
                             manage_waves()
+                        elif event.key == pygame.K_h:
+                            game_state = 'how_to_play'
+                        elif event.key == pygame.K_c:
+                            game_state = 'credits'
+                        elif event.key == pygame.K_ESCAPE:
+                            running = False
+                    elif game_state in ['how_to_play', 'credits']:
+                        if event.key == pygame.K_ESCAPE:
+                            game_state = 'main_menu'
+                    elif game_state == 'running':
+                        if event.key == pygame.K_ESCAPE:
+                            game_state = 'paused'
+                        elif event.key in [
+                            pygame.K_1,
+                            pygame.K_2,
+                            pygame.K_3,
+                            pygame.K_4,
+                            pygame.K_5,
+                            pygame.K_6,
+                            pygame.K_7,
+                        ]:
+                            category_index = event.key - pygame.K_1
+                            player.switch_weapon_category(category_index)
+                        elif event.key == pygame.K_r:
+                            if (
+                                not reloading[player.current_weapon.name]
+                                and player.current_weapon.ammo
+                                < player.current_weapon.max_ammo
+                            ):
+                                start_reload(player.current_weapon)
+                    elif game_state == 'paused':
+                        if event.key == pygame.K_RETURN:
+                            game_state = 'running'
+                        elif event.key == pygame.K_ESCAPE:
+                            game_state = 'main_menu'
+                elif event.type == pygame.MOUSEWHEEL and game_state == 'running':
+                    player.cycle_weapon(event.y)
+
+        if game_state == 'running' and show_upgrade_panel:
+            # The world is frozen behind the panel, so the screen is drawn once
+            with profiler.scope('background'):
+                upgrade_screen = ui_screens.get('upgrade_panel', draw_upgrade_screen)
+                if renderer.begin_frame(view='upgrade_panel'):
+                    screen.blit(upgrade_screen, (0, 0))
+                else:
+                    renderer.restore(upgrade_screen)
+        elif game_state == 'running':
+            flow_field_misses = flow_field_cache.misses
+            for _ in range(steps):
+                # Snapshot positions for drawing between this step and the next
+                previous_centers = {
+                    sprite: sprite.rect.center for sprite in moving_sprites()
+                }
+                previous_camera_pos = camera.rect.topleft
+                timestep.step()
+                current_time = game_clock.get_ticks()
+
+                with profiler.scope('update'):
+                    scheduler.run_due(current_time)
+                    time_since_last_shot = (
+                        current_time - last_fired_time[player.current_weapon.name]
+                    )
+                    for orb in energy_orbs:
+                        if pygame.sprite.collide_rect(player, orb):
+                            orb.kill()
+                            player.update_level_and_xp(1)
 
-        if game_state == 'running':
-            player.update(keys, adjusted_mouse_pos)
-            camera.update(player)
-
-            if show_upgrade_panel:
-                # Draw the game world first
-                bg_x = -camera.rect.x
-                bg_y = -camera.rect.y
-                scaled_background = pygame.transform.scale(
-                    background_image,
-                    (PLAY_AREA['WIDTH'], PLAY_AREA['HEIGHT']),
-                )
-                screen_rect = pygame.Rect(0, 0, PLAY_AREA['WIDTH'], PLAY_AREA['HEIGHT'])
-                image_rect = scaled_background.get_rect()
-                image_rect.topleft = (bg_x, bg_y)
-                cropped_image = scaled_background.subsurface(
-                    screen_rect.clip(image_rect)
-                )
-                screen.blit(cropped_image, (0, 0))
-
-                # Then render all game elements
-                for group in all_sprites():
-                    for sprite in group:
-                        screen.blit(sprite.image, camera.apply(sprite))
-
-                # Now add the semi-transparent overlay
-                overlay = pygame.Surface(
-                    (GAME_WINDOW['WIDTH'], GAME_WINDOW['HEIGHT']), pygame.SRCALPHA
-                )
-                overlay.fill(
-                    (0, 0, 0, 75)
-                )  # Adjust alpha value (128) for desired transparency
-                screen.blit(overlay, (0, 0))
-
-                option_rects = render_upgrade_panel()
-                cursor.draw(surface=screen, center_pos=mouse_pos)
-                pygame.display.flip()
-                continue
-
-            for orb in energy_orbs:
-                if pygame.sprite.collide_rect(player, orb):
-                    orb.kill()
-                    player.update_level_and_xp(1)
-
-            for chest in chests:
-                if pygame.sprite.collide_rect(player, chest):
-                    chest.open()
-                    unlock_random_weapon()
-
-            if (
-                player.current_weapon.ammo == 0
-                and not reloading[player.current_weapon.name]
-            ):
-                reload_start_time[player.current_weapon.name] = current_time
-                reloading[player.current_weapon.name] = True
-                pygame.mixer.Sound.play(reload_sound)
+                    for chest in chests:
+                        if pygame.sprite.collide_rect(player, chest):
+                            chest.open()
+                            unlock_random_weapon()
 
-            if (
-                reloading[player.current_weapon.name]
-                and current_time - reload_start_time[player.current_weapon.name]
-                >= player.current_weapon.reload_time
-            ):
-                player.current_weapon.ammo = player.current_weapon.max_ammo
-                reloading[player.current_weapon.name] = False
+                    if (
+                        player.current_weapon.ammo == 0
+                        and not reloading[player.current_weapon.name]
+                    ):
+                        start_reload(player.current_weapon)
 
-            if (
-                not reloading[player.current_weapon.name]
-                and time_since_last_shot >= player.current_weapon.fire_rate
-            ):
-                mouse_buttons = pygame.mouse.get_pressed()
-                if mouse_buttons[0] or auto_firing:
-                    if player.current_weapon.ammo > 0:
-                        angle = math.atan2(
-                            adjusted_mouse_pos[1] - player.rect.centery,
-                            adjusted_mouse_pos[0] - player.rect.centerx,
-                        )
-                        flash_pos = (
-                            player.rect.centerx + math.cos(angle) * 30,
-                            player.rect.centery + math.sin(angle) * 30,
-                        )
-                        muzzle_flash = MuzzleFlash(flash_pos, angle)
-                        muzzle_flashes.add(muzzle_flash)
-
-                        if 'SG' in player.current_weapon.name:
-                            for _ in range(10):
-                                pellet_angle = angle + random.uniform(
-                                    -player.current_weapon.spread_angle,
-                                    player.current_weapon.spread_angle,
-                                )
-                                projectiles.add(create_projectile(pellet_angle))
-                            pygame.mixer.Sound.play(fire_sound_mossberg)
-                        else:
-                            adjusted_angle = angle + random.uniform(
-                                -player.current_weapon.spread_angle,
-                                player.current_weapon.spread_angle,
-                            )
-                            projectiles.add(create_projectile(adjusted_angle))
-
-                        weapon_sound = {
-                            'Glock(PDW)': fire_sound_beretta,
-                            'Mosin(BOLT)': [firing_sound_mosin, fire_sound_mosin],
-                            'PKM(LMG)': fire_sound_pkm,
-                            'Skorpian(SMG)': fire_sound_skorpian,
-                            'AK-47(AR)': fire_sound_ak47,
-                            # 'SVT-40(RIFLE)': fire_sound_svt,
-                            # 'RPG-7(BLAST)': fire_sound_rpg
-                        }.get(player.current_weapon.name, None)
-
-                        if weapon_sound:
-                            if isinstance(weapon_sound, list):
-                                for sound in weapon_sound:
-                                    pygame.mixer.Sound.play(sound)
-                            else:
-                                pygame.mixer.Sound.play(weapon_sound)
-
-                        player.shake()
-                        last_fired_time[player.current_weapon.name] = current_time
-                        player.current_weapon.ammo -= 1
-                    else:
-                        reload_start_time[player.current_weapon.name] = current_time
-                        reloading[player.current_weapon.name] = True
-                        pygame.mixer.Sound.play(reload_sound)
-
-            energy_orbs.update()
-            muzzle_flashes.update()
-            player.update(keys, adjusted_mouse_pos)
-            player.update_shake()
-            blood_particles.update()
-            projectiles.update()
-            zombies.update()
-            floating_texts.update()
-            camera.update(player)
-
-            for projectile in projectiles:
-                start_pos = projectile.rect.center
-                end_pos = (start_pos[0] + projectile.dx, start_pos[1] + projectile.dy)
-                for zombie in zombies:
                     if (
-                        line_collision(start_pos, end_pos, zombie)
-                        and zombie not in projectile.zombies_hit
+                        not reloading[player.current_weapon.name]
+                        and time_since_last_shot >= player.current_weapon.fire_rate
                     ):
-                        current_damage = projectile.get_current_damage()
-                        zombie.take_damage(current_damage)
-                        damage_color = projectile.get_penetration_color()
-                        damage_text = FloatingText(
-                            zombie.rect.centerx,
-                            zombie.rect.top,
-                            int(current_damage),
-                            damage_color,
-                            blood_font,
-                        )
-                        floating_texts.add(damage_text)
-                        blood_particles.add(
-                            *BloodParticle.spawn_spray(
-                                pos=zombie.rect.center,
-                            )
+                        if frame_input.mouse_buttons[0] or auto_firing:
+                            if player.current_weapon.ammo > 0:
+                                angle = math.atan2(
+                                    adjusted_mouse_pos[1] - player.rect.centery,
+                                    adjusted_mouse_pos[0] - player.rect.centerx,
+                                )
+                                flash_pos = (
+                                    player.rect.centerx + math.cos(angle) * 30,
+                                    player.rect.centery + math.sin(angle) * 30,
+                                )
+                                muzzle_flash = MuzzleFlash.spawn(flash_pos, angle)
+                                muzzle_flashes.add(muzzle_flash)
+
+                                weapon = player.current_weapon
+                                for _ in range(weapon.pellets):
+                                    pellet_angle = angle + random.uniform(
+                                        -weapon.spread_angle, weapon.spread_angle
+                                    )
+                                    projectiles.add(create_projectile(pellet_angle))
+                                for sound in weapon.sounds:
+                                    audio.play(sound)
+
+                                player.shake()
+                                last_fired_time[player.current_weapon.name] = (
+                                    current_time
+                                )
+                                player.current_weapon.ammo -= 1
+                            else:
+                                start_reload(player.current_weapon)
+
+                    player.update(keys, adjusted_mouse_pos)
+                    player.update_shake()
+                    blood_particles.update()
+                    decals.update()
+                    projectiles.update()
+                with profiler.scope('pathfinding'):
+                    player_cell = FlowField.cell_at(player.rect.center)
+                    if player_cell != flow_field.goal:
+                        flow_field = flow_field_cache.get(player_cell)
+                        flow_field_cache.prewarm(player_cell)
+                with profiler.scope('update'):
+                    if zombie_swarm is not None:
+                        zombie_swarm.step(
+                            flow_field=flow_field,
+                            nav_grid=nav_grid,
+                            fallback_target=player.rect.center,
+                            now=current_time,
                         )
-                        projectile.reduce_penetration(zombie)
-                        if projectile.penetration <= 0:
-                            projectile.kill()
-
-            bg_x = -camera.rect.x
-            bg_y = -camera.rect.y
-            scaled_background = pygame.transform.scale(
-                background_image,
-                (PLAY_AREA['WIDTH'], PLAY_AREA['HEIGHT']),
-            )
-            screen_rect = pygame.Rect(0, 0, PLAY_AREA['WIDTH'], PLAY_AREA['HEIGHT'])
-            image_rect = scaled_background.get_rect()
-            image_rect.topleft = (bg_x, bg_y)
-            cropped_image = scaled_background.subsurface(screen_rect.clip(image_rect))
-            screen.blit(cropped_image, (0, 0))
-
-            progress = player.xp / LEVEL_THRESHOLDS[player.level + 1]
-            draw_progress_bar(
-                screen,
-                10,
-                GAME_WINDOW['HEIGHT'] - 30,
-                GAME_WINDOW['WIDTH'] - 20,
-                20,
-                progress,
-                COLORS['RED'],
-            )
+                        zombie_swarm.sync()
+                    zombies.update()
+                    floating_texts.update()
+                    camera.update(player)
 
-            for group in all_sprites():
-                for sprite in group:
-                    screen.blit(sprite.image, camera.apply(sprite))
+                with profiler.scope('collisions'):
+                    zombie_grid.rebuild(zombies)
 
-            for zombie in zombies:
-                zombie.draw_health_bar(camera)
-                if pygame.sprite.collide_mask(player, zombie):
-                    player.take_damage(25)
+                    for projectile, hit_zombies in projectile_collisions.hits(
+                        projectiles
+                    ):
+                        for zombie in hit_zombies:
+                            if not projectile.alive():
+                                break
+                            if zombie not in projectile.zombies_hit:
+                                current_damage = projectile.get_current_damage()
+                                zombie.take_damage(current_damage)
+                                damage_color = projectile.get_penetration_color()
+                                damage_text = spawn_moving(
+                                    FloatingText,
+                                    zombie.rect.centerx,
+                                    zombie.rect.top,
+                                    int(current_damage),
+                                    damage_color,
+                                    blood_font,
+                                )
+                                floating_texts.add(damage_text)
+                                blood_particles.spawn_spray(pos=zombie.rect.center)
+                                projectile.reduce_penetration(zombie)
+
+                with profiler.scope('contact'):
+                    for zombie in zombie_contacts.touching(player):
+                        player.take_damage(game_clock.per_step(Zombie.CONTACT_DAMAGE))
                     if player.health <= 0:
-                        start_time = pygame.time.get_ticks()
+                        start_time = game_clock.get_ticks()
                         restart_game()
                         game_state = 'main_menu'
+                if game_state != 'running' or show_upgrade_panel:
+                    break
+
+            if flow_field_cache.misses == flow_field_misses:
+                with profiler.scope('pathfinding'):
+                    # One field around the player per frame, unless one was just missed
+                    flow_field_cache.compute_pending()
+
+            offset = interpolated_offset()
+            with profiler.scope('background'):
+                changed_rects = background.take_changed_rects()
+                if renderer.begin_frame(view=(offset, background.version)):
+                    background.draw(surface=screen, offset=offset)
+                else:
+                    # Redraw areas of the background rebuilt, e.g. by decal fading
+                    changed_rects = [
+                        rect.move(offset).clip(screen.get_rect())
+                        for rect in changed_rects
+                    ]
+                    changed_rects = [rect for rect in changed_rects if rect]
+                    renderer.mark_all(changed_rects)
+                    background.draw(
+                        surface=screen,
+                        offset=offset,
+                        rects=renderer.stale_rects + changed_rects,
+                    )
 
-            elapsed_time = (current_time - start_time) / 1000
-            render_text(f'Time: {elapsed_time:.2f} s', base_font, 475, 10)
-            render_text(f'Wave: {current_wave}', base_font, 700, 10)
-            render_text(f'Score: {player.score}', score_font, 875, 10)
-            render_text(
-                f'FPS: {int(clock.get_fps())}',
-                fps_font,
-                GAME_WINDOW['WIDTH'] - 140,
-                10,
-                COLORS['GAMMA'],
-            )
-            render_text(
-                f'Total Kills: {player.total_kills} (Remaining: {len(zombies)})',
-                base_font,
-                10,
-                10,
-            )
-
-            version_text = 'Alpha 1.02'
-            version_surface = base_font.render(version_text, True, COLORS['WHITE'])
-            version_rect = version_surface.get_rect()
-            version_rect.bottomright = (
-                GAME_WINDOW['WIDTH'] - 10,
-                GAME_WINDOW['HEIGHT'] - 40,
-            )
-            screen.blit(version_surface, version_rect)
+            with profiler.scope('hud'):
+                progress = player.xp / LEVEL_THRESHOLDS[player.level + 1]
+                renderer.mark(
+                    draw_progress_bar(
+                        screen,
+                        10,
+                        GAME_WINDOW['HEIGHT'] - 30,
+                        GAME_WINDOW['WIDTH'] - 20,
+                        20,
+                        progress,
+                        COLORS['RED'],
+                    )
+                )
 
-            player_pos = camera.apply(player).topleft
-            weapon_text = f'{player.current_weapon.name}'
-            ammo_text = f'| {player.current_weapon.ammo} |'
-            weapon_text_surface = base_font.render(weapon_text, True, COLORS['WHITE'])
-            ammo_text_surface = base_font.render(ammo_text, True, COLORS['YELLOW'])
+            with profiler.scope('sprites'):
+                renderer.mark_all(blood_particles.draw(surface=screen, offset=offset))
+                draw_sprites(offset)
 
-            weapon_text_pos = (player_pos[0], player_pos[1] - -60)
-            ammo_text_pos = (player_pos[0], player_pos[1] - -80)
+            with profiler.scope('hud'):
+                for zombie in zombies:
+                    zombie.draw_health_bar(camera)
+
+            with profiler.scope('hud'):
+                elapsed_time = (current_time - start_time) / 1000
+                render_dynamic_text(f'Time: {elapsed_time:.2f} s', base_font, 475, 10)
+                render_text(f'Wave: {current_wave}', base_font, 700, 10)
+                render_dynamic_text(f'Score: {player.score}', score_font, 875, 10)
+                render_dynamic_text(
+                    f'FPS: {int(clock.get_fps())}',
+                    fps_font,
+                    GAME_WINDOW['WIDTH'] - 140,
+                    10,
+                    COLORS['GAMMA'],
+                )
+                render_dynamic_text(
+                    f'Total Kills: {player.total_kills} (Remaining: {len(zombies)})',
+                    base_font,
+                    10,
+                    10,
+                )
 
-            screen.blit(weapon_text_surface, weapon_text_pos)
-            screen.blit(ammo_text_surface, ammo_text_pos)
+                version_text = 'Alpha 1.02'
+                version_surface = text_cache.render(
+                    base_font, version_text, COLORS['WHITE']
+                )
+                version_rect = version_surface.get_rect()
+                version_rect.bottomright = (
+                    GAME_WINDOW['WIDTH'] - 10,
+                    GAME_WINDOW['HEIGHT'] - 40,
+                )
+                renderer.blit(version_surface, version_rect)
 
-            if auto_firing:
-                auto_fire_text = base_font.render(
-                    'Auto-Fire: ON', True, COLORS['YELLOW']
+                player_pos = interpolated_rect(player, offset).topleft
+                weapon_text = f'{player.current_weapon.name}'
+                ammo_text = f'| {player.current_weapon.ammo} |'
+                weapon_text_surface = text_cache.render(
+                    base_font, weapon_text, COLORS['WHITE']
                 )
-                auto_fire_text_pos = (player_pos[0], player_pos[1] - -100)
-                screen.blit(auto_fire_text, auto_fire_text_pos)
-
-            HealthBar(player)
-            if reloading[player.current_weapon.name]:
-                reload_text = 'Reloading...'
-                reload_text_surface = base_font.render(
-                    reload_text, True, COLORS['YELLOW']
+                ammo_text_surface = text_cache.render(
+                    base_font, ammo_text, COLORS['YELLOW']
                 )
-                reload_text_pos = (player_pos[0], player_pos[1] - -120)
-                screen.blit(reload_text_surface, reload_text_pos)
-        elif game_state == 'main_menu':
-            render_text_screen('MAIN_MENU')
-        elif game_state == 'paused':
-            render_text_screen('PAUSED')
-        elif game_state == 'how_to_play':
-            render_text_screen('HOW_TO_PLAY')
-        elif game_state == 'credits':
-            render_text_screen('CREDITS')
-
-        cursor.draw(surface=screen, center_pos=mouse_pos)
-        pygame.display.flip()
 
+                weapon_text_pos = (player_pos[0], player_pos[1] - -60)
+                ammo_text_pos = (player_pos[0], player_pos[1] - -80)
+
+                renderer.blit(weapon_text_surface, weapon_text_pos)
+                renderer.blit(ammo_text_surface, ammo_text_pos)
+
+                if auto_firing:
+                    auto_fire_text = text_cache.render(
+                        base_font, 'Auto-Fire: ON', COLORS['YELLOW']
+                    )
+                    auto_fire_text_pos = (player_pos[0], player_pos[1] - -100)
+                    renderer.blit(auto_fire_text, auto_fire_text_pos)
+
+                HealthBar(player)
+                if reloading[player.current_weapon.name]:
+                    reload_text = 'Reloading...'
+                    reload_text_surface = text_cache.render(
+                        base_font, reload_text, COLORS['YELLOW']
+                    )
+                    reload_text_pos = (player_pos[0], player_pos[1] - -120)
+                    renderer.blit(reload_text_surface, reload_text_pos)
+        else:
+            # Menu screens are static, so each is drawn once
+            menu_screen = ui_screens.get(
+                game_state, lambda: render_text_screen(game_state.upper())
+            )
+            if renderer.begin_frame(view=game_state):
+                screen.blit(menu_screen, (0, 0))
+            else:
+                renderer.restore(menu_screen)
+
+        with profiler.scope('hud'):
+            renderer.mark(profiler_overlay.draw(surface=screen, pos=(10, 40)))
+
+        with profiler.scope('flip'):
+            renderer.mark(cursor.draw(surface=screen, center_pos=mouse_pos))
+            renderer.present()
+
+        if benchmark is None:
+            profiler.end_frame()
+        elif benchmark.end_frame(profiler):
+            if benchmark.scenario is None:
+                running = False
+            else:
+                start_benchmark_scenario(benchmark.scenario)
+
+    if benchmark is not None:
+        print(benchmark.report())
+    if recorder is not None:
+        recorder.close()
+        print(f'Wrote recording: {recorder.path}')
+    if replay is not None:
+        print(
+            f'Replayed {replay.frame} frames in '
+            f'{time.perf_counter() - replay_start:.2f} s'
+        )
+    if args.trace:
+        export_trace(args.trace)
     pygame.quit()
     sys.exit()
@@ -0,0 +1,301 @@
+"""Contains `AssetCache` and `AssetLoader` classes."""
+
+import hashlib
+import io
+import json
+import mmap
+import struct
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from typing import ClassVar, TypeVar
+
+import pygame
+
+from src.rotation_atlas import RotationAtlas
+
+K = TypeVar('K')
+T = TypeVar('T')
+
+Entry = tuple[str, dict, bytes]
+"""Source hash, metadata and data of a cached asset."""
+Finish = Callable[[], T]
+"""Function which completes loading an asset on the main thread.
+
+Converting surfaces for the display and creating sounds aren't safe off the main
+thread, so background loading only reads and decodes data, leaving those steps to
+the returned function.
+"""
+
+
+def finish_each(reads: dict[K, Finish[T]]) -> Finish[dict[K, T]]:
+    """Return a function which finishes loading each of `reads`."""
+    return lambda: {key: finish() for key, finish in reads.items()}
+
+
+class AssetCache:
+    """Pack file of decoded and preprocessed assets, keyed by source file hash.
+
+    Assets missing from the pack, or whose source has changed, are loaded from their
+    source and written by `save()`. Later runs read them from the memory-mapped pack
+    instead of decoding, scaling and rotating them again.
+    """
+
+    MAGIC: ClassVar = b'TDSPACK1'
+    VERSION: ClassVar = 1
+    """Change to invalidate packs written by earlier versions."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._index: dict[str, dict] = {}
+        self._map: mmap.mmap | None = None
+        self._data_start = 0
+        self._new: dict[str, Entry] = {}
+        self._used: set[str] = set()
+        self._open()
+
+    def image(
+        self,
+        source: Path,
+        *,
+        size: tuple[int, int] | None = None,
+        alpha: bool = True,
+    ) -> pygame.Surface:
+        """Return the image at `source`, scaled to `size` and converted for display."""
+        return self.read_image(source, size=size, alpha=alpha)()
+
+    def read_image(
+        self,
+        source: Path,
+        *,
+        size: tuple[int, int] | None = None,
+        alpha: bool = True,
+    ) -> Finish[pygame.Surface]:
+        """Read the image at `source`; return a function to convert it for display."""
+        pixel_format = 'RGBA' if alpha else 'RGB'
+        key = f'image:{self._name(source)}:{size}:{pixel_format}'
+
+        def load() -> tuple[dict, bytes]:
+            image = pygame.image.load(source)
+            if size is not None:
+                image = pygame.transform.scale(image, size)
+            return (
+                {'size': image.get_size()},
+                pygame.image.tobytes(image, pixel_format),
+            )
+
+        meta, data = self._get(key, source, load)
+
+        def finish() -> pygame.Surface:
+            image = pygame.image.frombytes(data, tuple(meta['size']), pixel_format)
+            return image.convert_alpha() if alpha else image.convert()
+
+        return finish
+
+    def rotation_atlas(
+        self, source: Path, *, steps: int = RotationAtlas.STEPS
+    ) -> RotationAtlas:
+        """Return a `RotationAtlas` of the image at `source`."""
+        return self.read_rotation_atlas(source, steps=steps)()
+
+    def read_rotation_atlas(
+        self, source: Path, *, steps: int = RotationAtlas.STEPS
+    ) -> Finish[RotationAtlas]:
+        """Read a `RotationAtlas` of `source`; return a function to convert it."""
+        key = f'atlas:{self._name(source)}:{steps}'
+
+        def load() -> tuple[dict, bytes]:
+            atlas = RotationAtlas(pygame.image.load(source), steps=steps)
+            return (
+                {'sizes': [frame.get_size() for frame in atlas.frames]},
+                b''.join(pygame.image.tobytes(frame, 'RGBA') for frame in atlas.frames),
+            )
+
+        meta, data = self._get(key, source, load)
+
+        def finish() -> RotationAtlas:
+            frames = []
+            offset = 0
+            for width, height in meta['sizes']:
+                length = width * height * 4
+                frame = pygame.image.frombytes(
+                    data[offset : offset + length], (width, height), 'RGBA'
+                )
+                frames.append(frame.convert_alpha())
+                offset += length
+            return RotationAtlas.from_frames(frames)
+
+        return finish
+
+    def sound(self, source: Path) -> pygame.mixer.Sound:
+        """Return the sound at `source`, decoded for the current mixer settings."""
+        return self.read_sound(source)()
+
+    def read_sound(self, source: Path) -> Finish[pygame.mixer.Sound]:
+        """Read the samples of the sound at `source`; return a function to play them."""
+        key = f'sound:{self._name(source)}:{pygame.mixer.get_init()}'
+        digest, cached = self._lookup(key, source)
+        if cached is not None:
+            _, data = cached
+            return lambda: pygame.mixer.Sound(buffer=data)
+        # Decoding creates a mixer sound, so only the file is read here
+        encoded = source.read_bytes()
+
+        def finish() -> pygame.mixer.Sound:
+            sound = pygame.mixer.Sound(file=io.BytesIO(encoded))
+            self._store(key, digest, {}, sound.get_raw())
+            return sound
+
+        return finish
+
+    def save(self) -> None:
+        """Write the pack if any assets were missing, keeping only those used."""
+        if not self._new:
+            return
+        index = {}
+        blobs = []
+        offset = 0
+        for key in sorted(self._used):
+            digest, meta, data = self._new.get(key) or self._read(key)
+            index[key] = {
+                'hash': digest,
+                'meta': meta,
+                'offset': offset,
+                'length': len(data),
+            }
+            blobs.append(data)
+            offset += len(data)
+        encoded_index = json.dumps(index).encode()
+
+        self.close()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix('.tmp')
+        with temp_path.open('wb') as file:
+            file.write(self.MAGIC)
+            file.write(struct.pack('<Q', len(encoded_index)))
+            file.write(encoded_index)
+            file.writelines(blobs)
+        temp_path.replace(self.path)
+        self._new.clear()
+        self._open()
+
+    def close(self) -> None:
+        """Unmap the pack file."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._index = {}
+
+    def _open(self) -> None:
+        try:
+            with self.path.open('rb') as file:
+                self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Missing or empty pack
+            return
+        header_length = len(self.MAGIC) + 8
+        try:
+            if self._map[: len(self.MAGIC)] != self.MAGIC:
+                raise ValueError
+            (index_length,) = struct.unpack_from('<Q', self._map, len(self.MAGIC))
+            self._index = json.loads(
+                self._map[header_length : header_length + index_length]
+            )
+        except (ValueError, struct.error):
+            # Corrupt pack, which will be replaced on save
+            self.close()
+            return
+        self._data_start = header_length + index_length
+
+    def _get(
+        self, key: str, source: Path, load: Callable[[], tuple[dict, bytes]]
+    ) -> tuple[dict, bytes]:
+        """Return metadata and data for `key`, calling `load` if not in the pack."""
+        digest, cached = self._lookup(key, source)
+        if cached is not None:
+            return cached
+        meta, data = load()
+        self._store(key, digest, meta, data)
+        return meta, data
+
+    def _lookup(self, key: str, source: Path) -> tuple[str, tuple[dict, bytes] | None]:
+        """Return the hash of `source`, and metadata and data for `key` if cached."""
+        self._used.add(key)
+        digest = self._digest(key, source)
+        if key in self._new and self._new[key][0] == digest:
+            return digest, self._new[key][1:]
+        entry = self._index.get(key)
+        if entry is not None and entry['hash'] == digest:
+            self.hits += 1
+            return digest, self._read(key)[1:]
+        self.misses += 1
+        return digest, None
+
+    def _store(self, key: str, digest: str, meta: dict, data: bytes) -> None:
+        """Add an asset loaded from source, to be written by `save()`."""
+        self._new[key] = (digest, meta, data)
+
+    def _read(self, key: str) -> Entry:
+        entry = self._index[key]
+        start = self._data_start + entry['offset']
+        return entry['hash'], entry['meta'], self._map[start : start + entry['length']]
+
+    def _digest(self, key: str, source: Path) -> str:
+        digest = hashlib.blake2b(f'{self.VERSION}:{key}'.encode())
+        digest.update(source.read_bytes())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _name(source: Path) -> str:
+        """Return a name for `source` which doesn't depend on the install location."""
+        return f'{source.parent.name}/{source.name}'
+
+
+class AssetLoader:
+    """Runs named loading tasks in order on a background thread.
+
+    Each task reads and decodes its assets, returning a function which `join()`
+    calls on the main thread to finish loading them.
+    """
+
+    def __init__(self, tasks: dict[str, Callable[[], Finish[object]]]) -> None:
+        self.tasks = tasks
+        self.results: dict[str, object] = {}
+        self._reads: dict[str, Finish[object]] = {}
+        self._error: Exception | None = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @property
+    def progress(self) -> float:
+        """Return the fraction of tasks read."""
+        return len(self._reads) / max(len(self.tasks), 1)
+
+    @property
+    def done(self) -> bool:
+        """Return True once all tasks have been read or one has failed."""
+        return not self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start running the tasks."""
+        self._thread.start()
+
+    def join(self) -> dict[str, object]:
+        """Wait for the tasks and finish them; return their results.
+
+        Raises the first error from a task.
+        """
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+        for name, finish in self._reads.items():
+            self.results[name] = finish()
+        return self.results
+
+    def _run(self) -> None:
+        try:
+            for name, task in self.tasks.items():
+                self._reads[name] = task()
+        except Exception as error:
+            self._error = error
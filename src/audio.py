@@ -0,0 +1,104 @@
+"""Contains `AudioManager` class."""
+
+from collections.abc import Callable
+from pathlib import Path
+from typing import ClassVar
+
+import pygame
+
+
+class AudioManager:
+    """Decodes each sound effect once and plays it on a limited group of channels.
+
+    Every sound belongs to a group with its own mixer channels, so frequent sounds,
+    such as zombie groans, can't take the channels needed by others. When all of a
+    group's channels are busy, a new sound either replaces the group's oldest sound
+    or is dropped, depending on the group.
+    """
+
+    GROUPS: ClassVar = {
+        'weapons': (8, True),
+        'impacts': (6, True),
+        'groans': (4, False),
+        'ui': (2, True),
+    }
+    """Number of channels and whether to replace the oldest sound, per group."""
+
+    def __init__(
+        self,
+        *,
+        groups: dict[str, tuple[int, bool]] | None = None,
+        load: Callable[[Path], pygame.mixer.Sound] = pygame.mixer.Sound,
+    ) -> None:
+        """Decode sound files with `load`, e.g. to read them from a cache."""
+        groups = self.GROUPS if groups is None else groups
+        self.load = load
+        channel_count = sum(count for count, _ in groups.values())
+        pygame.mixer.set_num_channels(channel_count)
+        pygame.mixer.set_reserved(channel_count)
+        self._paths: dict[str, tuple[Path, str]] = {}
+        self._sounds: dict[str, pygame.mixer.Sound] = {}
+        self._channels: dict[str, list[pygame.mixer.Channel]] = {}
+        self._replaces_oldest: dict[str, bool] = {}
+        self._started: dict[str, list[int]] = {}
+        """Play counter at which each channel's sound started, per group."""
+        self._plays = 0
+        first = 0
+        for group, (count, replaces_oldest) in groups.items():
+            self._channels[group] = [
+                pygame.mixer.Channel(i) for i in range(first, first + count)
+            ]
+            self._replaces_oldest[group] = replaces_oldest
+            self._started[group] = [0] * count
+            first += count
+
+    def register(self, name: str, path: Path, *, group: str) -> None:
+        """Make the sound file at `path` playable as `name` in channel `group`."""
+        if group not in self._channels:
+            msg = f'Unknown sound group: {group}'
+            raise KeyError(msg)
+        self._paths[name] = (path, group)
+
+    def preload(self) -> None:
+        """Decode all registered sounds which haven't been played yet."""
+        for name, path in self.unloaded().items():
+            self.add(name, self.load(path))
+
+    def unloaded(self) -> dict[str, Path]:
+        """Return the paths of registered sounds which haven't been decoded yet."""
+        return {
+            name: path
+            for name, (path, _) in self._paths.items()
+            if name not in self._sounds
+        }
+
+    def add(self, name: str, sound: pygame.mixer.Sound) -> None:
+        """Use `sound`, decoded elsewhere, for the registered sound `name`."""
+        self._sounds[name] = sound
+
+    def sound(self, name: str) -> pygame.mixer.Sound:
+        """Return the decoded sound `name`, decoding it on first use."""
+        sound = self._sounds.get(name)
+        if sound is None:
+            sound = self.load(self._paths[name][0])
+            self._sounds[name] = sound
+        return sound
+
+    def play(self, name: str) -> pygame.mixer.Channel | None:
+        """Play sound `name`; return its channel, or None if it was dropped."""
+        group = self._paths[name][1]
+        channels = self._channels[group]
+        started = self._started[group]
+        index = next(
+            (i for i, channel in enumerate(channels) if not channel.get_busy()),
+            None,
+        )
+        if index is None:
+            if not self._replaces_oldest[group]:
+                return None
+            index = started.index(min(started))
+        self._plays += 1
+        started[index] = self._plays
+        channel = channels[index]
+        channel.play(self.sound(name))
+        return channel
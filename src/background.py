@@ -0,0 +1,77 @@
+"""Contains `Background` class."""
+
+from collections.abc import Sequence
+
+import pygame
+
+from src.constants import PLAY_AREA
+
+
+class Background:
+    """Play area background, scaled once and blitted through the camera."""
+
+    def __init__(
+        self,
+        image: pygame.Surface,
+        *,
+        size: tuple[int, int] = (PLAY_AREA['WIDTH'], PLAY_AREA['HEIGHT']),
+    ) -> None:
+        self.source_image = image
+        self.overlay: pygame.Surface | None = None
+        """Surface composited over the scaled image, e.g. ground decals."""
+        self.version = 0
+        """Incremented whenever the drawn image is rebuilt in full."""
+        self.changed_rects: list[pygame.Rect] = []
+        """Areas of the drawn image rebuilt since `take_changed_rects()`."""
+        self.resize(size)
+
+    def resize(self, size: tuple[int, int]) -> None:
+        """Rescale the source image to `size`, e.g. after a resolution change."""
+        if self.source_image.get_size() == size:
+            self.scaled_image = self.source_image
+        else:
+            self.scaled_image = pygame.transform.scale(self.source_image, size)
+        self.compose()
+
+    def compose(self, area: pygame.Rect | None = None) -> None:
+        """Rebuild the drawn image from the scaled image and the overlay.
+
+        If `area` is given, only that part is rebuilt and recorded as changed.
+        """
+        if area is None:
+            self.image = self.scaled_image.copy()
+            if self.overlay is not None:
+                self.image.blit(self.overlay, (0, 0))
+            self.changed_rects.clear()
+            self.version += 1
+            return
+        self.image.blit(self.scaled_image, area, area)
+        if self.overlay is not None:
+            self.image.blit(self.overlay, area, area)
+        self.changed_rects.append(area)
+
+    def take_changed_rects(self) -> list[pygame.Rect]:
+        """Return and forget the areas rebuilt since the last call."""
+        rects = self.changed_rects
+        self.changed_rects = []
+        return rects
+
+    def draw(
+        self,
+        *,
+        surface: pygame.Surface,
+        offset: tuple[int, int],
+        rects: Sequence[pygame.Rect] | None = None,
+    ) -> None:
+        """Blit the region visible through the camera `offset` onto `surface`.
+
+        If `rects` is given, only those screen areas are redrawn.
+        """
+        view = surface.get_rect().move(-offset[0], -offset[1])
+        if rects is None:
+            surface.blit(self.image, (0, 0), view)
+            return
+        surface.blits(
+            [(self.image, rect, rect.move(view.topleft)) for rect in rects],
+            doreturn=False,
+        )
@@ -0,0 +1,94 @@
+"""Contains `Benchmark` class and related types."""
+
+import math
+from dataclasses import dataclass
+from typing import ClassVar
+
+from src.profiler import Profiler
+
+
+@dataclass
+class BenchmarkScenario:
+    """A scripted wave, run for a fixed number of frames."""
+
+    wave: int
+    zombies: int
+    frames: int
+
+
+@dataclass
+class BenchmarkResult:
+    """Mean milliseconds per frame spent in each phase of a scenario."""
+
+    scenario: BenchmarkScenario
+    phase_ms: dict[str, float]
+    p95_frame_ms: float
+
+    @property
+    def total_ms(self) -> float:
+        """Mean milliseconds per frame of work, i.e. across all phases but idle."""
+        return sum(ms for phase, ms in self.phase_ms.items() if phase != Profiler.IDLE)
+
+
+class Benchmark:
+    """Steps through scripted scenarios and collects their frame costs."""
+
+    AIM_RADIUS: ClassVar = 200
+    """Pixels."""
+    AIM_TURN_FRAMES: ClassVar = 240
+    """Frames for the scripted aim to sweep a full turn."""
+
+    def __init__(self, scenarios: list[BenchmarkScenario]) -> None:
+        self.scenarios = scenarios
+        self.results: list[BenchmarkResult] = []
+        self.frame = 0
+
+    @property
+    def scenario(self) -> BenchmarkScenario | None:
+        """Return the scenario being run, or None once all have finished."""
+        if len(self.results) < len(self.scenarios):
+            return self.scenarios[len(self.results)]
+        return None
+
+    def aim(self, center: tuple[int, int]) -> tuple[int, int]:
+        """Return the scripted mouse position, circling `center`."""
+        angle = 2 * math.pi * self.frame / self.AIM_TURN_FRAMES
+        return (
+            round(center[0] + math.cos(angle) * self.AIM_RADIUS),
+            round(center[1] + math.sin(angle) * self.AIM_RADIUS),
+        )
+
+    def end_frame(self, profiler: Profiler) -> bool:
+        """Count a frame; return True if it completed the current scenario."""
+        profiler.end_frame()
+        self.frame += 1
+        if self.frame < self.scenario.frames:
+            return False
+        self.results.append(
+            BenchmarkResult(
+                self.scenario,
+                profiler.mean_ms(),
+                profiler.percentile_ms(Profiler.FRAME, 95),
+            )
+        )
+        profiler.reset()
+        self.frame = 0
+        return True
+
+    def report(self) -> str:
+        """Return a table of mean milliseconds per frame for each scenario."""
+        phases = list(dict.fromkeys(p for r in self.results for p in r.phase_ms))
+        header = ['wave', 'zombies', 'frames', 'p95 frame', 'total', *phases]
+        lines = [' '.join(f'{column:>10}' for column in header)]
+        for result in self.results:
+            scenario = result.scenario
+            cells = [
+                f'{scenario.wave:>10}',
+                f'{scenario.zombies:>10}',
+                f'{scenario.frames:>10}',
+                f'{result.p95_frame_ms:>10.3f}',
+                f'{result.total_ms:>10.3f}',
+                *(f'{result.phase_ms.get(phase, 0):>10.3f}' for phase in phases),
+            ]
+            lines.append(' '.join(cells))
+        return '\n'.join(lines)
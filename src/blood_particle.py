@@ -1,54 +1,177 @@
-"""Contains `BloodParticle` class."""
+"""Contains `BloodParticles` class."""
 
 import math
 import random
-from typing import ClassVar, Self
+from typing import ClassVar
 
+import numpy as np
 import pygame
 
+from src import game_clock
 from src.constants import COLORS
+from src.decal_layer import BlitSequence, DecalLayer
 
 
-class BloodParticle(pygame.sprite.Sprite):
-    """Represents a blood particle."""
+class BloodParticles:
+    """Pool of blood particles, stored as NumPy arrays.
+
+    Particles are moved and faded with vectorised operations and drawn in one batch
+    from shared surfaces, one per size and alpha level, instead of each being a sprite
+    with its own surface. If a `DecalLayer` is given, particles that have come to
+    rest are stamped into it and freed.
+    """
 
     PARTICLES_PER_SPRAY: ClassVar = 5
     LIFETIME: ClassVar = 100 * 1000
     """Milliseconds."""
     INITIAL_SPEED_MIN: ClassVar = 0.7
-    """Minimum initial speed, pixels per frame."""
+    """Minimum initial speed, pixels per step."""
     INITIAL_SPEED_MAX: ClassVar = 1.5
-    """Maximum initial speed, pixels per frame."""
+    """Maximum initial speed, pixels per step."""
     DECELERATION: ClassVar = 0.02
-    """Factor for speed reduction per frame."""
-
-    def __init__(self, *, pos: tuple[int, int]) -> None:
-        super().__init__()
-        self.image = pygame.Surface((random.randint(1, 5), random.randint(1, 5)))
-        self.image.fill(COLORS['RED'])
-        self.rect = self.image.get_rect(center=pos)
-        angle = random.uniform(0, 2 * math.pi)
-        speed = random.uniform(self.INITIAL_SPEED_MIN, self.INITIAL_SPEED_MAX)
-        self.dx = speed * math.cos(angle) * -1
-        self.dy = speed * math.sin(angle) * -1
-        self.spawn_time = pygame.time.get_ticks()
-        self.alpha = 255
-
-    @classmethod
-    def spawn_spray(cls, *, pos: tuple[int, int]) -> set[Self]:
-        """Return a set of `BloodParticle`s representing a spray."""
-        return {cls(pos=pos) for _ in range(cls.PARTICLES_PER_SPRAY)}
+    """Factor for speed reduction per step."""
+    REST_SPEED: ClassVar = 0.05
+    """Pixels per step, below which a particle is at rest."""
+    MAX_SIZE: ClassVar = 5
+    """Pixels."""
+    ALPHA_LEVELS: ClassVar = 32
+    """Number of distinct alpha values particles fade through."""
+    INITIAL_CAPACITY: ClassVar = 1024
+
+    def __init__(
+        self,
+        *,
+        capacity: int = INITIAL_CAPACITY,
+        decals: DecalLayer | None = None,
+    ) -> None:
+        self.decals = decals
+        self.count = 0
+        self.positions = np.zeros((capacity, 2), dtype=np.float32)
+        """Top left corners, pixels."""
+        self.velocities = np.zeros((capacity, 2), dtype=np.float32)
+        """Pixels per step."""
+        self.sizes = np.zeros((capacity, 2), dtype=np.intp)
+        self.spawn_times = np.zeros(capacity, dtype=np.int64)
+        self.alphas = np.zeros(capacity, dtype=np.intp)
+        self._images = self._build_images()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def clear(self) -> None:
+        """Remove all particles."""
+        self.count = 0
+
+    def spawn_spray(self, *, pos: tuple[int, int]) -> None:
+        """Add a spray of particles centered on `pos`."""
+        self._reserve(self.PARTICLES_PER_SPRAY)
+        now = game_clock.get_ticks()
+        for _ in range(self.PARTICLES_PER_SPRAY):
+            i = self.count
+            width = random.randint(1, self.MAX_SIZE)
+            height = random.randint(1, self.MAX_SIZE)
+            angle = random.uniform(0, 2 * math.pi)
+            speed = random.uniform(self.INITIAL_SPEED_MIN, self.INITIAL_SPEED_MAX)
+            self.positions[i] = (pos[0] - width // 2, pos[1] - height // 2)
+            self.velocities[i] = (
+                speed * math.cos(angle) * -1,
+                speed * math.sin(angle) * -1,
+            )
+            self.sizes[i] = (width, height)
+            self.spawn_times[i] = now
+            self.alphas[i] = 255
+            self.count += 1
 
     def update(self) -> None:
-        """Update the entity."""
-        self.rect.x += int(self.dx)
-        self.rect.y += int(self.dy)
-        self.dx *= 1 - self.DECELERATION
-        self.dy *= 1 - self.DECELERATION
-
-        elapsed_time = pygame.time.get_ticks() - self.spawn_time
-        if elapsed_time < self.LIFETIME:
-            self.alpha = int(255 * (1 - elapsed_time / self.LIFETIME))
-            self.image.set_alpha(self.alpha)
-        else:
-            self.kill()
+        """Move, slow and fade all particles.
+
+        Expired particles are removed, and resting ones are moved to the decal layer.
+        """
+        n = self.count
+        if not n:
+            return
+        scale = game_clock.step_scale()
+        self.positions[:n] += self.velocities[:n] * scale
+        self.velocities[:n] *= (1 - self.DECELERATION) ** scale
+        elapsed_times = game_clock.get_ticks() - self.spawn_times[:n]
+        self.alphas[:n] = 255 * (1 - elapsed_times / self.LIFETIME)
+        removed = elapsed_times >= self.LIFETIME
+        if self.decals is not None:
+            speeds_squared = (self.velocities[:n] ** 2).sum(axis=1)
+            resting = ~removed & (speeds_squared < self.REST_SPEED**2)
+            if resting.any():
+                self.decals.stamp(self._blit_sequence(resting, (0, 0)))
+                removed |= resting
+        if removed.any():
+            self._compact(~removed)
+
+    def draw(
+        self, *, surface: pygame.Surface, offset: tuple[int, int]
+    ) -> list[pygame.Rect]:
+        """Blit the particles visible through the camera `offset` onto `surface`.
+
+        Return the areas drawn.
+        """
+        n = self.count
+        if not n:
+            return []
+        destinations = self.positions[:n].astype(np.intp) + offset
+        sizes = self.sizes[:n]
+        width, height = surface.get_size()
+        visible = (
+            (destinations[:, 0] + sizes[:, 0] > 0)
+            & (destinations[:, 1] + sizes[:, 1] > 0)
+            & (destinations[:, 0] < width)
+            & (destinations[:, 1] < height)
+        )
+        return surface.blits(self._blit_sequence(visible, offset))
+
+    def _blit_sequence(
+        self, selected: np.ndarray, offset: tuple[int, int]
+    ) -> BlitSequence:
+        """Return (image, destination) pairs for particles selected by a mask."""
+        n = self.count
+        destinations = self.positions[:n][selected].astype(np.intp) + offset
+        sizes = self.sizes[:n][selected]
+        levels = self.alphas[:n][selected] * (self.ALPHA_LEVELS - 1) // 255
+        images = self._images[sizes[:, 0], sizes[:, 1], levels]
+        return zip(images.tolist(), destinations.tolist(), strict=True)
+
+    def _build_images(self) -> np.ndarray:
+        """Return surfaces for every size and alpha level, indexed [w, h, level]."""
+        images = np.empty(
+            (self.MAX_SIZE + 1, self.MAX_SIZE + 1, self.ALPHA_LEVELS), dtype=object
+        )
+        for width in range(1, self.MAX_SIZE + 1):
+            for height in range(1, self.MAX_SIZE + 1):
+                for level in range(self.ALPHA_LEVELS):
+                    image = pygame.Surface((width, height))
+                    image.fill(COLORS['RED'])
+                    image.set_alpha(level * 255 // (self.ALPHA_LEVELS - 1))
+                    images[width, height, level] = image
+        return images
+
+    def _reserve(self, extra: int) -> None:
+        """Grow the arrays, if needed, to hold `extra` more particles."""
+        capacity = len(self.spawn_times)
+        if self.count + extra <= capacity:
+            return
+        new_capacity = max(capacity * 2, self.count + extra)
+        for name in ('positions', 'velocities', 'sizes', 'spawn_times', 'alphas'):
+            old = getattr(self, name)
+            new = np.zeros((new_capacity, *old.shape[1:]), dtype=old.dtype)
+            new[: self.count] = old[: self.count]
+            setattr(self, name, new)
+
+    def _compact(self, keep: np.ndarray) -> None:
+        """Keep only the particles selected by boolean mask `keep`."""
+        kept = int(keep.sum())
+        for array in (
+            self.positions,
+            self.velocities,
+            self.sizes,
+            self.spawn_times,
+            self.alphas,
+        ):
+            array[:kept] = array[: self.count][keep]
+        self.count = kept
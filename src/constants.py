@@ -16,6 +16,7 @@ COLORS: dict[str, tuple[int, int, int]] = {
     'NEON': (57, 255, 20),
     'YELLOW': (255, 255, 0),
     'GAMMA': (74, 254, 2),
+    'OBSTACLE': (70, 66, 60),
 }
 PENETRATION_COLORS: list[tuple[int, int, int]] = [
     (255, 0, 0),
@@ -0,0 +1,29 @@
+"""Contains `ContactCollisions` class."""
+
+import pygame
+
+from src.spatial_grid import SpatialGrid
+
+
+class ContactCollisions:
+    """Finds the sprites in a `SpatialGrid` whose masks touch a given sprite.
+
+    Candidates from nearby cells are filtered with a bounding circle test, using
+    each sprite's `radius`, so the mask test only runs for sprites that may overlap.
+    """
+
+    def __init__(self, grid: SpatialGrid, *, max_radius: float) -> None:
+        self.grid = grid
+        self.max_radius = max_radius
+        """Upper bound on the `radius` of sprites in the grid, pixels."""
+
+    def touching(self, sprite: pygame.sprite.Sprite) -> list[pygame.sprite.Sprite]:
+        """Return the sprites in the grid whose masks overlap `sprite`'s mask."""
+        return [
+            other
+            for other in self.grid.query_radius(
+                sprite.rect.center, sprite.radius + self.max_radius
+            )
+            if pygame.sprite.collide_circle(sprite, other)
+            and pygame.sprite.collide_mask(sprite, other)
+        ]
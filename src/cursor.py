@@ -33,10 +33,12 @@ class Cursor(pygame.sprite.Sprite):
             radius=self.INNER_RADIUS,
         )
 
-    def draw(self, *, surface: pygame.Surface, center_pos: tuple[int, int]) -> None:
-        """Blit to `surface`, centered on `center_pos`."""
+    def draw(
+        self, *, surface: pygame.Surface, center_pos: tuple[int, int]
+    ) -> pygame.Rect:
+        """Blit to `surface`, centered on `center_pos`; return the area drawn."""
 
-        surface.blit(
+        return surface.blit(
             self.image,
             (center_pos[0] - self.OUTER_RADIUS, center_pos[1] - self.OUTER_RADIUS),
         )
@@ -0,0 +1,98 @@
+"""Contains `DecalLayer` class."""
+
+from collections.abc import Iterable, Iterator
+from typing import ClassVar
+
+import pygame
+
+from src import game_clock
+from src.background import Background
+
+BlitSequence = Iterable[tuple[pygame.Surface, tuple[int, int]]]
+
+
+class DecalLayer:
+    """Persistent ground marks, baked into the background.
+
+    Decals are stamped once into a play area sized surface, which is composited over
+    the background image, so they cost nothing per frame. Fading is done by periodic
+    passes over square tiles of the surface rather than per decal. Only tiles which
+    hold decals are faded, each on its own schedule, so passes are spread over frames.
+    """
+
+    FADE_STEP: ClassVar = 5
+    """Alpha removed from every decal per fade pass."""
+    TILE_SIZE: ClassVar = 64
+    """Pixels."""
+    MAX_TILES_PER_UPDATE: ClassVar = 16
+    """Tiles faded per update, beyond which due passes wait for later updates."""
+
+    def __init__(
+        self,
+        background: Background,
+        *,
+        fade_duration: int | None = None,
+    ) -> None:
+        """Fade decals out over `fade_duration` milliseconds, or never if None."""
+        self.background = background
+        self.image = pygame.Surface(background.image.get_size(), pygame.SRCALPHA)
+        background.overlay = self.image
+        self.fade_interval = (
+            None if fade_duration is None else fade_duration * self.FADE_STEP // 255
+        )
+        """Milliseconds between fade passes."""
+        self._fading: dict[tuple[int, int], tuple[int, int]] = {}
+        """Time of the next fade pass and passes left, per tile holding decals."""
+
+    def stamp(self, blit_sequence: BlitSequence) -> None:
+        """Blit (surface, world position) pairs into the layer and the background."""
+        blit_sequence = list(blit_sequence)
+        rects = self.image.blits(blit_sequence)
+        self.background.image.blits(blit_sequence, doreturn=False)
+        if self.fade_interval is None:
+            return
+        passes = -(-255 // self.FADE_STEP)
+        next_fade = game_clock.get_ticks() + self.fade_interval
+        for rect in rects:
+            for tile in self._tiles(rect):
+                due, _ = self._fading.get(tile, (next_fade, 0))
+                self._fading[tile] = (due, passes)
+
+    def update(self) -> None:
+        """Fade the decals in each tile whose fade pass is due."""
+        if not self._fading:
+            return
+        now = game_clock.get_ticks()
+        due_tiles = [
+            (tile, passes) for tile, (due, passes) in self._fading.items() if due <= now
+        ]
+        for tile, passes in due_tiles[: self.MAX_TILES_PER_UPDATE]:
+            area = pygame.Rect(
+                tile[0] * self.TILE_SIZE,
+                tile[1] * self.TILE_SIZE,
+                self.TILE_SIZE,
+                self.TILE_SIZE,
+            ).clip(self.image.get_rect())
+            self.image.fill(
+                (0, 0, 0, self.FADE_STEP), area, special_flags=pygame.BLEND_RGBA_SUB
+            )
+            self.background.compose(area)
+            if passes > 1:
+                self._fading[tile] = (now + self.fade_interval, passes - 1)
+            else:
+                del self._fading[tile]
+
+    def clear(self) -> None:
+        """Remove all decals."""
+        self.image.fill((0, 0, 0, 0))
+        self._fading.clear()
+        self.background.compose()
+
+    def _tiles(self, rect: pygame.Rect) -> Iterator[tuple[int, int]]:
+        """Yield the tiles which `rect` overlaps, if it isn't empty."""
+        if not rect:
+            return
+        size = self.TILE_SIZE
+        for x in range(rect.left // size, (rect.right - 1) // size + 1):
+            for y in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                yield x, y
@@ -1,5 +1,7 @@
 import pygame
 
+from src.scheduler import scheduler
+
 
 class EnergyOrb(pygame.sprite.Sprite):
     """Represents an energy orb that the player can collect."""
@@ -9,9 +11,9 @@ class EnergyOrb(pygame.sprite.Sprite):
         self.image = image
         self.rect = self.image.get_rect(center=(x, y))
         self.lifetime = 10000000
-        self.spawn_time = pygame.time.get_ticks()
+        self.expiry = scheduler.call_later(self.lifetime, self.kill)
 
-    def update(self) -> None:
-        """Checks if the orb's lifetime has expired and removes it if so."""
-        if pygame.time.get_ticks() - self.spawn_time > self.lifetime:
-            self.kill()
+    def kill(self) -> None:
+        """Remove the orb from all groups and cancel its expiry."""
+        scheduler.cancel(self.expiry)
+        super().kill()
@@ -0,0 +1,214 @@
+"""Contains `FlowField` and `FlowFieldCache` classes."""
+
+import heapq
+import math
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import ClassVar
+
+import numpy as np
+
+from src.constants import PLAY_AREA
+
+Cell = tuple[int, int]
+
+
+class FlowField:
+    """Shared map of next steps towards a single goal cell.
+
+    Distances are computed once per goal with Dijkstra's algorithm, so every zombie
+    can look up its next step in constant time instead of running its own search.
+    """
+
+    CELL_SIZE: ClassVar = 32
+    """Pixels."""
+    GRID_SIZE: ClassVar = (
+        math.ceil(PLAY_AREA['WIDTH'] / CELL_SIZE),
+        math.ceil(PLAY_AREA['HEIGHT'] / CELL_SIZE),
+    )
+    """Cells."""
+    DIAGONAL_COST: ClassVar = 1.414
+    NEIGHBOR_OFFSETS: ClassVar = (
+        (1, 0),
+        (-1, 0),
+        (0, 1),
+        (0, -1),
+        (1, 1),
+        (-1, -1),
+        (1, -1),
+        (-1, 1),
+    )
+
+    def __init__(
+        self,
+        *,
+        goal: Cell,
+        grid_size: Cell = GRID_SIZE,
+        blocked: np.ndarray | None = None,
+    ) -> None:
+        self.goal = goal
+        self.grid_size = grid_size
+        self.blocked = blocked
+        """Cells which can't be entered, indexed [y, x], or None if there are none."""
+        cell_count = grid_size[0] * grid_size[1]
+        self.distances: list[float] = [math.inf] * cell_count
+        self._next_cells: list[Cell | None] = [None] * cell_count
+        self._next_cells_array: np.ndarray | None = None
+        if self.in_bounds(goal):
+            self._compute()
+
+    @classmethod
+    def cell_at(cls, pos: tuple[float, float]) -> Cell:
+        """Return the grid cell containing the pixel position `pos`."""
+        return int(pos[0] // cls.CELL_SIZE), int(pos[1] // cls.CELL_SIZE)
+
+    def in_bounds(self, cell: Cell) -> bool:
+        """Return whether `cell` lies within the grid."""
+        return 0 <= cell[0] < self.grid_size[0] and 0 <= cell[1] < self.grid_size[1]
+
+    def next_cell(self, cell: Cell) -> Cell | None:
+        """Return the next cell on the way to the goal, or None if there is none."""
+        if not self.in_bounds(cell):
+            return None
+        return self._next_cells[self._index(cell)]
+
+    def next_cells_array(self) -> np.ndarray:
+        """Return next cells as an array indexed by `y * width + x`, -1 for none."""
+        if self._next_cells_array is None:
+            self._next_cells_array = np.array(
+                [(-1, -1) if cell is None else cell for cell in self._next_cells],
+                dtype=np.intp,
+            )
+        return self._next_cells_array
+
+    def distance(self, cell: Cell) -> float:
+        """Return the path cost from `cell` to the goal."""
+        if not self.in_bounds(cell):
+            return math.inf
+        return self.distances[self._index(cell)]
+
+    def _index(self, cell: Cell) -> int:
+        return cell[1] * self.grid_size[0] + cell[0]
+
+    def _compute(self) -> None:
+        """Fill distances outwards from the goal, recording each cell's next step."""
+        width, height = self.grid_size
+        distances = self.distances
+        next_cells = self._next_cells
+        if self.blocked is None:
+            blocked = [False] * (width * height)
+        else:
+            blocked = self.blocked.ravel().tolist()
+        distances[self._index(self.goal)] = 0
+        frontier = [(0.0, self.goal)]
+
+        while frontier:
+            cost, current = heapq.heappop(frontier)
+            x, y = current
+            if cost > distances[y * width + x]:
+                continue
+            for dx, dy in self.NEIGHBOR_OFFSETS:
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < width and 0 <= ny < height):
+                    continue
+                index = ny * width + nx
+                if blocked[index]:
+                    continue
+                if dx == 0 or dy == 0:
+                    new_cost = cost + 1
+                elif blocked[y * width + nx] or blocked[ny * width + x]:
+                    # Don't cut the corners of obstacles
+                    continue
+                else:
+                    new_cost = cost + self.DIAGONAL_COST
+                if new_cost < distances[index]:
+                    distances[index] = new_cost
+                    next_cells[index] = current
+                    heapq.heappush(frontier, (new_cost, (nx, ny)))
+
+
+class FlowFieldCache:
+    """Least-recently-used cache of flow fields, keyed by goal cell.
+
+    Returning to a recently visited cell reuses its field instead of searching again.
+    Fields for the cells around the current goal can be queued with `prewarm()` and
+    computed one per frame with `compute_pending()`, so moving to a neighboring cell
+    is usually a cache hit rather than a search in the middle of a frame.
+    """
+
+    MAX_SIZE: ClassVar = 64
+    """Maximum number of cached fields."""
+
+    def __init__(
+        self,
+        *,
+        max_size: int = MAX_SIZE,
+        grid_size: Cell = FlowField.GRID_SIZE,
+        blocked: np.ndarray | None = None,
+        compute: Callable[[Cell], FlowField] | None = None,
+    ) -> None:
+        """Compute fields with `compute`, by default a `FlowField` over the grid."""
+        self.max_size = max_size
+        self.grid_size = grid_size
+        self.blocked = blocked
+        """Passed to each field."""
+        self.compute = compute
+        self.hits = 0
+        self.misses = 0
+        """Fields computed by `get()` because none was cached."""
+        self._fields: OrderedDict[Cell, FlowField] = OrderedDict()
+        self._pending: list[Cell] = []
+        """Goals queued by `prewarm()`, nearest first."""
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def get(self, goal: Cell) -> FlowField:
+        """Return the field for `goal`, computing it if it isn't cached."""
+        field = self._fields.get(goal)
+        if field is not None:
+            self._fields.move_to_end(goal)
+            self.hits += 1
+            return field
+        field = self._compute(goal)
+        self.misses += 1
+        self._put(goal, field)
+        return field
+
+    def prewarm(self, goal: Cell) -> None:
+        """Queue fields for the cells around `goal`, replacing any queued before.
+
+        Cells queued for an earlier goal are dropped, as the goal has moved on.
+        """
+        self._pending = [
+            cell
+            for dx, dy in FlowField.NEIGHBOR_OFFSETS
+            if (cell := (goal[0] + dx, goal[1] + dy)) not in self._fields
+            and 0 <= cell[0] < self.grid_size[0]
+            and 0 <= cell[1] < self.grid_size[1]
+        ]
+
+    def compute_pending(self) -> bool:
+        """Compute the next queued field, returning whether there was one."""
+        while self._pending:
+            goal = self._pending.pop(0)
+            if goal not in self._fields:
+                self._put(goal, self._compute(goal))
+                return True
+        return False
+
+    def invalidate(self) -> None:
+        """Discard all fields, e.g. after obstacles have changed."""
+        self._pending.clear()
+        self._fields.clear()
+
+    def _compute(self, goal: Cell) -> FlowField:
+        if self.compute is not None:
+            return self.compute(goal)
+        return FlowField(goal=goal, grid_size=self.grid_size, blocked=self.blocked)
+
+    def _put(self, goal: Cell, field: FlowField) -> None:
+        self._fields[goal] = field
+        self._fields.move_to_end(goal)
+        if len(self._fields) > self.max_size:
+            self._fields.popitem(last=False)
@@ -0,0 +1,150 @@
+"""Game clocks and the `get_ticks()` function used in place of pygame's.
+
+Game code reads time through this module, so a simulated clock can be installed for
+headless runs and benchmarks, and a fixed timestep can make game time advance in
+simulation steps.
+"""
+
+from typing import ClassVar
+
+import pygame
+
+from src.constants import GAME_WINDOW
+
+
+class SystemClock:
+    """Wall clock time, as reported by pygame."""
+
+    def __init__(self) -> None:
+        self._clock = pygame.time.Clock()
+
+    def get_ticks(self) -> int:
+        """Return milliseconds since `pygame.init()`."""
+        return pygame.time.get_ticks()
+
+    def tick(self, framerate: int = 0) -> int:
+        """Wait to limit the frame rate; return milliseconds since the last call."""
+        return self._clock.tick(framerate)
+
+    def get_fps(self) -> float:
+        """Return the average frame rate over recent ticks."""
+        return self._clock.get_fps()
+
+
+class FixedStepClock:
+    """Simulated clock which advances by a fixed step on every tick without waiting."""
+
+    def __init__(self, *, step_ms: float = 1000 / GAME_WINDOW['FPS']) -> None:
+        self.step_ms = step_ms
+        self._ticks = 0.0
+
+    def get_ticks(self) -> int:
+        """Return simulated milliseconds since the clock was created."""
+        return int(self._ticks)
+
+    def tick(self, framerate: int = 0) -> float:
+        """Advance by one step; return the step in milliseconds."""
+        self._ticks += self.step_ms
+        return self.step_ms
+
+    def get_fps(self) -> float:
+        """Return the simulated frame rate."""
+        return 1000 / self.step_ms
+
+
+class FixedTimestep:
+    """Splits elapsed frame time into simulation steps of a fixed length.
+
+    Movement is tuned in pixels per step at `BASE_RATE`; `scale` converts it for
+    other rates, so the simulation rate doesn't change gameplay speed.
+    """
+
+    BASE_RATE: ClassVar = GAME_WINDOW['FPS']
+    """Steps per second that movement is tuned for."""
+    MAX_STEPS: ClassVar = 5
+    """Steps per frame, beyond which time is dropped rather than caught up."""
+
+    def __init__(self, *, rate: float = BASE_RATE, max_steps: int = MAX_STEPS) -> None:
+        self.rate = rate
+        self.step_ms = 1000 / rate
+        self.scale = self.BASE_RATE / rate
+        self.max_steps = max_steps
+        self.ticks = 0.0
+        """Simulated milliseconds."""
+        self.accumulator = 0.0
+        """Milliseconds of frame time not yet simulated."""
+
+    @property
+    def alpha(self) -> float:
+        """Return how far, from 0 to 1, frame time has run into the next step."""
+        return self.accumulator / self.step_ms
+
+    def advance(self, elapsed_ms: float) -> int:
+        """Add `elapsed_ms` of frame time; return the number of steps to simulate."""
+        self.accumulator += elapsed_ms
+        steps = int(self.accumulator // self.step_ms)
+        if steps > self.max_steps:
+            self.accumulator %= self.step_ms
+            return self.max_steps
+        self.accumulator -= steps * self.step_ms
+        return steps
+
+    def skip(self, elapsed_ms: float) -> None:
+        """Advance simulated time without stepping, e.g. while the game is paused."""
+        self.ticks += elapsed_ms
+        self.accumulator = 0.0
+
+    def step(self) -> None:
+        """Advance simulated time by one step."""
+        self.ticks += self.step_ms
+
+
+Clock = SystemClock | FixedStepClock
+
+_clock: Clock | None = None
+_timestep: FixedTimestep | None = None
+
+
+def install(clock: Clock) -> None:
+    """Use `clock` as the source of game time."""
+    global _clock
+    _clock = clock
+
+
+def current() -> Clock:
+    """Return the installed clock, installing a `SystemClock` if there is none."""
+    if _clock is None:
+        install(SystemClock())
+    return _clock
+
+
+def install_timestep(timestep: FixedTimestep | None) -> None:
+    """Use simulated time from `timestep` as game time, or clock time if None."""
+    global _timestep
+    _timestep = timestep
+
+
+def get_ticks() -> int:
+    """Return the current game time in milliseconds."""
+    if _timestep is not None:
+        return int(_timestep.ticks)
+    return current().get_ticks()
+
+
+def step_scale() -> float:
+    """Return the factor converting per step movement to the simulation rate."""
+    if _timestep is not None:
+        return _timestep.scale
+    return 1.0
+
+
+def step_ms() -> float:
+    """Return the game time simulated by one step, in milliseconds."""
+    if _timestep is not None:
+        return _timestep.step_ms
+    return 1000 / FixedTimestep.BASE_RATE
+
+
+def per_step(per_second: float) -> float:
+    """Return the part of an amount per second of game time that falls in one step."""
+    return per_second * step_ms() / 1000
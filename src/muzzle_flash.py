@@ -1,31 +1,61 @@
 import math
 import random
+from typing import ClassVar
 
 import pygame
 
+from src.pool import PooledSprite
+from src.rotation_atlas import RotationAtlas
+from src.scheduler import scheduler
 
-class MuzzleFlash(pygame.sprite.Sprite):
+
+class MuzzleFlash(PooledSprite):
     """Represents a muzzle flash effect when the player fires a weapon."""
 
-    def __init__(self, pos: tuple[int, int], angle: float) -> None:
-        super().__init__()
-        self.original_image = pygame.Surface((10, 10), pygame.SRCALPHA)
+    VARIANTS: ClassVar = 8
+    """Number of prebaked color variations."""
+    _atlases: ClassVar[list[RotationAtlas]] = []
+
+    def reset(self, pos: tuple[int, int], angle: float) -> None:
+        """Show a flash at `pos`, pointing along `angle` radians."""
+        atlas = random.choice(self.atlases())
+        self.image = atlas.frame(math.degrees(-angle))
+        self.rect = self.image.get_rect(center=pos)
+        self.lifetime = random.randint(1, 4)
+        self.expiry = scheduler.call_later(self.lifetime, self.kill)
+
+    def kill(self) -> None:
+        """Return the flash to the pool and cancel its expiry."""
+        scheduler.cancel(self.expiry)
+        super().kill()
+
+    @classmethod
+    def atlases(cls) -> list[RotationAtlas]:
+        """Return the rotated flash images, building them on first use."""
+        if not cls._atlases:
+            cls._atlases.extend(
+                RotationAtlas(cls.create_image()) for _ in range(cls.VARIANTS)
+            )
+        return cls._atlases
+
+    @staticmethod
+    def create_image() -> pygame.Surface:
+        """Return an unrotated flash image in a random color."""
+        image = pygame.Surface((10, 10), pygame.SRCALPHA)
 
         base_red = random.randint(220, 255)
         base_green = random.randint(100, 180)
         base_blue = random.randint(0, 50)
-        pygame.draw.circle(
-            self.original_image, (base_red, base_green, base_blue, 230), (10, 10), 6
-        )
+        pygame.draw.circle(image, (base_red, base_green, base_blue, 230), (10, 10), 6)
 
         pygame.draw.circle(
-            self.original_image,
+            image,
             (base_red, base_green + 20, base_blue, 180),
             (20, 10),
             9,
         )
         pygame.draw.circle(
-            self.original_image,
+            image,
             (
                 min(base_red + 20, 255),
                 min(base_green + 40, 255),
@@ -35,13 +65,4 @@ class MuzzleFlash(pygame.sprite.Sprite):
             (30, 10),
             12,
         )
-
-        self.image = pygame.transform.rotate(self.original_image, math.degrees(-angle))
-        self.rect = self.image.get_rect(center=pos)
-        self.spawn_time = pygame.time.get_ticks()
-        self.lifetime = random.randint(1, 4)
-
-    def update(self) -> None:
-        """Checks if the muzzle flash's lifetime has expired and removes it if so."""
-        if pygame.time.get_ticks() - self.spawn_time > self.lifetime:
-            self.kill()
+        return image
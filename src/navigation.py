@@ -0,0 +1,558 @@
+"""Contains `NavGrid`, `HierarchicalPathfinder` and `HierarchicalFlowField` classes."""
+
+import heapq
+import math
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from itertools import pairwise
+from pathlib import Path
+from typing import ClassVar, Self
+
+import numpy as np
+import pygame
+
+from src.flow_field import Cell, FlowField
+
+
+class NavGrid:
+    """Cells of the play area which can't be walked through, e.g. walls and props.
+
+    Uses the same cells as `FlowField`. Diagonal moves are only allowed where both
+    cells beside the move are open, so paths don't cut the corners of obstacles.
+    """
+
+    BLOCKED_CHAR: ClassVar = '#'
+    """Marks a blocked cell in map files."""
+
+    def __init__(
+        self, blocked: np.ndarray, *, cell_size: int = FlowField.CELL_SIZE
+    ) -> None:
+        self.blocked = blocked
+        """Indexed [y, x]."""
+        self._blocked_rows: list[list[bool]] = blocked.tolist()
+        """`blocked` as lists, which are faster to index one cell at a time."""
+        self._any_blocked = bool(blocked.any())
+        self.cell_size = cell_size
+        self.grid_size: Cell = (blocked.shape[1], blocked.shape[0])
+        """Cells."""
+
+    @classmethod
+    def empty(cls, grid_size: Cell = FlowField.GRID_SIZE) -> Self:
+        """Return a grid with no obstacles."""
+        return cls(np.zeros((grid_size[1], grid_size[0]), dtype=bool))
+
+    @classmethod
+    def load(cls, path: Path, *, grid_size: Cell = FlowField.GRID_SIZE) -> Self:
+        """Return the grid for a text map file.
+
+        Each line is a row of cells and each `BLOCKED_CHAR` a blocked cell. Cells
+        beyond the end of a line, or of the file, are open.
+        """
+        lines = path.read_text().splitlines()
+        width, height = grid_size
+        if len(lines) > height or any(len(line) > width for line in lines):
+            msg = f'Map is larger than {width}x{height} cells: {path}'
+            raise ValueError(msg)
+        blocked = np.zeros((height, width), dtype=bool)
+        for y, line in enumerate(lines):
+            for x, char in enumerate(line):
+                blocked[y, x] = char == cls.BLOCKED_CHAR
+        return cls(blocked)
+
+    def is_open(self, cell: Cell) -> bool:
+        """Return whether `cell` lies within the grid and isn't blocked."""
+        x, y = cell
+        return (
+            0 <= x < self.grid_size[0]
+            and 0 <= y < self.grid_size[1]
+            and not self._blocked_rows[y][x]
+        )
+
+    def is_blocked_at(
+        self, pos: tuple[float, float], half_size: tuple[float, float] = (0, 0)
+    ) -> bool:
+        """Return whether a box centered on the pixel position `pos` is blocked.
+
+        The box extends `half_size` pixels each way from `pos` and is blocked if it
+        overlaps a blocked cell. Merely touching one doesn't count.
+        """
+        if not self._any_blocked:
+            return False
+        first_x, last_x = self._span(pos[0], half_size[0], self.grid_size[0])
+        first_y, last_y = self._span(pos[1], half_size[1], self.grid_size[1])
+        if first_x > last_x or first_y > last_y:
+            return False
+        return any(
+            any(row[first_x : last_x + 1])
+            for row in self._blocked_rows[first_y : last_y + 1]
+        )
+
+    def blocked_at(
+        self, positions: np.ndarray, half_sizes: np.ndarray | None = None
+    ) -> np.ndarray:
+        """Return whether boxes around each position in an (n, 2) array are blocked.
+
+        `half_sizes` holds each box's extent from its position, like `is_blocked_at`,
+        and defaults to testing just the positions.
+        """
+        if not self._any_blocked:
+            return np.zeros(len(positions), dtype=bool)
+        if half_sizes is None:
+            half_sizes = np.zeros_like(positions)
+        first = np.floor((positions - half_sizes) / self.cell_size).astype(np.intp)
+        last = np.maximum(
+            first,
+            np.ceil((positions + half_sizes) / self.cell_size).astype(np.intp) - 1,
+        )
+        spans = last - first
+        blocked = np.zeros(len(positions), dtype=bool)
+        if not len(positions):
+            return blocked
+        width, height = self.grid_size
+        # Boxes are at most a few cells across, so test every cell under each box
+        for dy in range(int(spans[:, 1].max()) + 1):
+            for dx in range(int(spans[:, 0].max()) + 1):
+                x = first[:, 0] + dx
+                y = first[:, 1] + dy
+                covered = (
+                    (dx <= spans[:, 0])
+                    & (dy <= spans[:, 1])
+                    & (x >= 0)
+                    & (y >= 0)
+                    & (x < width)
+                    & (y < height)
+                )
+                blocked |= (
+                    covered
+                    & self.blocked[np.clip(y, 0, height - 1), np.clip(x, 0, width - 1)]
+                )
+        return blocked
+
+    def slide(
+        self,
+        start: tuple[float, float],
+        end: tuple[float, float],
+        half_size: tuple[float, float] = (0, 0),
+    ) -> tuple[float, float]:
+        """Return where a move from `start` to `end` stops, sliding along obstacles.
+
+        The moving box extends `half_size` pixels each way from its position. A box
+        which already overlaps an obstacle, e.g. because it was placed there, moves
+        freely so it can't get stuck.
+        """
+        if not self.is_blocked_at(end, half_size):
+            return end
+        if self.is_blocked_at(start, half_size):
+            return end
+        if not self.is_blocked_at((end[0], start[1]), half_size):
+            return end[0], start[1]
+        if not self.is_blocked_at((start[0], end[1]), half_size):
+            return start[0], end[1]
+        return start
+
+    def slide_all(
+        self,
+        starts: np.ndarray,
+        ends: np.ndarray,
+        half_sizes: np.ndarray | None = None,
+    ) -> None:
+        """Move each blocked position in `ends` back along its move, like `slide`."""
+        if half_sizes is None:
+            half_sizes = np.zeros_like(ends)
+        blocked = self.blocked_at(ends, half_sizes) & ~self.blocked_at(
+            starts, half_sizes
+        )
+        if not blocked.any():
+            return
+        for axis in (1, 0):
+            retry = ends[blocked].copy()
+            retry[:, axis] = starts[blocked, axis]
+            slid = ~self.blocked_at(retry, half_sizes[blocked])
+            indices = np.flatnonzero(blocked)[slid]
+            ends[indices] = retry[slid]
+            blocked[indices] = False
+        ends[blocked] = starts[blocked]
+
+    def neighbors(self, cell: Cell) -> Iterator[tuple[Cell, float]]:
+        """Yield the open cells one move from `cell`, with the cost of each move."""
+        x, y = cell
+        for dx, dy in FlowField.NEIGHBOR_OFFSETS:
+            neighbor = (x + dx, y + dy)
+            if not self.is_open(neighbor):
+                continue
+            if dx == 0 or dy == 0:
+                yield neighbor, 1
+            elif self.is_open((x + dx, y)) and self.is_open((x, y + dy)):
+                yield neighbor, FlowField.DIAGONAL_COST
+
+    def nearest_open(self, cell: Cell) -> Cell | None:
+        """Return the open cell closest to `cell`, or None if every cell is blocked."""
+        open_cells = np.argwhere(~self.blocked)
+        if not len(open_cells):
+            return None
+        offsets = open_cells - (cell[1], cell[0])
+        y, x = open_cells[np.argmin(np.hypot(offsets[:, 0], offsets[:, 1]))]
+        return int(x), int(y)
+
+    def obstacle_rects(self) -> list[pygame.Rect]:
+        """Return pixel rects covering the blocked cells, one per run in each row."""
+        rects = []
+        size = self.cell_size
+        for y, row in enumerate(self.blocked):
+            x = 0
+            while x < len(row):
+                if row[x]:
+                    start = x
+                    while x < len(row) and row[x]:
+                        x += 1
+                    rects.append(
+                        pygame.Rect(start * size, y * size, (x - start) * size, size)
+                    )
+                else:
+                    x += 1
+        return rects
+
+    def _span(self, center: float, half_size: float, count: int) -> tuple[int, int]:
+        """Return the first and last cells along an axis under a box, within bounds."""
+        first = math.floor((center - half_size) / self.cell_size)
+        last = max(first, math.ceil((center + half_size) / self.cell_size) - 1)
+        return max(first, 0), min(last, count - 1)
+
+
+class HierarchicalPathfinder:
+    """Finds paths on a `NavGrid` through a graph of entrances between clusters.
+
+    The grid is split into square clusters. Pairs of open cells facing each other
+    across cluster borders become entrances, and the paths between the entrances of
+    each cluster are found once and cached. A query then only searches the clusters
+    holding its start and goal plus the small graph of entrances, and joins the
+    cached paths together. Paths are close to, but not always, the shortest.
+
+    Flow fields are built the same way: the entrance graph is searched outwards from
+    the goal, and every other cell heads for whichever entrance of its cluster leads
+    to the goal most cheaply, using the costs cached for each cluster.
+    """
+
+    CLUSTER_SIZE: ClassVar = 8
+    """Cells."""
+    MAX_ENTRANCE_WIDTH: ClassVar = 6
+    """Cells. Wider entrances are crossed at both ends, others in the middle."""
+    GOAL_RADIUS: ClassVar = 1
+    """Clusters around a flow field's goal which are searched cell by cell."""
+
+    def __init__(self, nav_grid: NavGrid, *, cluster_size: int = CLUSTER_SIZE) -> None:
+        self.nav_grid = nav_grid
+        self.cluster_size = cluster_size
+        self._cluster_nodes: dict[Cell, list[Cell]] = defaultdict(list)
+        """Entrance cells, by cluster."""
+        self._edges: dict[Cell, dict[Cell, float]] = defaultdict(dict)
+        """Costs between entrance cells, by cell."""
+        self._paths: dict[tuple[Cell, Cell], list[Cell]] = {}
+        """Paths between entrance cells of the same cluster, both ends included."""
+        self._moves = {
+            (x, y): [
+                (neighbor, step, self.cluster_of(neighbor))
+                for neighbor, step in nav_grid.neighbors((x, y))
+            ]
+            for x in range(nav_grid.grid_size[0])
+            for y in range(nav_grid.grid_size[1])
+            if nav_grid.is_open((x, y))
+        }
+        """Moves out of each open cell, with their costs and the clusters entered."""
+        self._add_entrances()
+        self._nodes = [node for nodes in self._cluster_nodes.values() for node in nodes]
+        self._node_indices = {node: i for i, node in enumerate(self._nodes)}
+        width, height = nav_grid.grid_size
+        depth = max(map(len, self._cluster_nodes.values()), default=1)
+        self._via_nodes = np.full((width * height, depth), -1, dtype=np.intp)
+        """Entrance cells of each cell's cluster, as indices into `_nodes`.
+
+        Indexed [y * width + x, i], like the other `_via_` arrays, and -1 past the
+        last entrance.
+        """
+        self._via_costs = np.full((width * height, depth), math.inf)
+        """Path costs from each cell to those entrances, without leaving the cluster."""
+        self._via_steps = np.full((width * height, depth), -1, dtype=np.intp)
+        """Next cells on those paths, as indices, or -1 at the entrance itself."""
+        for cluster, nodes in self._cluster_nodes.items():
+            for i, node in enumerate(nodes):
+                distances, previous = self._search(node, {cluster})
+                for other in nodes:
+                    if other != node and other in distances:
+                        self._edges[node][other] = distances[other]
+                        self._paths[node, other] = self._unwind(previous, other)
+                for cell, cost in distances.items():
+                    index = self._index(cell)
+                    self._via_nodes[index, i] = self._node_indices[node]
+                    self._via_costs[index, i] = cost
+                    if cell in previous:
+                        self._via_steps[index, i] = self._index(previous[cell])
+
+    @property
+    def node_count(self) -> int:
+        """Return the number of entrance cells in the abstract graph."""
+        return len(self._edges)
+
+    def cluster_of(self, cell: Cell) -> Cell:
+        """Return the cluster containing `cell`."""
+        return cell[0] // self.cluster_size, cell[1] // self.cluster_size
+
+    def flow_field(self, goal: Cell) -> FlowField:
+        """Return a flow field towards `goal` built from the entrance graph."""
+        return HierarchicalFlowField(self, goal=goal)
+
+    def steps_towards(self, goal: Cell) -> tuple[np.ndarray, np.ndarray]:
+        """Return each cell's path cost to the open cell `goal`, and its next cell.
+
+        Both arrays are indexed by `y * width + x`. Next cells are indices too, and
+        -1 at the goal and at cells which can't reach it.
+        """
+        # Search the clusters around the goal cell by cell, so cells close to the
+        # goal don't detour through an entrance
+        goal_x, goal_y = self.cluster_of(goal)
+        goal_distances, goal_previous = self._search(
+            goal,
+            {
+                (goal_x + dx, goal_y + dy)
+                for dx in range(-self.GOAL_RADIUS, self.GOAL_RADIUS + 1)
+                for dy in range(-self.GOAL_RADIUS, self.GOAL_RADIUS + 1)
+            },
+        )
+
+        # Then search the entrance graph outwards from the entrances reached
+        costs = {
+            node: cost
+            for node, cost in goal_distances.items()
+            if node in self._node_indices
+        }
+        previous: dict[Cell, Cell] = {}
+        frontier = [(cost, node) for node, cost in costs.items()]
+        heapq.heapify(frontier)
+        while frontier:
+            cost, node = heapq.heappop(frontier)
+            if cost > costs[node]:
+                continue
+            for neighbor, step in self._edges[node].items():
+                new_cost = cost + step
+                if new_cost < costs.get(neighbor, math.inf):
+                    costs[neighbor] = new_cost
+                    previous[neighbor] = node
+                    heapq.heappush(frontier, (new_cost, neighbor))
+
+        # Head for the entrance of each cell's cluster with the cheapest way onwards
+        node_costs = np.full(len(self._nodes) + 1, math.inf)
+        for node, cost in costs.items():
+            node_costs[self._node_indices[node]] = cost
+        totals = self._via_costs + node_costs[self._via_nodes]
+        cells = np.arange(len(totals))
+        best = np.argmin(totals, axis=1)
+        distances = totals[cells, best]
+        steps = self._via_steps[cells, best]
+
+        # Cells around the goal may head for it directly instead
+        near = self._indices(goal_previous)
+        near_costs = np.array([goal_distances[cell] for cell in goal_previous])
+        closer = near_costs < distances[near]
+        distances[near[closer]] = near_costs[closer]
+        steps[near[closer]] = self._indices(goal_previous.values())[closer]
+        distances[self._index(goal)] = 0
+        steps[self._index(goal)] = -1
+
+        # Entrances follow the graph, across their border or through their cluster
+        costs.pop(goal, None)
+        node_steps = []
+        for node in costs:
+            parent = previous.get(node)
+            if parent is None:
+                node_steps.append(goal_previous[node])
+            elif self.cluster_of(parent) != self.cluster_of(node):
+                node_steps.append(parent)
+            else:
+                node_steps.append(self._paths[node, parent][1])
+        nodes = self._indices(costs)
+        distances[nodes] = list(costs.values())
+        steps[nodes] = self._indices(node_steps)
+
+        steps[np.isinf(distances)] = -1
+        return distances, steps
+
+    def find_path(self, start: Cell, goal: Cell) -> list[Cell] | None:
+        """Return the path of cells from `start` to `goal`, both included.
+
+        Return None if the goal can't be reached.
+        """
+        if not (self.nav_grid.is_open(start) and self.nav_grid.is_open(goal)):
+            return None
+        start_cluster, goal_cluster = self.cluster_of(start), self.cluster_of(goal)
+        start_distances, start_previous = self._search(start, {start_cluster})
+        if goal in start_distances:
+            return self._unwind(start_previous, goal)
+
+        # Connect the start and goal to the entrances of their clusters
+        goal_distances, goal_previous = self._search(goal, {goal_cluster})
+        start_edges = {
+            node: start_distances[node]
+            for node in self._cluster_nodes.get(start_cluster, ())
+            if node in start_distances
+        }
+        goal_edges = {
+            node: goal_distances[node]
+            for node in self._cluster_nodes.get(goal_cluster, ())
+            if node in goal_distances
+        }
+
+        route = self._search_graph(start, goal, start_edges, goal_edges)
+        if route is None:
+            return None
+
+        # Refine the route through the graph into cells
+        path = [start]
+        for node, next_node in pairwise(route):
+            if self.cluster_of(node) != self.cluster_of(next_node):
+                path.append(next_node)
+            elif node == start:
+                path.extend(self._unwind(start_previous, next_node)[1:])
+            elif next_node == goal:
+                path.extend(reversed(self._unwind(goal_previous, node)[:-1]))
+            else:
+                path.extend(self._paths[node, next_node][1:])
+        return path
+
+    def _add_entrances(self) -> None:
+        """Find the entrances across every vertical and horizontal cluster border."""
+        width, height = self.nav_grid.grid_size
+        for x in range(self.cluster_size, width, self.cluster_size):
+            self._add_border([((x - 1, y), (x, y)) for y in range(height)])
+        for y in range(self.cluster_size, height, self.cluster_size):
+            self._add_border([((x, y - 1), (x, y)) for x in range(width)])
+
+    def _add_border(self, facing: list[tuple[Cell, Cell]]) -> None:
+        """Add entrances along a border, given the pairs of cells facing across it."""
+        entrance: list[tuple[Cell, Cell]] = []
+        for i, (cell, other) in enumerate(facing):
+            crossable = self.nav_grid.is_open(cell) and self.nav_grid.is_open(other)
+            if i % self.cluster_size == 0 or not crossable:
+                self._add_entrance(entrance)
+                entrance = []
+            if crossable:
+                entrance.append((cell, other))
+        self._add_entrance(entrance)
+
+    def _add_entrance(self, entrance: list[tuple[Cell, Cell]]) -> None:
+        if not entrance:
+            return
+        if len(entrance) > self.MAX_ENTRANCE_WIDTH:
+            crossings = [entrance[0], entrance[-1]]
+        else:
+            crossings = [entrance[len(entrance) // 2]]
+        for cell, other in crossings:
+            for node in (cell, other):
+                nodes = self._cluster_nodes[self.cluster_of(node)]
+                if node not in nodes:
+                    nodes.append(node)
+            self._edges[cell][other] = 1
+            self._edges[other][cell] = 1
+
+    def _search(
+        self, source: Cell, clusters: set[Cell]
+    ) -> tuple[dict[Cell, float], dict[Cell, Cell]]:
+        """Search outwards from `source` without leaving `clusters`.
+
+        Return the path cost to each cell reached, and each cell's previous cell.
+        """
+        distances = {source: 0.0}
+        previous: dict[Cell, Cell] = {}
+        frontier = [(0.0, source)]
+        while frontier:
+            cost, cell = heapq.heappop(frontier)
+            if cost > distances[cell]:
+                continue
+            for neighbor, step, cluster in self._moves[cell]:
+                new_cost = cost + step
+                if new_cost < distances.get(neighbor, math.inf) and cluster in clusters:
+                    distances[neighbor] = new_cost
+                    previous[neighbor] = cell
+                    heapq.heappush(frontier, (new_cost, neighbor))
+        return distances, previous
+
+    def _search_graph(
+        self,
+        start: Cell,
+        goal: Cell,
+        start_edges: dict[Cell, float],
+        goal_edges: dict[Cell, float],
+    ) -> list[Cell] | None:
+        """Return the cheapest route from `start` to `goal` through entrance cells."""
+        costs = {start: 0.0}
+        previous: dict[Cell, Cell] = {}
+        frontier = [(self._estimate(start, goal), 0.0, start)]
+        while frontier:
+            _, cost, node = heapq.heappop(frontier)
+            if node == goal:
+                return self._unwind(previous, goal)
+            if cost > costs[node]:
+                continue
+            edges = list(self._edges.get(node, {}).items())
+            if node == start:
+                edges.extend(start_edges.items())
+            if node in goal_edges:
+                edges.append((goal, goal_edges[node]))
+            for neighbor, step in edges:
+                new_cost = cost + step
+                if new_cost < costs.get(neighbor, math.inf):
+                    costs[neighbor] = new_cost
+                    previous[neighbor] = node
+                    heapq.heappush(
+                        frontier,
+                        (new_cost + self._estimate(neighbor, goal), new_cost, neighbor),
+                    )
+        return None
+
+    def _index(self, cell: Cell) -> int:
+        return cell[1] * self.nav_grid.grid_size[0] + cell[0]
+
+    def _indices(self, cells: Iterable[Cell]) -> np.ndarray:
+        # The extra cell keeps the array two-dimensional when `cells` is empty
+        xs, ys = np.array([*cells, (0, 0)], dtype=np.intp).T
+        return (ys * self.nav_grid.grid_size[0] + xs)[:-1]
+
+    @staticmethod
+    def _estimate(cell: Cell, goal: Cell) -> float:
+        """Return the cost of the shortest possible path, ignoring obstacles."""
+        dx, dy = abs(cell[0] - goal[0]), abs(cell[1] - goal[1])
+        return max(dx, dy) + (FlowField.DIAGONAL_COST - 1) * min(dx, dy)
+
+    @staticmethod
+    def _unwind(previous: dict[Cell, Cell], cell: Cell) -> list[Cell]:
+        """Return the path ending at `cell`, following `previous` back to its start."""
+        path = [cell]
+        while path[-1] in previous:
+            path.append(previous[path[-1]])
+        path.reverse()
+        return path
+
+
+class HierarchicalFlowField(FlowField):
+    """Flow field computed by a `HierarchicalPathfinder` instead of a full search.
+
+    Goals in blocked cells fall back to searching the whole grid.
+    """
+
+    def __init__(self, pathfinder: HierarchicalPathfinder, *, goal: Cell) -> None:
+        self.pathfinder = pathfinder
+        nav_grid = pathfinder.nav_grid
+        super().__init__(
+            goal=goal, grid_size=nav_grid.grid_size, blocked=nav_grid.blocked
+        )
+
+    def _compute(self) -> None:
+        if not self.pathfinder.nav_grid.is_open(self.goal):
+            super()._compute()
+            return
+        distances, steps = self.pathfinder.steps_towards(self.goal)
+        width = self.grid_size[0]
+        next_cells = np.stack((steps % width, steps // width), axis=1)
+        next_cells[steps < 0] = -1
+        self.distances = distances.tolist()
+        self._next_cells = [None if x < 0 else (x, y) for x, y in next_cells.tolist()]
+        self._next_cells_array = next_cells
@@ -0,0 +1,78 @@
+"""Contains `Pool` class and `PooledSprite` base class."""
+
+from abc import ABC, abstractmethod
+from typing import ClassVar, Generic, Self, TypeVar
+
+import pygame
+
+T = TypeVar('T')
+
+
+class Pool(Generic[T]):
+    """Free list of objects which can be reused instead of allocated afresh."""
+
+    MAX_SIZE: ClassVar = 1024
+    """Maximum number of free objects kept."""
+
+    def __init__(self, *, max_size: int = MAX_SIZE) -> None:
+        self.max_size = max_size
+        self._free: list[T] = []
+
+    def __len__(self) -> int:
+        return len(self._free)
+
+    def acquire(self) -> T | None:
+        """Return a free object, or None if there are none."""
+        if self._free:
+            return self._free.pop()
+        return None
+
+    def release(self, item: T) -> None:
+        """Return `item` to the pool, unless it is full."""
+        if len(self._free) < self.max_size:
+            self._free.append(item)
+
+    def clear(self) -> None:
+        """Discard all free objects."""
+        self._free.clear()
+
+
+class PooledSprite(ABC, pygame.sprite.Sprite):
+    """Sprite which is returned to its class's pool when killed.
+
+    Subclasses put their initialisation in `reset()`, which `__init__()` calls, and
+    are created with `spawn()`, which reuses a killed instance if there is one.
+    """
+
+    pool: ClassVar[Pool]
+
+    def __init_subclass__(cls, **kwargs: object) -> None:
+        super().__init_subclass__(**kwargs)
+        cls.pool = Pool()
+
+    def __init__(self, *args: object, **kwargs: object) -> None:
+        super().__init__()
+        self.reset(*args, **kwargs)
+
+    @classmethod
+    def spawn(cls, *args: object, **kwargs: object) -> Self:
+        """Return an instance initialised with the given arguments."""
+        sprite = cls.pool.acquire()
+        if sprite is None:
+            return cls(*args, **kwargs)
+        sprite.reset(*args, **kwargs)
+        return sprite
+
+    @abstractmethod
+    def reset(self, *args: object, **kwargs: object) -> None:
+        """Initialise the sprite's state."""
+
+    def kill(self) -> None:
+        """Remove the sprite from all groups and return it to the pool.
+
+        Killing a sprite which is in no groups does nothing, so it can't be returned
+        to the pool twice.
+        """
+        if self.alive():
+            super().kill()
+            self.pool.release(self)
@@ -0,0 +1,187 @@
+"""Contains `Profiler` and `ProfilerOverlay` classes."""
+
+import json
+import math
+import time
+from collections import defaultdict, deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import ClassVar
+
+import pygame
+
+from src.constants import COLORS, GAME_WINDOW
+
+
+class Profiler:
+    """Times named phases of each frame.
+
+    Keeps cumulative totals, a rolling window of recent frames for percentiles and a
+    buffer of trace events that can be exported in Chrome trace format.
+    """
+
+    WINDOW: ClassVar = 300
+    """Frames kept for rolling statistics."""
+    TRACE_CAPACITY: ClassVar = 20_000
+    """Trace events kept for export."""
+    FRAME: ClassVar = 'frame'
+    """Name under which the busy time of each frame is recorded."""
+    IDLE: ClassVar = 'idle'
+    """Phase spent waiting, e.g. for the frame limiter, excluded from busy time."""
+
+    def __init__(
+        self,
+        *,
+        window: int = WINDOW,
+        trace_capacity: int | None = TRACE_CAPACITY,
+    ) -> None:
+        self.totals: defaultdict[str, float] = defaultdict(float)
+        """Seconds per phase since the last reset."""
+        self.frames = 0
+        self.history: deque[dict[str, float]] = deque(maxlen=window)
+        """Seconds per phase for recent frames."""
+        self.trace: deque[tuple[str, float, float]] = deque(maxlen=trace_capacity)
+        """Name, start and duration in seconds for recent scopes and frames."""
+        self._origin = time.perf_counter()
+        self._frame_start = self._origin
+        self._frame: defaultdict[str, float] = defaultdict(float)
+
+    @contextmanager
+    def scope(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as part of phase `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            self.totals[name] += duration
+            self._frame[name] += duration
+            self.trace.append((name, start, duration))
+
+    def end_frame(self) -> None:
+        """Mark the end of a frame."""
+        now = time.perf_counter()
+        self._frame[self.FRAME] = sum(
+            duration for name, duration in self._frame.items() if name != self.IDLE
+        )
+        self.history.append(dict(self._frame))
+        self.trace.append((self.FRAME, self._frame_start, now - self._frame_start))
+        self._frame.clear()
+        self._frame_start = now
+        self.frames += 1
+
+    def reset(self) -> None:
+        """Discard totals and recent frames, keeping buffered trace events."""
+        self.totals.clear()
+        self.frames = 0
+        self.history.clear()
+        self._frame.clear()
+        self._frame_start = time.perf_counter()
+
+    def mean_ms(self) -> dict[str, float]:
+        """Return the mean milliseconds per frame spent in each phase."""
+        frames = max(self.frames, 1)
+        return {name: total * 1000 / frames for name, total in self.totals.items()}
+
+    def recent_mean_ms(self, name: str) -> float:
+        """Return the mean milliseconds spent in phase `name` over recent frames."""
+        if not self.history:
+            return 0
+        return (
+            sum(frame.get(name, 0) for frame in self.history) * 1000 / len(self.history)
+        )
+
+    def percentile_ms(self, name: str, percentile: float) -> float:
+        """Return the nearest-rank `percentile` of recent times for phase `name`."""
+        values = sorted(frame.get(name, 0) for frame in self.history)
+        if not values:
+            return 0
+        rank = max(math.ceil(percentile / 100 * len(values)), 1)
+        return values[rank - 1] * 1000
+
+    def phases(self) -> list[str]:
+        """Return the names of phases seen in recent frames, in first-seen order."""
+        return list(dict.fromkeys(name for frame in self.history for name in frame))
+
+    def export_trace(self, path: Path) -> None:
+        """Write buffered trace events to `path` in Chrome trace event format."""
+        events = [
+            {
+                'name': name,
+                'ph': 'X',
+                'ts': (start - self._origin) * 1e6,
+                'dur': duration * 1e6,
+                'pid': 0,
+                'tid': 0,
+            }
+            for name, start, duration in self.trace
+        ]
+        path.write_text(json.dumps({'traceEvents': events, 'displayTimeUnit': 'ms'}))
+
+
+class ProfilerOverlay:
+    """On-screen table of rolling phase timings from a `Profiler`."""
+
+    REFRESH_FRAMES: ClassVar = 30
+    """Frames between rebuilds of the table."""
+    BUDGET_MS: ClassVar = 1000 / GAME_WINDOW['FPS']
+    PERCENTILES: ClassVar = (50, 95, 99)
+    LINE_SPACING: ClassVar = 4
+    """Pixels."""
+
+    def __init__(self, profiler: Profiler, font: pygame.font.Font) -> None:
+        self.profiler = profiler
+        self.font = font
+        self.visible = False
+        self._image: pygame.Surface | None = None
+        self._age = 0
+
+    def toggle(self) -> None:
+        """Show or hide the overlay."""
+        self.visible = not self.visible
+        self._image = None
+
+    def draw(
+        self, *, surface: pygame.Surface, pos: tuple[int, int]
+    ) -> pygame.Rect | None:
+        """Blit the overlay to `surface` at `pos`, if visible; return the area drawn."""
+        if not self.visible:
+            return None
+        if self._image is None or self._age >= self.REFRESH_FRAMES:
+            self._image = self._build_image()
+            self._age = 0
+        self._age += 1
+        return surface.blit(self._image, pos)
+
+    def _build_image(self) -> pygame.Surface:
+        header = f'{"phase":<12}{"mean":>7}' + ''.join(
+            f'{f"p{percentile}":>7}' for percentile in self.PERCENTILES
+        )
+        lines = [(header, COLORS['WHITE'])]
+        for name in self.profiler.phases():
+            mean = self.profiler.recent_mean_ms(name)
+            values = [self.profiler.percentile_ms(name, p) for p in self.PERCENTILES]
+            over_budget = name == Profiler.FRAME and values[1] > self.BUDGET_MS
+            lines.append(
+                (
+                    f'{name:<12}{mean:>7.2f}'
+                    + ''.join(f'{value:>7.2f}' for value in values),
+                    COLORS['RED'] if over_budget else COLORS['GAMMA'],
+                )
+            )
+
+        line_height = self.font.get_height() + self.LINE_SPACING
+        # The timings change on every rebuild, so aren't worth caching
+        surfaces = [self.font.render(text, True, color) for text, color in lines]
+        image = pygame.Surface(
+            (
+                max(text.get_width() for text in surfaces) + 2 * self.LINE_SPACING,
+                len(surfaces) * line_height + self.LINE_SPACING,
+            ),
+            pygame.SRCALPHA,
+        )
+        image.fill((0, 0, 0, 180))
+        for i, text in enumerate(surfaces):
+            image.blit(text, (self.LINE_SPACING, self.LINE_SPACING + i * line_height))
+        return image
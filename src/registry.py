@@ -0,0 +1,77 @@
+"""Contains `ContentRegistry` class and the `ZombieClass` content type."""
+
+import json
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Self
+
+from src.weapons import Weapon, WeaponCategory
+
+
+@dataclass(frozen=True)
+class ZombieClass:
+    """Stats and image of a kind of zombie."""
+
+    id: str
+    health: int
+    speed: float
+    score: int
+    """Score for a kill."""
+    xp: int
+    """XP for a kill, on top of the score."""
+    image: str
+    """Path relative to the game directory."""
+
+
+class ContentRegistry:
+    """Zombie classes, weapons and sounds, loaded once from a data file.
+
+    IDs are interned and each entry is built at load time, so lookups during play
+    are a single dict access. Sounds named by weapons are checked at load time too.
+    """
+
+    def __init__(self, data: dict) -> None:
+        self.sound_groups: dict[str, list[str]] = {
+            group: [sys.intern(name) for name in names]
+            for group, names in data['sounds'].items()
+        }
+        """Sound names, by channel group."""
+        self.zombie_classes: dict[str, ZombieClass] = {}
+        for entry in data['zombie_classes']:
+            zombie_class = ZombieClass(**{**entry, 'id': sys.intern(entry['id'])})
+            self.zombie_classes[zombie_class.id] = zombie_class
+        self.default_zombie_class = next(iter(self.zombie_classes.values()))
+        """Used for unknown IDs."""
+        self._weapon_categories: list[tuple[str, list[dict]]] = [
+            (entry['name'], entry['weapons']) for entry in data['weapon_categories']
+        ]
+
+        sounds = {name for names in self.sound_groups.values() for name in names}
+        for _, weapons in self._weapon_categories:
+            for weapon in weapons:
+                for sound in weapon.get('sounds', ()):
+                    if sound not in sounds:
+                        msg = f'Unknown sound for {weapon["name"]}: {sound}'
+                        raise KeyError(msg)
+
+    @classmethod
+    def load(cls, path: Path) -> Self:
+        """Return the registry for the JSON data file at `path`."""
+        return cls(json.loads(path.read_text()))
+
+    def zombie_class(self, class_id: str) -> ZombieClass:
+        """Return the zombie class `class_id`, or the default class if unknown."""
+        return self.zombie_classes.get(class_id, self.default_zombie_class)
+
+    def weapon_categories(self) -> list[WeaponCategory]:
+        """Return new weapon categories, with their weapons in their initial state."""
+        return [
+            WeaponCategory(name, [self._weapon(entry) for entry in weapons])
+            for name, weapons in self._weapon_categories
+        ]
+
+    @staticmethod
+    def _weapon(entry: dict) -> Weapon:
+        sounds = tuple(sys.intern(sound) for sound in entry.get('sounds', ()))
+        return Weapon(**{**entry, 'name': sys.intern(entry['name']), 'sounds': sounds})
@@ -0,0 +1,123 @@
+"""Contains `FullRenderer` and `DirtyRenderer` classes."""
+
+from collections.abc import Hashable, Iterable, Sequence
+from typing import ClassVar
+
+import pygame
+
+Dest = pygame.Rect | tuple[int, int]
+BlitSequence = Sequence[tuple[pygame.Surface, Dest]]
+
+
+class FullRenderer:
+    """Redraws and presents the whole screen every frame."""
+
+    def __init__(self, surface: pygame.Surface) -> None:
+        self.surface = surface
+        self.stale_rects: list[pygame.Rect] = []
+        """Always empty, as every frame is drawn in full."""
+
+    def begin_frame(self, view: Hashable) -> bool:
+        """Start a frame; return True, as it must be drawn in full."""
+        return True
+
+    def invalidate(self) -> None:
+        """Do nothing, as every frame is drawn in full."""
+
+    def blit(self, image: pygame.Surface, dest: Dest) -> None:
+        """Blit `image` to the screen at `dest`."""
+        self.surface.blit(image, dest)
+
+    def blits(self, blit_sequence: BlitSequence) -> None:
+        """Blit (image, dest) pairs to the screen in one call."""
+        self.surface.blits(blit_sequence, doreturn=False)
+
+    def mark(self, rect: pygame.Rect | None) -> None:
+        """Do nothing, as every frame is presented in full."""
+
+    def mark_all(self, rects: Iterable[pygame.Rect]) -> None:
+        """Do nothing, as every frame is presented in full."""
+
+    def restore(self, backdrop: pygame.Surface) -> None:
+        """Do nothing, as nothing is restored between frames."""
+
+    def present(self) -> None:
+        """Show the frame."""
+        pygame.display.flip()
+
+
+class DirtyRenderer:
+    """Presents only the regions of the screen that changed since the last frame.
+
+    Everything drawn over a frame's backdrop is tracked, through `blit` and `mark`.
+    While the view is unchanged, only last frame's regions need restoring before
+    drawing and only they and this frame's regions are sent to the display. When the
+    view changes, e.g. because the camera scrolled, the frame is drawn in full.
+    """
+
+    MAX_RECTS: ClassVar = 512
+    """Regions per frame beyond which the whole display is updated."""
+
+    def __init__(self, surface: pygame.Surface) -> None:
+        self.surface = surface
+        self.stale_rects: list[pygame.Rect] = []
+        """Regions drawn in the previous frame, to restore before drawing."""
+        self._bounds = surface.get_rect()
+        self._view: Hashable = None
+        self._full = True
+        self._invalidated = True
+        self._drawn: list[pygame.Rect] = []
+
+    def begin_frame(self, view: Hashable) -> bool:
+        """Start a frame of `view`; return True if it must be drawn in full.
+
+        `view` identifies what the tracked drawing is done over, e.g. the game state
+        and camera offset.
+        """
+        self._full = self._invalidated or view != self._view
+        self._invalidated = False
+        self._view = view
+        self.stale_rects = [] if self._full else self._drawn
+        self._drawn = []
+        return self._full
+
+    def invalidate(self) -> None:
+        """Draw the next frame in full."""
+        self._invalidated = True
+
+    def blit(self, image: pygame.Surface, dest: Dest) -> None:
+        """Blit `image` to the screen at `dest`, unless it is off screen."""
+        rect = image.get_rect(topleft=dest[:2])
+        if self._bounds.colliderect(rect):
+            self._drawn.append(self.surface.blit(image, rect))
+
+    def blits(self, blit_sequence: BlitSequence) -> None:
+        """Blit (image, dest) pairs to the screen in one call.
+
+        Unlike `blit`, off screen images aren't skipped, so callers should cull them.
+        """
+        self._drawn.extend(self.surface.blits(blit_sequence))
+
+    def mark(self, rect: pygame.Rect | None) -> None:
+        """Track a region drawn directly to the screen."""
+        if rect is not None:
+            self._drawn.append(rect)
+
+    def mark_all(self, rects: Iterable[pygame.Rect]) -> None:
+        """Track regions drawn directly to the screen."""
+        self._drawn.extend(rects)
+
+    def restore(self, backdrop: pygame.Surface) -> None:
+        """Restore stale regions from `backdrop`, a screen sized surface."""
+        self.surface.blits(
+            [(backdrop, rect, rect) for rect in self.stale_rects],
+            doreturn=False,
+        )
+
+    def present(self) -> None:
+        """Show the frame, updating only changed regions where possible."""
+        rects = self.stale_rects + self._drawn
+        if self._full or len(rects) > self.MAX_RECTS:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
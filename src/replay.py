@@ -0,0 +1,137 @@
+"""Contains `InputRecorder` and `InputReplay` classes and related types."""
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import ClassVar, Self
+
+import pygame
+
+EVENT_FIELDS = {
+    pygame.QUIT: None,
+    pygame.MOUSEBUTTONDOWN: 'button',
+    pygame.MOUSEWHEEL: 'y',
+    pygame.KEYDOWN: 'key',
+}
+"""Event types the game handles, and the attribute it reads from each."""
+
+
+class HeldKeys:
+    """Held state of the keys the game polls, indexed like `pygame.key.get_pressed`."""
+
+    KEYS: ClassVar = (pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d)
+
+    def __init__(self, pressed: frozenset[int] = frozenset()) -> None:
+        self.pressed = pressed
+
+    def __getitem__(self, key: int) -> bool:
+        return key in self.pressed
+
+    @classmethod
+    def capture(cls) -> Self:
+        """Return the keys currently held."""
+        state = pygame.key.get_pressed()
+        return cls(frozenset(key for key in cls.KEYS if state[key]))
+
+
+@dataclass
+class FrameInput:
+    """Everything the game reads from the player and the clock in one frame."""
+
+    frame_ms: float
+    """Milliseconds since the previous frame."""
+    mouse_pos: tuple[int, int]
+    mouse_buttons: tuple[bool, bool, bool]
+    held_keys: HeldKeys = field(default_factory=HeldKeys)
+    events: list[pygame.event.Event] = field(default_factory=list)
+
+    @classmethod
+    def capture(cls, frame_ms: float) -> Self:
+        """Return the live input for a frame, consuming the game's pending events."""
+        return cls(
+            frame_ms,
+            pygame.mouse.get_pos(),
+            pygame.mouse.get_pressed(),
+            HeldKeys.capture(),
+            [event for event in pygame.event.get() if event.type in EVENT_FIELDS],
+        )
+
+    def encode(self) -> list:
+        """Return the frame as a compact JSON compatible list."""
+        buttons = sum(1 << i for i, pressed in enumerate(self.mouse_buttons) if pressed)
+        keys = sum(
+            1 << i
+            for i, key in enumerate(HeldKeys.KEYS)
+            if key in self.held_keys.pressed
+        )
+        events = []
+        for event in self.events:
+            attribute = EVENT_FIELDS[event.type]
+            if attribute is None:
+                events.append([event.type])
+            else:
+                events.append([event.type, getattr(event, attribute)])
+        return [self.frame_ms, *self.mouse_pos, buttons, keys, events]
+
+    @classmethod
+    def decode(cls, encoded: list) -> Self:
+        """Return the frame encoded by `encode()`."""
+        frame_ms, x, y, buttons, keys, encoded_events = encoded
+        events = []
+        for event_type, *values in encoded_events:
+            attribute = EVENT_FIELDS[event_type]
+            attributes = {} if attribute is None else {attribute: values[0]}
+            events.append(pygame.event.Event(event_type, attributes))
+        return cls(
+            frame_ms,
+            (x, y),
+            tuple(bool(buttons & 1 << i) for i in range(3)),
+            HeldKeys(
+                frozenset(key for i, key in enumerate(HeldKeys.KEYS) if keys & 1 << i)
+            ),
+            events,
+        )
+
+
+class InputRecorder:
+    """Writes each frame's input to a file, for `InputReplay` to play back.
+
+    The file starts with a header line holding the random seed and the settings
+    that affect the simulation, followed by one JSON line per frame.
+    """
+
+    def __init__(self, path: Path, *, seed: int, settings: dict[str, object]) -> None:
+        self.path = path
+        self._file = path.open('w')
+        header = {'seed': seed, 'settings': settings}
+        # Paths, e.g. of a map, are written as strings
+        self._file.write(json.dumps(header, default=str) + '\n')
+
+    def record(self, frame: FrameInput) -> None:
+        """Append a frame to the file."""
+        self._file.write(json.dumps(frame.encode(), separators=(',', ':')) + '\n')
+
+    def close(self) -> None:
+        """Finish writing the file."""
+        self._file.close()
+
+
+class InputReplay:
+    """Plays back the frames written by `InputRecorder`."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with path.open() as file:
+            header = json.loads(file.readline())
+            self.frames = [FrameInput.decode(json.loads(line)) for line in file]
+        self.seed: int = header['seed']
+        self.settings: dict[str, object] = header['settings']
+        """Settings the session was recorded with."""
+        self.frame = 0
+
+    def next_frame(self) -> FrameInput | None:
+        """Return the next frame's input, or None once all have been played."""
+        if self.frame == len(self.frames):
+            return None
+        self.frame += 1
+        return self.frames[self.frame - 1]
@@ -0,0 +1,88 @@
+"""Contains `RotationAtlas` class."""
+
+import math
+from typing import ClassVar, Self
+
+import pygame
+
+
+class RotationAtlas:
+    """Precomputed rotations of an image and their masks.
+
+    Angles are quantized to a fixed number of steps, so sprites can look up a frame
+    instead of rotating their image every frame. Tinted variants of each frame, for
+    hit flashes and fading out, are made on first use and kept alongside. Frames are
+    shared between sprites and must not be modified in place.
+    """
+
+    STEPS: ClassVar = 64
+    """Number of angles in a full turn."""
+    FLASH_COLOR: ClassVar = (255, 255, 255)
+    """Added to frames to flash them."""
+    FADE_LEVELS: ClassVar = 16
+    """Number of distinct alpha values frames fade through."""
+
+    def __init__(self, image: pygame.Surface, *, steps: int = STEPS) -> None:
+        self.image = image
+        self.steps = steps
+        self.frames = [
+            pygame.transform.rotate(image, index * 360 / steps)
+            for index in range(steps)
+        ]
+        self.masks = [pygame.mask.from_surface(frame) for frame in self.frames]
+        self._flash_frames: dict[int, pygame.Surface] = {}
+        self._faded_frames: dict[tuple[int, int], pygame.Surface] = {}
+
+    @classmethod
+    def from_frames(cls, frames: list[pygame.Surface]) -> Self:
+        """Return an atlas of frames rotated in advance, starting from angle 0."""
+        atlas = cls.__new__(cls)
+        atlas.image = frames[0]
+        atlas.steps = len(frames)
+        atlas.frames = frames
+        atlas.masks = [pygame.mask.from_surface(frame) for frame in frames]
+        atlas._flash_frames = {}
+        atlas._faded_frames = {}
+        return atlas
+
+    @property
+    def radius(self) -> float:
+        """Return the radius of a circle around every frame's content, pixels."""
+        return math.hypot(*self.image.get_size()) / 2
+
+    def index(self, angle: float) -> int:
+        """Return the frame index nearest to `angle`.
+
+        `angle` is in degrees, counterclockwise, as for `pygame.transform.rotate()`.
+        """
+        return round(angle * self.steps / 360) % self.steps
+
+    def frame(self, angle: float) -> pygame.Surface:
+        """Return the image rotated by `angle` degrees."""
+        return self.frames[self.index(angle)]
+
+    def mask(self, angle: float) -> pygame.mask.Mask:
+        """Return the mask of the image rotated by `angle` degrees."""
+        return self.masks[self.index(angle)]
+
+    def flash_frame(self, index: int) -> pygame.Surface:
+        """Return frame `index`, brightened by `FLASH_COLOR`."""
+        frame = self._flash_frames.get(index)
+        if frame is None:
+            frame = self.frames[index].copy()
+            frame.fill(self.FLASH_COLOR, special_flags=pygame.BLEND_RGB_ADD)
+            self._flash_frames[index] = frame
+        return frame
+
+    def faded_frame(self, index: int, alpha: float) -> pygame.Surface:
+        """Return frame `index`, made transparent to the nearest fade level to `alpha`.
+
+        `alpha` is from 0, transparent, to 255, opaque.
+        """
+        level = round(alpha * (self.FADE_LEVELS - 1) / 255)
+        frame = self._faded_frames.get((index, level))
+        if frame is None:
+            frame = self.frames[index].copy()
+            frame.set_alpha(level * 255 // (self.FADE_LEVELS - 1))
+            self._faded_frames[index, level] = frame
+        return frame
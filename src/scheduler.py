@@ -0,0 +1,114 @@
+"""Contains `Scheduler` class and the shared `scheduler` instance."""
+
+import heapq
+import itertools
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from src import game_clock
+
+
+@dataclass(eq=False)
+class Timer:
+    """A callback due at a game time, optionally repeating."""
+
+    time: float
+    """Game time in milliseconds at which the callback is due."""
+    callback: Callable[..., object] | None
+    """None once cancelled."""
+    args: tuple[object, ...]
+    interval: float | None
+    """Milliseconds between repeats, or None to run once."""
+
+    @property
+    def active(self) -> bool:
+        """Return True if the timer hasn't been cancelled or run to completion."""
+        return self.callback is not None
+
+
+class Scheduler:
+    """Runs callbacks when game time reaches their due time.
+
+    Timers are kept in a heap ordered by due time, so each tick only looks at the
+    timers that are due, however many long-lived timers are waiting. Cancelled timers
+    are dropped lazily.
+    """
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[float, int, Timer]] = []
+        self._counter = itertools.count()
+        self._cancelled = 0
+
+    def __len__(self) -> int:
+        return len(self._heap) - self._cancelled
+
+    def call_at(
+        self, time: float, callback: Callable[..., object], *args: object
+    ) -> Timer:
+        """Run `callback(*args)` once game time reaches `time` milliseconds."""
+        timer = Timer(time, callback, args, None)
+        self._push(timer)
+        return timer
+
+    def call_later(
+        self, delay: float, callback: Callable[..., object], *args: object
+    ) -> Timer:
+        """Run `callback(*args)` once, `delay` milliseconds of game time from now."""
+        return self.call_at(game_clock.get_ticks() + delay, callback, *args)
+
+    def call_every(
+        self, interval: float, callback: Callable[..., object], *args: object
+    ) -> Timer:
+        """Run `callback(*args)` every `interval` milliseconds of game time."""
+        timer = Timer(game_clock.get_ticks() + interval, callback, args, interval)
+        self._push(timer)
+        return timer
+
+    def cancel(self, timer: Timer | None) -> None:
+        """Stop `timer` from running, if it is still active."""
+        if timer is None or not timer.active:
+            return
+        timer.callback = None
+        timer.args = ()
+        self._cancelled += 1
+        if self._cancelled > len(self._heap) // 2:
+            self._heap = [entry for entry in self._heap if entry[2].active]
+            heapq.heapify(self._heap)
+            self._cancelled = 0
+
+    def clear(self) -> None:
+        """Cancel all timers."""
+        for _, _, timer in self._heap:
+            timer.callback = None
+        self._heap.clear()
+        self._cancelled = 0
+
+    def run_due(self, now: float) -> int:
+        """Run the timers due by game time `now`; return how many ran.
+
+        Repeating timers that fell behind, e.g. while the game was paused, run once
+        and are then rescheduled from `now`.
+        """
+        ran = 0
+        while self._heap and self._heap[0][0] <= now:
+            _, _, timer = heapq.heappop(self._heap)
+            if not timer.active:
+                self._cancelled -= 1
+                continue
+            callback, args = timer.callback, timer.args
+            if timer.interval is None:
+                timer.callback = None
+            else:
+                timer.time += timer.interval
+                if timer.time <= now:
+                    timer.time = now + timer.interval
+                self._push(timer)
+            callback(*args)
+            ran += 1
+        return ran
+
+    def _push(self, timer: Timer) -> None:
+        heapq.heappush(self._heap, (timer.time, next(self._counter), timer))
+
+
+scheduler = Scheduler()
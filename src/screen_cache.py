@@ -0,0 +1,43 @@
+"""Contains `ScreenCache` class."""
+
+from collections.abc import Callable, Hashable
+
+import pygame
+
+
+class ScreenCache:
+    """Snapshots of whole screens that don't change between frames.
+
+    Screens such as menus and the upgrade panel are drawn once and copied, then the
+    copy is blitted every frame until it is invalidated, e.g. because its content
+    changed, or the screen is resized.
+    """
+
+    def __init__(self, screen: pygame.Surface) -> None:
+        self.screen = screen
+        self._snapshots: dict[Hashable, pygame.Surface] = {}
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._snapshots
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    def get(self, key: Hashable, draw: Callable[[], None]) -> pygame.Surface:
+        """Return the snapshot for `key`, calling `draw` to draw the screen if needed.
+
+        The snapshot is taken of the whole screen after `draw` returns.
+        """
+        snapshot = self._snapshots.get(key)
+        if snapshot is None or snapshot.get_size() != self.screen.get_size():
+            draw()
+            snapshot = self.screen.copy()
+            self._snapshots[key] = snapshot
+        return snapshot
+
+    def invalidate(self, key: Hashable | None = None) -> None:
+        """Discard the snapshot for `key`, or all snapshots if None."""
+        if key is None:
+            self._snapshots.clear()
+        else:
+            self._snapshots.pop(key, None)
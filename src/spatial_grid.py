@@ -0,0 +1,92 @@
+"""Contains `SpatialGrid` class."""
+
+import math
+from collections import defaultdict
+from collections.abc import Iterable
+from typing import ClassVar
+
+import pygame
+
+Cell = tuple[int, int]
+
+
+class SpatialGrid:
+    """Uniform bucketed grid of sprites, keyed by the cell holding each center.
+
+    Rebuilt once per frame so neighbour and collision queries only visit sprites in
+    nearby cells instead of the whole group.
+    """
+
+    CELL_SIZE: ClassVar = 64
+    """Pixels."""
+
+    def __init__(self, *, cell_size: int = CELL_SIZE) -> None:
+        self.cell_size = cell_size
+        self._buckets: defaultdict[Cell, list[pygame.sprite.Sprite]] = defaultdict(list)
+
+    def clear(self) -> None:
+        """Remove all sprites from the grid."""
+        self._buckets.clear()
+
+    def rebuild(self, sprites: Iterable[pygame.sprite.Sprite]) -> None:
+        """Replace the grid contents with `sprites` at their current positions."""
+        self._buckets.clear()
+        for sprite in sprites:
+            self.insert(sprite)
+
+    def insert(self, sprite: pygame.sprite.Sprite) -> None:
+        """Add `sprite` to the bucket holding its center."""
+        self._buckets[self._cell_at(sprite.rect.center)].append(sprite)
+
+    def query_rect(self, rect: pygame.Rect) -> list[pygame.sprite.Sprite]:
+        """Return sprites whose centers lie in cells overlapped by `rect`."""
+        min_x, min_y = self._cell_at(rect.topleft)
+        max_x, max_y = self._cell_at(rect.bottomright)
+        return [
+            sprite
+            for cell_x in range(min_x, max_x + 1)
+            for cell_y in range(min_y, max_y + 1)
+            for sprite in self._buckets.get((cell_x, cell_y), ())
+        ]
+
+    def query_radius(
+        self, pos: tuple[float, float], radius: float
+    ) -> list[pygame.sprite.Sprite]:
+        """Return sprites whose centers lie within `radius` of `pos`."""
+        x, y = pos
+        area = pygame.Rect(x - radius, y - radius, 2 * radius + 1, 2 * radius + 1)
+        return [
+            sprite
+            for sprite in self.query_rect(area)
+            if math.dist(pos, sprite.rect.center) <= radius
+        ]
+
+    def query_segment(
+        self,
+        start: tuple[float, float],
+        end: tuple[float, float],
+        *,
+        margin: float = 0,
+    ) -> list[pygame.sprite.Sprite]:
+        """Return sprites whose centers lie near the segment from `start` to `end`.
+
+        Candidates are taken from every cell within `margin` pixels of the segment, so
+        `margin` should cover the largest extent of the sprites' hitboxes.
+        """
+        steps = max(1, math.ceil(2 * math.dist(start, end) / self.cell_size))
+        cells: set[Cell] = set()
+        for step in range(steps + 1):
+            t = step / steps
+            x = start[0] + (end[0] - start[0]) * t
+            y = start[1] + (end[1] - start[1]) * t
+            min_x, min_y = self._cell_at((x - margin, y - margin))
+            max_x, max_y = self._cell_at((x + margin, y + margin))
+            cells.update(
+                (cell_x, cell_y)
+                for cell_x in range(min_x, max_x + 1)
+                for cell_y in range(min_y, max_y + 1)
+            )
+        return [sprite for cell in cells for sprite in self._buckets.get(cell, ())]
+
+    def _cell_at(self, pos: tuple[float, float]) -> Cell:
+        return int(pos[0] // self.cell_size), int(pos[1] // self.cell_size)
@@ -0,0 +1,57 @@
+"""Contains `SweptCollisions` class."""
+
+import math
+from collections.abc import Iterable
+from typing import Protocol
+
+import pygame
+
+from src.spatial_grid import SpatialGrid
+
+
+class Mover(Protocol):
+    """Point which moved from `previous_pos` to `pos` during the last step."""
+
+    previous_pos: pygame.math.Vector2
+    pos: pygame.math.Vector2
+
+
+class SweptCollisions:
+    """Finds the hitboxes that moving points crossed during a step.
+
+    The broad phase queries a `SpatialGrid` with the bounding box of each mover's
+    swept path, so fast movers can't tunnel through hitboxes between steps. The
+    narrow phase clips each path against the candidates' hitboxes.
+    """
+
+    def __init__(self, grid: SpatialGrid, *, margin: float) -> None:
+        self.grid = grid
+        self.margin = margin
+        """Upper bound on hitbox extent from the sprite center, pixels."""
+
+    def hits(
+        self, movers: Iterable[Mover]
+    ) -> list[tuple[Mover, list[pygame.sprite.Sprite]]]:
+        """Return each mover that hit something, with the sprites it hit.
+
+        Sprites are listed in the order they were reached along the path.
+        """
+        results = []
+        for mover in movers:
+            start = mover.previous_pos
+            end = mover.pos
+            swept = pygame.Rect(
+                min(start.x, end.x) - self.margin,
+                min(start.y, end.y) - self.margin,
+                abs(end.x - start.x) + 2 * self.margin + 1,
+                abs(end.y - start.y) + 2 * self.margin + 1,
+            )
+            entries = []
+            for sprite in self.grid.query_rect(swept):
+                clipped = sprite.hitbox.clipline(start, end)
+                if clipped:
+                    entries.append((math.dist(start, clipped[0]), sprite))
+            if entries:
+                entries.sort(key=lambda entry: entry[0])
+                results.append((mover, [sprite for _, sprite in entries]))
+        return results
@@ -0,0 +1,87 @@
+"""Contains `TextCache` class and the shared `text_cache` instance."""
+
+from collections import OrderedDict
+from typing import ClassVar
+
+import pygame
+
+Color = tuple[int, int, int]
+
+
+class TextCache:
+    """Least-recently-used cache of rendered text surfaces.
+
+    Surfaces are shared between callers and must not be modified in place.
+    """
+
+    MAX_SIZE: ClassVar = 512
+    """Maximum number of cached surfaces."""
+    OUTLINE_OFFSETS: ClassVar = (
+        (-1, -1),
+        (-1, 1),
+        (1, -1),
+        (1, 1),
+        (-1, 0),
+        (1, 0),
+        (0, -1),
+        (0, 1),
+    )
+
+    def __init__(self, *, max_size: int = MAX_SIZE) -> None:
+        self.max_size = max_size
+        self._surfaces: OrderedDict[tuple, pygame.Surface] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+    def clear(self) -> None:
+        """Remove all cached surfaces."""
+        self._surfaces.clear()
+
+    def render(
+        self,
+        font: pygame.font.Font,
+        text: str,
+        color: Color,
+        *,
+        outline_color: Color | None = None,
+    ) -> pygame.Surface:
+        """Return `text` rendered in `font`, with a 1 pixel outline if requested."""
+        key = (font, text, color, outline_color)
+        surface = self._get(key)
+        if surface is None:
+            if outline_color is None:
+                surface = font.render(text, True, color)
+            else:
+                surface = self._render_outlined(font, text, color, outline_color)
+            self._put(key, surface)
+        return surface
+
+    def _get(self, key: tuple) -> pygame.Surface | None:
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+        return surface
+
+    def _put(self, key: tuple, surface: pygame.Surface) -> None:
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_size:
+            self._surfaces.popitem(last=False)
+
+    def _render_outlined(
+        self,
+        font: pygame.font.Font,
+        text: str,
+        color: Color,
+        outline_color: Color,
+    ) -> pygame.Surface:
+        outline_surface = font.render(text, True, outline_color)
+        width, height = outline_surface.get_size()
+        surface = pygame.Surface((width + 2, height + 2), pygame.SRCALPHA)
+        for dx, dy in self.OUTLINE_OFFSETS:
+            surface.blit(outline_surface, (1 + dx, 1 + dy))
+        surface.blit(font.render(text, True, color), (1, 1))
+        return surface
+
+
+text_cache = TextCache()
@@ -13,6 +13,10 @@ class Weapon:
     penetration: int
     locked: bool = True
     blast_radius: int = 0
+    pellets: int = 1
+    """Projectiles fired per shot, each with its own spread."""
+    sounds: tuple[str, ...] = ()
+    """Names of the sounds played per shot."""
 
     def __post_init__(self) -> None:
         self.ammo = self.max_ammo
@@ -0,0 +1,255 @@
+"""Contains `ZombieSwarm` class."""
+
+from typing import ClassVar, Protocol
+
+import numpy as np
+import pygame
+
+from src import game_clock
+from src.constants import PLAY_AREA
+from src.flow_field import FlowField
+from src.navigation import NavGrid
+from src.rotation_atlas import RotationAtlas
+
+
+class SwarmMember(Protocol):
+    rect: pygame.Rect
+    swarm_slot: int | None
+
+
+class ZombieSwarm:
+    """Batched zombie movement, stored as NumPy arrays.
+
+    Each step seeks every zombie towards its next flow field cell, pushes apart
+    zombies that are too close, clamps them to the play area and out of obstacles,
+    turns them towards their targets and expires health bar timers with vectorised
+    operations, instead of per-sprite vector maths. Members keep their slot in the
+    arrays and read their state from it; `sync()` copies positions back to their
+    rects.
+    """
+
+    INITIAL_CAPACITY: ClassVar = 256
+    AVOIDANCE_RADIUS: ClassVar = 5
+    """Pixels."""
+    AVOIDANCE_FACTOR: ClassVar = 0.6
+    """Avoidance speed as a fraction of seeking speed."""
+    HEALTH_BAR_DURATION: ClassVar = 120
+    """Milliseconds."""
+    NEIGHBOR_OFFSETS: ClassVar = np.array(
+        [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)], dtype=np.int64
+    )
+    _KEY_STRIDE: ClassVar = 1 << 20
+    """Multiplier packing a 2D bucket into one integer key."""
+    _ARRAY_NAMES: ClassVar = (
+        'positions',
+        'speeds',
+        'half_sizes',
+        'targets',
+        'seeking',
+        'frame_indices',
+        'last_damage_times',
+        'show_health_bars',
+    )
+
+    def __init__(
+        self,
+        *,
+        capacity: int = INITIAL_CAPACITY,
+        avoidance_radius: float = AVOIDANCE_RADIUS,
+        health_bar_duration: int = HEALTH_BAR_DURATION,
+        rotation_steps: int = RotationAtlas.STEPS,
+    ) -> None:
+        self.avoidance_radius = avoidance_radius
+        self.rotation_steps = rotation_steps
+        self.health_bar_duration = health_bar_duration
+        self.bounds = np.array((PLAY_AREA['WIDTH'], PLAY_AREA['HEIGHT']), dtype=float)
+        self.count = 0
+        self.members: list[SwarmMember] = []
+        self.positions = np.zeros((capacity, 2))
+        """Centers, pixels."""
+        self.speeds = np.zeros(capacity)
+        """Pixels per step."""
+        self.half_sizes = np.zeros((capacity, 2))
+        self.targets = np.zeros((capacity, 2))
+        """Pixel positions being headed for."""
+        self.seeking = np.zeros(capacity, dtype=bool)
+        self.frame_indices = np.zeros(capacity, dtype=np.intp)
+        """`RotationAtlas` frame facing the target, or -1 if at the target."""
+        self.last_damage_times = np.zeros(capacity, dtype=np.int64)
+        self.show_health_bars = np.zeros(capacity, dtype=bool)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(
+        self,
+        member: SwarmMember,
+        *,
+        pos: tuple[float, float],
+        speed: float,
+        size: tuple[int, int],
+    ) -> None:
+        """Add `member` to the swarm, setting its `swarm_slot`."""
+        self._reserve(1)
+        i = self.count
+        self.positions[i] = pos
+        self.speeds[i] = speed
+        self.half_sizes[i] = (size[0] / 2, size[1] / 2)
+        self.targets[i] = pos
+        self.seeking[i] = True
+        self.frame_indices[i] = -1
+        self.last_damage_times[i] = 0
+        self.show_health_bars[i] = False
+        self.members.append(member)
+        member.swarm_slot = i
+        self.count += 1
+
+    def remove(self, member: SwarmMember) -> None:
+        """Remove `member`, moving the last member into its slot."""
+        i = member.swarm_slot
+        last = self.count - 1
+        if i != last:
+            for name in self._ARRAY_NAMES:
+                array = getattr(self, name)
+                array[i] = array[last]
+            moved = self.members[last]
+            self.members[i] = moved
+            moved.swarm_slot = i
+        self.members.pop()
+        member.swarm_slot = None
+        self.count -= 1
+
+    def clear(self) -> None:
+        """Remove all members."""
+        for member in self.members:
+            member.swarm_slot = None
+        self.members.clear()
+        self.count = 0
+
+    def step(
+        self,
+        *,
+        flow_field: FlowField,
+        fallback_target: tuple[float, float],
+        now: int,
+        nav_grid: NavGrid | None = None,
+    ) -> None:
+        """Move all members one simulation step, sliding along any obstacles."""
+        n = self.count
+        if not n:
+            return
+        positions = self.positions[:n]
+        starts = positions.copy()
+        speeds = self.speeds[:n] * game_clock.step_scale()
+
+        # Seek the next flow field cell, or the fallback where there is none
+        width, height = flow_field.grid_size
+        cells = (positions // flow_field.CELL_SIZE).astype(np.intp)
+        in_bounds = (
+            (cells[:, 0] >= 0)
+            & (cells[:, 1] >= 0)
+            & (cells[:, 0] < width)
+            & (cells[:, 1] < height)
+        )
+        indices = np.where(in_bounds, cells[:, 1] * width + cells[:, 0], 0)
+        next_cells = flow_field.next_cells_array()[indices]
+        has_next = in_bounds & (next_cells[:, 0] >= 0)
+        targets = np.where(
+            has_next[:, None], next_cells * flow_field.CELL_SIZE, fallback_target
+        )
+        self.targets[:n] = targets
+        directions = targets - positions
+        lengths = np.hypot(directions[:, 0], directions[:, 1])
+        moving = self.seeking[:n] & (lengths > 0)
+        positions[moving] += (
+            directions[moving] * (speeds[moving] / lengths[moving])[:, None]
+        )
+
+        # Separate
+        positions += (
+            self._avoidance(positions) * (speeds * self.AVOIDANCE_FACTOR)[:, None]
+        )
+
+        # Clamp
+        half_sizes = self.half_sizes[:n]
+        np.clip(positions, half_sizes, self.bounds - half_sizes, out=positions)
+        if nav_grid is not None:
+            nav_grid.slide_all(starts, positions, half_sizes)
+
+        # Face the target
+        directions = targets - np.rint(positions)
+        angles = np.degrees(np.arctan2(-directions[:, 1], directions[:, 0]))
+        self.frame_indices[:n] = np.where(
+            (directions != 0).any(axis=1),
+            np.rint(angles * self.rotation_steps / 360) % self.rotation_steps,
+            -1,
+        )
+
+        # Expire health bars
+        self.show_health_bars[:n] &= (
+            now - self.last_damage_times[:n] <= self.health_bar_duration
+        )
+
+    def sync(self) -> None:
+        """Copy positions back to the members' rects."""
+        centers = np.rint(self.positions[: self.count]).astype(np.intp).tolist()
+        for member, center in zip(self.members, centers, strict=True):
+            member.rect.center = center
+
+    def _avoidance(self, positions: np.ndarray) -> np.ndarray:
+        """Return unit vectors away from close neighbors, zero for members with none.
+
+        Members are bucketed by `avoidance_radius`, so only pairs in neighboring
+        buckets are compared.
+        """
+        n = len(positions)
+        radius = self.avoidance_radius
+        buckets = np.floor(positions / radius).astype(np.int64)
+        keys = buckets[:, 0] * self._KEY_STRIDE + buckets[:, 1]
+        order = np.argsort(keys)
+        sorted_keys = keys[order]
+
+        firsts = []
+        seconds = []
+        for dx, dy in self.NEIGHBOR_OFFSETS:
+            neighbor_keys = keys + dx * self._KEY_STRIDE + dy
+            starts = np.searchsorted(sorted_keys, neighbor_keys, side='left')
+            counts = np.searchsorted(sorted_keys, neighbor_keys, side='right') - starts
+            total = counts.sum()
+            if not total:
+                continue
+            firsts.append(np.repeat(np.arange(n), counts))
+            run_starts = np.repeat(np.cumsum(counts) - counts, counts)
+            seconds.append(
+                order[np.repeat(starts, counts) + np.arange(total) - run_starts]
+            )
+
+        forces = np.zeros_like(positions)
+        if not firsts:
+            return forces
+        first = np.concatenate(firsts)
+        second = np.concatenate(seconds)
+        offsets = positions[first] - positions[second]
+        distances = np.hypot(offsets[:, 0], offsets[:, 1])
+        close = (distances > 0) & (distances < radius)
+        np.add.at(
+            forces,
+            first[close],
+            offsets[close] / distances[close][:, None],
+        )
+        lengths = np.hypot(forces[:, 0], forces[:, 1])
+        pushed = lengths > 0
+        forces[pushed] /= lengths[pushed][:, None]
+        return forces
+
+    def _reserve(self, extra: int) -> None:
+        """Grow the arrays, if needed, to hold `extra` more members."""
+        capacity = len(self.speeds)
+        if self.count + extra <= capacity:
+            return
+        new_capacity = max(capacity * 2, self.count + extra)
+        for name in self._ARRAY_NAMES:
+            old = getattr(self, name)
+            new = np.zeros((new_capacity, *old.shape[1:]), dtype=old.dtype)
+            new[: self.count] = old[: self.count]
+            setattr(self, name, new)
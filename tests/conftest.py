@@ -0,0 +1,18 @@
+from collections.abc import Callable
+
+import pytest
+
+from src import game_clock
+
+
+@pytest.fixture
+def install_clock(
+    monkeypatch: pytest.MonkeyPatch,
+) -> Callable[[game_clock.Clock], None]:
+    """Return a function installing a game clock, which is removed after the test."""
+
+    def install(clock: game_clock.Clock) -> None:
+        monkeypatch.setattr(game_clock, '_clock', clock)
+
+    monkeypatch.setattr(game_clock, '_timestep', None)
+    return install
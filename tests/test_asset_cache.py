@@ -0,0 +1,94 @@
+import threading
+from collections.abc import Callable
+from pathlib import Path
+
+import pygame
+import pytest
+
+from src.asset_cache import AssetCache, AssetLoader
+
+IMAGES_DIR = Path(__file__).parent.parent / 'images'
+SFX_DIR = Path(__file__).parent.parent / 'sfx'
+
+
+def test_cached_assets_match_source(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """Test that a saved pack is read back on the next run with the same pixels."""
+    # arrange
+    monkeypatch.setenv('SDL_VIDEODRIVER', 'dummy')
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    pack_path = tmp_path / 'assets.pack'
+    first_run = AssetCache(pack_path)
+    image = first_run.image(IMAGES_DIR / 'orb.png', size=(20, 20))
+    atlas = first_run.rotation_atlas(IMAGES_DIR / 'player.png', steps=8)
+    first_run.save()
+    first_run.close()
+    # act
+    second_run = AssetCache(pack_path)
+    cached_image = second_run.image(IMAGES_DIR / 'orb.png', size=(20, 20))
+    cached_atlas = second_run.rotation_atlas(IMAGES_DIR / 'player.png', steps=8)
+    second_run.close()
+    pygame.display.quit()
+    # assert
+    assert (first_run.misses, second_run.hits, second_run.misses) == (2, 2, 0)
+    assert pygame.image.tobytes(cached_image, 'RGBA') == pygame.image.tobytes(
+        image, 'RGBA'
+    )
+    assert [frame.get_size() for frame in cached_atlas.frames] == [
+        frame.get_size() for frame in atlas.frames
+    ]
+
+
+def test_loader_finishes_tasks_on_calling_thread() -> None:
+    """Test that tasks are read in the background and finished by `join()`."""
+    # arrange
+    threads = {}
+
+    def read(name: str) -> Callable[[], object]:
+        threads[f'read {name}'] = threading.current_thread()
+        return lambda: threads.setdefault(f'finish {name}', threading.current_thread())
+
+    loader = AssetLoader({'a': lambda: read('a'), 'b': lambda: read('b')})
+    # act
+    loader.start()
+    results = loader.join()
+    # assert
+    assert results == {'a': threading.main_thread(), 'b': threading.main_thread()}
+    assert threads['read a'] is not threading.main_thread()
+    assert loader.progress == 1
+
+
+def test_sounds_are_created_on_the_main_thread(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """Test that loading a sound in the background only creates it in `join()`."""
+    # arrange
+    monkeypatch.setenv('SDL_AUDIODRIVER', 'dummy')
+    pygame.mixer.init()
+    sound_class = pygame.mixer.Sound
+    threads = []
+
+    def sound(*args: object, **kwargs: object) -> pygame.mixer.Sound:
+        threads.append(threading.current_thread())
+        return sound_class(*args, **kwargs)
+
+    monkeypatch.setattr(pygame.mixer, 'Sound', sound)
+    source = SFX_DIR / 'bullet.mp3'
+    first_run = AssetCache(tmp_path / 'assets.pack')
+    loader = AssetLoader({'shot': lambda: first_run.read_sound(source)})
+    # act
+    loader.start()
+    loaded = loader.join()['shot']
+    first_run.save()
+    first_run.close()
+    second_run = AssetCache(tmp_path / 'assets.pack')
+    cached = second_run.sound(source)
+    second_run.close()
+    same_samples = cached.get_raw() == loaded.get_raw()
+    pygame.mixer.quit()
+    # assert
+    assert threads == [threading.main_thread()] * 2
+    assert (first_run.misses, second_run.hits) == (1, 1)
+    assert same_samples
@@ -0,0 +1,27 @@
+from pathlib import Path
+
+import pygame
+import pytest
+
+from src.audio import AudioManager
+
+SFX_DIR = Path(__file__).parent.parent / 'sfx'
+
+
+def test_voice_limit(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a full group drops or replaces sounds, and sounds are decoded once."""
+    # arrange
+    monkeypatch.setenv('SDL_AUDIODRIVER', 'dummy')
+    pygame.mixer.init()
+    audio = AudioManager(groups={'groans': (1, False), 'weapons': (2, True)})
+    audio.register('groan', SFX_DIR / 'zombie_groan1.mp3', group='groans')
+    audio.register('shot', SFX_DIR / 'bullet.mp3', group='weapons')
+    # act
+    groan_channels = [audio.play('groan') for _ in range(2)]
+    shot_channels = [audio.play('shot') for _ in range(3)]
+    # assert
+    assert groan_channels[0] is not None
+    assert groan_channels[1] is None
+    assert shot_channels[2] is shot_channels[0]
+    assert audio.sound('shot') is audio.sound('shot')
+    pygame.mixer.quit()
@@ -0,0 +1,59 @@
+import pygame
+
+from src.background import Background
+
+
+def make_image(size: tuple[int, int]) -> pygame.Surface:
+    """Return an image whose pixels' colors encode their positions."""
+    image = pygame.Surface(size)
+    for x in range(size[0]):
+        for y in range(size[1]):
+            image.set_at((x, y), (x, y, 0))
+    return image
+
+
+def test_draw_blits_visible_region() -> None:
+    """Test that the camera offset selects the region of the image drawn."""
+    # arrange
+    background = Background(make_image((40, 40)), size=(40, 40))
+    surface = pygame.Surface((10, 10))
+    # act
+    background.draw(surface=surface, offset=(-10, -20))
+    # assert
+    assert surface.get_at((0, 0)) == (10, 20, 0, 255)
+    assert surface.get_at((9, 9)) == (19, 29, 0, 255)
+
+
+def test_draw_rects_restores_only_those_rects() -> None:
+    """Test that drawing with `rects` leaves the rest of the surface untouched."""
+    # arrange
+    background = Background(make_image((40, 40)), size=(40, 40))
+    surface = pygame.Surface((10, 10))
+    surface.fill((0, 0, 255))
+    # act
+    background.draw(surface=surface, offset=(-5, -5), rects=[pygame.Rect(2, 3, 4, 4)])
+    # assert
+    assert surface.get_at((2, 3)) == (7, 8, 0, 255)
+    assert surface.get_at((5, 6)) == (10, 11, 0, 255)
+    assert surface.get_at((1, 3)) == (0, 0, 255, 255)
+    assert surface.get_at((6, 7)) == (0, 0, 255, 255)
+
+
+def test_resize_rebuilds_scaled_image() -> None:
+    """Test that resizing rescales the source once and recomposes the overlay."""
+    # arrange
+    source = pygame.Surface((10, 10))
+    source.fill((0, 255, 0))
+    background = Background(source, size=(20, 20))
+    overlay = pygame.Surface((40, 30), pygame.SRCALPHA)
+    overlay.fill((255, 0, 0, 255), pygame.Rect(0, 0, 1, 1))
+    background.overlay = overlay
+    version = background.version
+    # act
+    background.resize((40, 30))
+    # assert
+    assert background.scaled_image.get_size() == (40, 30)
+    assert background.image.get_size() == (40, 30)
+    assert background.image.get_at((0, 0)) == (255, 0, 0, 255)
+    assert background.image.get_at((39, 29)) == (0, 255, 0, 255)
+    assert background.version > version
@@ -0,0 +1,72 @@
+from collections.abc import Callable
+
+import pytest
+
+from src import game_clock
+from src import profiler as profiler_module
+from src.benchmark import Benchmark, BenchmarkScenario
+from src.profiler import Profiler
+
+
+def test_report_lists_phase_costs_per_scenario(
+    install_clock: Callable[[game_clock.Clock], None],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that each scenario is reported per phase, its total leaving out idle."""
+    # arrange
+    clock = game_clock.FixedStepClock(step_ms=4)
+    install_clock(clock)
+    monkeypatch.setattr(
+        profiler_module.time, 'perf_counter', lambda: game_clock.get_ticks() / 1000
+    )
+    scenarios = [
+        BenchmarkScenario(wave=1, zombies=10, frames=2),
+        BenchmarkScenario(wave=5, zombies=50, frames=3),
+    ]
+    benchmark = Benchmark(scenarios)
+    profiler = Profiler()
+    completed = []
+    # act
+    while benchmark.scenario is not None:
+        with profiler.scope('update'):
+            clock.tick()
+        with profiler.scope('render'):
+            for _ in range(benchmark.scenario.wave // 2 + 1):
+                clock.tick()
+        with profiler.scope(Profiler.IDLE):
+            clock.tick()
+        completed.append(benchmark.end_frame(profiler))
+    report = benchmark.report().splitlines()
+    # assert
+    assert completed == [False, True, False, False, True]
+    assert report[0].split() == [
+        'wave',
+        'zombies',
+        'frames',
+        'p95',
+        'frame',
+        'total',
+        'update',
+        'render',
+        'idle',
+    ]
+    assert report[1].split() == [
+        '1',
+        '10',
+        '2',
+        '8.000',
+        '8.000',
+        '4.000',
+        '4.000',
+        '4.000',
+    ]
+    assert report[2].split() == [
+        '5',
+        '50',
+        '3',
+        '16.000',
+        '16.000',
+        '4.000',
+        '12.000',
+        '4.000',
+    ]
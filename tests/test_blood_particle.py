@@ -0,0 +1,51 @@
+from collections.abc import Callable
+
+import pygame
+
+from src import game_clock
+from src.background import Background
+from src.blood_particle import BloodParticles
+from src.decal_layer import DecalLayer
+
+
+def test_particles_expire_after_lifetime(
+    install_clock: Callable[[game_clock.Clock], None],
+) -> None:
+    """Test that particles move while alive and are removed once expired."""
+    # arrange
+    clock = game_clock.FixedStepClock(step_ms=BloodParticles.LIFETIME / 2)
+    install_clock(clock)
+    particles = BloodParticles(capacity=2)
+    particles.spawn_spray(pos=(100, 100))
+    start_positions = particles.positions[: len(particles)].copy()
+    # act
+    clock.tick()
+    particles.update()
+    alive_after_half = len(particles)
+    clock.tick()
+    particles.update()
+    # assert
+    assert alive_after_half == BloodParticles.PARTICLES_PER_SPRAY
+    assert (particles.positions[:alive_after_half] != start_positions).any()
+    assert len(particles) == 0
+
+
+def test_resting_particles_are_stamped_into_decals(
+    install_clock: Callable[[game_clock.Clock], None],
+) -> None:
+    """Test that particles which have stopped moving are baked into the background."""
+    # arrange
+    install_clock(game_clock.FixedStepClock())
+    background = Background(pygame.Surface((200, 200)), size=(200, 200))
+    decals = DecalLayer(background)
+    particles = BloodParticles(decals=decals)
+    particles.spawn_spray(pos=(100, 100))
+    # act
+    for _ in range(1000):
+        particles.update()
+    # assert
+    assert len(particles) == 0
+    assert decals.image.get_bounding_rect().width > 0
+    assert pygame.image.tobytes(background.image, 'RGB') != pygame.image.tobytes(
+        background.scaled_image, 'RGB'
+    )
@@ -0,0 +1,33 @@
+import pygame
+
+from src.contact_collision import ContactCollisions
+from src.rotation_atlas import RotationAtlas
+from src.spatial_grid import SpatialGrid
+
+
+def _sprite_at(pos: tuple[int, int], atlas: RotationAtlas) -> pygame.sprite.Sprite:
+    sprite = pygame.sprite.Sprite()
+    sprite.image = atlas.frames[0]
+    sprite.rect = sprite.image.get_rect(center=pos)
+    sprite.mask = atlas.masks[0]
+    sprite.radius = atlas.radius
+    return sprite
+
+
+def test_touching_requires_mask_overlap() -> None:
+    """Test that only sprites whose opaque pixels overlap are returned."""
+    # arrange
+    image = pygame.Surface((20, 20), pygame.SRCALPHA)
+    pygame.draw.circle(image, (255, 255, 255), (10, 10), 10)
+    atlas = RotationAtlas(image, steps=4)
+    player = _sprite_at((100, 100), atlas)
+    touching = _sprite_at((115, 100), atlas)
+    corner_to_corner = _sprite_at((117, 117), atlas)
+    distant = _sprite_at((300, 100), atlas)
+    grid = SpatialGrid()
+    grid.rebuild([touching, corner_to_corner, distant])
+    contacts = ContactCollisions(grid, max_radius=atlas.radius)
+    # act
+    found = contacts.touching(player)
+    # assert
+    assert found == [touching]
@@ -0,0 +1,42 @@
+from collections.abc import Callable
+
+import pygame
+
+from src import game_clock
+from src.background import Background
+from src.decal_layer import DecalLayer
+
+
+def test_fading_rebuilds_only_tiles_with_decals(
+    install_clock: Callable[[game_clock.Clock], None],
+) -> None:
+    """Test that a fade pass touches only the decal's tile, until it has faded out."""
+    # arrange
+    clock = game_clock.FixedStepClock(step_ms=DecalLayer.FADE_STEP)
+    install_clock(clock)
+    background = Background(pygame.Surface((300, 300)), size=(300, 300))
+    decals = DecalLayer(background, fade_duration=255)
+    mark = pygame.Surface((4, 4), pygame.SRCALPHA)
+    mark.fill((200, 0, 0, 255))
+    decals.stamp([(mark, (140, 10))])
+    version = background.version
+    # act
+    clock.tick()
+    decals.update()
+    changed_rects = background.take_changed_rects()
+    faded_alpha = decals.image.get_at((141, 11)).a
+    for _ in range(255 // DecalLayer.FADE_STEP):
+        clock.tick()
+        decals.update()
+    background.take_changed_rects()
+    clock.tick()
+    decals.update()
+    # assert
+    assert changed_rects == [pygame.Rect(128, 0, 64, 64)]
+    assert faded_alpha == 255 - DecalLayer.FADE_STEP
+    assert background.version == version
+    assert decals.image.get_at((141, 11)).a == 0
+    assert background.image.get_at((141, 11)) == background.scaled_image.get_at(
+        (141, 11)
+    )
+    assert background.take_changed_rects() == []
@@ -0,0 +1,62 @@
+from src.flow_field import FlowField, FlowFieldCache
+
+
+def test_next_cell_steps_towards_goal() -> None:
+    """Test that following next cells from any cell reaches the goal."""
+    # arrange
+    flow_field = FlowField(goal=(5, 5), grid_size=(10, 10))
+    cell = (0, 9)
+    # act
+    steps = 0
+    while cell != flow_field.goal:
+        cell = flow_field.next_cell(cell)
+        steps += 1
+    # assert
+    assert steps == 5
+    assert flow_field.next_cell(flow_field.goal) is None
+
+
+def test_cell_at() -> None:
+    """Test that pixel positions map to grid cells."""
+    # arrange
+    # act
+    cell = FlowField.cell_at((65, 31))
+    # assert
+    assert cell == (2, 0)
+
+
+def test_cache_reuses_fields_until_invalidated() -> None:
+    """Test that fields are computed once per goal and evicted when stale."""
+    # arrange
+    cache = FlowFieldCache(max_size=4, grid_size=(10, 10))
+    # act
+    first = cache.get((5, 5))
+    neighbor = cache.get((6, 5))
+    revisited = cache.get((5, 5))
+    cache.invalidate()
+    recomputed = cache.get((5, 5))
+    # assert
+    assert neighbor.goal == (6, 5)
+    assert revisited is first
+    assert (cache.hits, cache.misses) == (1, 3)
+    assert recomputed is not first
+    assert len(cache) == 1
+
+
+def test_prewarmed_neighbors_are_cache_hits() -> None:
+    """Test that queued neighbors are computed one per call and then reused."""
+    # arrange
+    cache = FlowFieldCache(grid_size=(10, 10))
+    cache.get((0, 0))
+    cache.prewarm((0, 0))
+    cache.prewarm((5, 5))
+    # act
+    computed = 0
+    while cache.compute_pending():
+        computed += 1
+    neighbor = cache.get((6, 5))
+    # assert
+    assert computed == 8
+    assert neighbor.goal == (6, 5)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert len(cache) == 9
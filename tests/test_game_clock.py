@@ -0,0 +1,32 @@
+import pytest
+
+from src import game_clock
+
+
+def test_fixed_timestep_splits_frame_time() -> None:
+    """Test that frame time is simulated in whole steps, carrying the remainder."""
+    # arrange
+    timestep = game_clock.FixedTimestep(rate=50, max_steps=3)
+    # act
+    steps = [timestep.advance(elapsed_ms) for elapsed_ms in (10, 35, 1000)]
+    # assert
+    assert steps == [0, 2, 3]
+    assert timestep.scale == game_clock.FixedTimestep.BASE_RATE / 50
+    assert 0 <= timestep.alpha < 1
+
+
+@pytest.mark.parametrize('rate', [30, 60, 144])
+def test_per_step_amounts_add_up_per_second(
+    monkeypatch: pytest.MonkeyPatch, rate: int
+) -> None:
+    """Test that an amount per second, e.g. of damage, doesn't depend on the rate."""
+    # arrange
+    timestep = game_clock.FixedTimestep(rate=rate)
+    monkeypatch.setattr(game_clock, '_timestep', timestep)
+    # act
+    total = 0.0
+    while timestep.ticks < 1000 - timestep.step_ms / 2:
+        timestep.step()
+        total += game_clock.per_step(1500)
+    # assert
+    assert total == pytest.approx(1500)
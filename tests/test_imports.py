@@ -2,18 +2,21 @@ def test_class_imports() -> None:
     """Test that classes can be imported from modules."""
     # arrange
     # act
-    from Launcher import Camera, HealthBar, Projectile, Zombie, ZombieClass
-    from src.blood_particle import BloodParticle
+    from Launcher import Camera, HealthBar, Projectile, Zombie
+    from src.blood_particle import BloodParticles
     from src.chest import Chest
     from src.cursor import Cursor
     from src.energy_orb import EnergyOrb
     from src.floating_text import FloatingText
     from src.muzzle_flash import MuzzleFlash
+    from src.registry import ContentRegistry, ZombieClass
     from src.weapons import Weapon, WeaponCategory
+
     # assert
-    assert BloodParticle
+    assert BloodParticles
     assert Camera
     assert Chest
+    assert ContentRegistry
     assert Cursor
     assert EnergyOrb
     assert FloatingText
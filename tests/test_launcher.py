@@ -0,0 +1,48 @@
+import pygame
+import pytest
+
+import Launcher
+
+
+class RecordingRenderer:
+    """Stands in for the game renderer, recording each batch blitted."""
+
+    def __init__(self) -> None:
+        self.batches: list[list[tuple[pygame.Surface, pygame.Rect]]] = []
+
+    def blits(self, blit_sequence: list[tuple[pygame.Surface, pygame.Rect]]) -> None:
+        self.batches.append(blit_sequence)
+
+
+def make_sprite(center: tuple[int, int]) -> pygame.sprite.Sprite:
+    """Return a 10x10 sprite centred on `center`."""
+    sprite = pygame.sprite.Sprite()
+    sprite.image = pygame.Surface((10, 10))
+    sprite.rect = sprite.image.get_rect(center=center)
+    return sprite
+
+
+def test_draw_sprites_culls_outside_view_and_margin(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that only sprites within the view plus `CULL_MARGIN` are blitted."""
+    # arrange
+    renderer = RecordingRenderer()
+    margin = Launcher.CULL_MARGIN
+    inside = make_sprite((1050, 2050))
+    in_margin = make_sprite((1000 - margin, 2000))
+    beyond_margin = make_sprite((1000 - margin - 10, 2000))
+    below = make_sprite((1050, 2100 + margin + 10))
+    group = pygame.sprite.Group(inside, in_margin, beyond_margin, below)
+    monkeypatch.setattr(Launcher, 'screen', pygame.Surface((100, 100)), raising=False)
+    monkeypatch.setattr(Launcher, 'renderer', renderer, raising=False)
+    monkeypatch.setattr(Launcher, 'previous_centers', {}, raising=False)
+    monkeypatch.setattr(Launcher, 'all_sprites', lambda: [group])
+    # act
+    Launcher.draw_sprites((-1000, -2000))
+    # assert
+    assert len(renderer.batches) == 1
+    assert {rect.center for _, rect in renderer.batches[0]} == {
+        (50, 50),
+        (-margin, 0),
+    }
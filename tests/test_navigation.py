@@ -0,0 +1,181 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.flow_field import FlowField
+from src.navigation import HierarchicalPathfinder, NavGrid
+
+WALLED_MAP = '\n'.join(
+    [
+        '................',
+        '.######.........',
+        '......#.........',
+        '......#.........',
+        '......#####.....',
+        '................',
+    ]
+)
+
+
+def test_load_map(tmp_path: Path) -> None:
+    """Test that a text map loads, with cells beyond short lines left open."""
+    # arrange
+    path = tmp_path / 'map.txt'
+    path.write_text('..#\n#')
+    # act
+    nav_grid = NavGrid.load(path, grid_size=(4, 3))
+    # assert
+    assert nav_grid.grid_size == (4, 3)
+    assert nav_grid.blocked.tolist() == [
+        [False, False, True, False],
+        [True, False, False, False],
+        [False, False, False, False],
+    ]
+
+
+def test_moves_do_not_cut_corners() -> None:
+    """Test that diagonal moves past a blocked cell aren't allowed."""
+    # arrange
+    blocked = np.zeros((3, 3), dtype=bool)
+    blocked[0, 1] = True
+    nav_grid = NavGrid(blocked)
+    # act
+    flow_field = FlowField(goal=(1, 1), grid_size=(3, 3), blocked=nav_grid.blocked)
+    # assert
+    assert flow_field.next_cell((0, 0)) == (0, 1)
+    assert flow_field.next_cell((2, 2)) == (1, 1)
+
+
+def test_flow_field_goes_around_obstacles(tmp_path: Path) -> None:
+    """Test that flow field steps never enter blocked cells."""
+    # arrange
+    path = tmp_path / 'map.txt'
+    path.write_text(WALLED_MAP)
+    nav_grid = NavGrid.load(path, grid_size=(16, 6))
+    flow_field = FlowField(goal=(3, 3), grid_size=(16, 6), blocked=nav_grid.blocked)
+    cell = (8, 3)
+    # act
+    cells = [cell]
+    while cell != flow_field.goal:
+        cell = flow_field.next_cell(cell)
+        cells.append(cell)
+    # assert
+    assert all(nav_grid.is_open(cell) for cell in cells)
+    assert flow_field.distance((0, 0)) < flow_field.distance((15, 5))
+
+
+def test_hierarchical_path_matches_grid(tmp_path: Path) -> None:
+    """Test that paths across clusters are connected, open and near the shortest."""
+    # arrange
+    path = tmp_path / 'map.txt'
+    path.write_text(WALLED_MAP)
+    nav_grid = NavGrid.load(path, grid_size=(16, 6))
+    pathfinder = HierarchicalPathfinder(nav_grid, cluster_size=4)
+    flow_field = FlowField(goal=(3, 3), grid_size=(16, 6), blocked=nav_grid.blocked)
+    # act
+    cells = pathfinder.find_path((15, 5), (3, 3))
+    # assert
+    assert cells[0] == (15, 5)
+    assert cells[-1] == (3, 3)
+    assert all(nav_grid.is_open(cell) for cell in cells)
+    assert all(
+        cell in dict(nav_grid.neighbors(previous))
+        for previous, cell in zip(cells, cells[1:], strict=False)
+    )
+    cost = sum(
+        dict(nav_grid.neighbors(previous))[cell]
+        for previous, cell in zip(cells, cells[1:], strict=False)
+    )
+    assert cost <= 1.2 * flow_field.distance((15, 5))
+
+
+def test_hierarchical_flow_field_matches_grid(tmp_path: Path) -> None:
+    """Test that every open cell's steps reach the goal at near the shortest cost."""
+    # arrange
+    path = tmp_path / 'map.txt'
+    path.write_text(WALLED_MAP)
+    nav_grid = NavGrid.load(path, grid_size=(16, 6))
+    pathfinder = HierarchicalPathfinder(nav_grid, cluster_size=4)
+    exact = FlowField(goal=(15, 0), grid_size=(16, 6), blocked=nav_grid.blocked)
+    # act
+    flow_field = pathfinder.flow_field((15, 0))
+    # assert
+    for y in range(6):
+        for x in range(16):
+            cell = (x, y)
+            if not nav_grid.is_open(cell):
+                continue
+            cost = 0.0
+            while cell != flow_field.goal:
+                next_cell = flow_field.next_cell(cell)
+                cost += dict(nav_grid.neighbors(cell))[next_cell]
+                cell = next_cell
+            assert cost == pytest.approx(flow_field.distance((x, y)))
+            assert cost <= 1.5 * exact.distance((x, y))
+
+
+def test_unreachable_goal_has_no_path() -> None:
+    """Test that a goal walled off from the start has no path."""
+    # arrange
+    blocked = np.zeros((8, 8), dtype=bool)
+    blocked[:, 4] = True
+    pathfinder = HierarchicalPathfinder(NavGrid(blocked), cluster_size=2)
+    # act
+    cells = pathfinder.find_path((0, 0), (7, 7))
+    flow_field = pathfinder.flow_field((7, 7))
+    # assert
+    assert cells is None
+    assert pathfinder.find_path((0, 0), (3, 7)) is not None
+    assert flow_field.next_cell((0, 0)) is None
+    assert flow_field.next_cell((5, 0)) is not None
+
+
+def test_slide_all_moves_along_walls() -> None:
+    """Test that blocked moves keep the part of the move which is open."""
+    # arrange
+    blocked = np.zeros((3, 3), dtype=bool)
+    blocked[1, 1] = True
+    nav_grid = NavGrid(blocked, cell_size=10)
+    starts = np.array([[5.0, 15.0], [15.0, 5.0], [5.0, 5.0]])
+    ends = np.array([[15.0, 16.0], [14.0, 15.0], [6.0, 6.0]])
+    # act
+    nav_grid.slide_all(starts, ends)
+    # assert
+    assert ends.tolist() == [[5.0, 16.0], [14.0, 5.0], [6.0, 6.0]]
+
+
+def test_boxes_are_blocked_where_they_overlap_obstacles() -> None:
+    """Test that a box is blocked by any cell it overlaps, not just its center's."""
+    # arrange
+    blocked = np.zeros((3, 3), dtype=bool)
+    blocked[1, 1] = True
+    nav_grid = NavGrid(blocked, cell_size=10)
+    rng = np.random.default_rng(0)
+    positions = rng.uniform(-5, 35, (200, 2))
+    half_sizes = rng.uniform(0, 12, (200, 2))
+    # act
+    blocked_boxes = nav_grid.blocked_at(positions, half_sizes)
+    # assert
+    assert not nav_grid.is_blocked_at((5, 5), (5, 5))
+    assert nav_grid.is_blocked_at((5, 5), (5.5, 5.5))
+    assert nav_grid.is_blocked_at((0, 0), (25, 25))
+    assert blocked_boxes.tolist() == [
+        nav_grid.is_blocked_at(pos, half_size)
+        for pos, half_size in zip(positions, half_sizes, strict=True)
+    ]
+
+
+def test_slide_stops_boxes_at_walls() -> None:
+    """Test that boxes slide along walls without sinking into them."""
+    # arrange
+    blocked = np.zeros((3, 3), dtype=bool)
+    blocked[:, 2] = True
+    nav_grid = NavGrid(blocked, cell_size=10)
+    starts = np.array([[14.0, 15.0], [25.0, 15.0]])
+    ends = np.array([[17.0, 18.0], [22.0, 12.0]])
+    # act
+    nav_grid.slide_all(starts, ends, np.full((2, 2), 4.0))
+    # assert
+    assert ends.tolist() == [[14.0, 18.0], [22.0, 12.0]]
+    assert nav_grid.slide((14, 15), (17, 18), (4, 4)) == (14, 18)
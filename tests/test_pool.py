@@ -0,0 +1,41 @@
+import pygame
+import pytest
+
+from src.pool import PooledSprite
+
+
+class Dot(PooledSprite):
+    def reset(self, pos: tuple[int, int]) -> None:
+        self.rect = pygame.Rect(pos, (1, 1))
+
+
+def test_killed_sprite_is_reused_once() -> None:
+    """Test that a killed sprite is reset and reused, and only released once."""
+    # arrange
+    group = pygame.sprite.Group()
+    dot = Dot.spawn((1, 2))
+    group.add(dot)
+    # act
+    dot.kill()
+    dot.kill()
+    reused = Dot.spawn((3, 4))
+    fresh = Dot.spawn((5, 6))
+    # assert
+    assert reused is dot
+    assert reused.rect.topleft == (3, 4)
+    assert fresh is not dot
+    assert len(Dot.pool) == 0
+
+
+def test_sprite_without_reset_cannot_be_created() -> None:
+    """Test that a pooled sprite class must implement `reset()`."""
+
+    # arrange
+    class Incomplete(PooledSprite):
+        pass
+
+    # act
+    with pytest.raises(TypeError) as error:
+        Incomplete.spawn()
+    # assert
+    assert 'reset' in str(error.value)
@@ -0,0 +1,85 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from src import profiler as profiler_module
+from src.profiler import Profiler
+
+
+class FakeCounter:
+    """Stands in for `time.perf_counter`, advanced by hand."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def counter(monkeypatch: pytest.MonkeyPatch) -> FakeCounter:
+    """Return a fake clock used by the profiler for the duration of a test."""
+    counter = FakeCounter()
+    monkeypatch.setattr(profiler_module.time, 'perf_counter', counter)
+    return counter
+
+
+def run_frame(profiler: Profiler, counter: FakeCounter, update_ms: float) -> None:
+    """Record a frame which spends `update_ms` in the update phase."""
+    with profiler.scope('update'):
+        counter.now += update_ms / 1000
+    profiler.end_frame()
+
+
+def test_percentiles_of_known_samples(counter: FakeCounter) -> None:
+    """Test that percentiles are the nearest-rank values of recent frame times."""
+    # arrange
+    profiler = Profiler()
+    # act
+    for update_ms in range(100, 0, -1):
+        run_frame(profiler, counter, update_ms)
+    # assert
+    assert profiler.percentile_ms('update', 50) == pytest.approx(50)
+    assert profiler.percentile_ms('update', 95) == pytest.approx(95)
+    assert profiler.percentile_ms('update', 99) == pytest.approx(99)
+    assert profiler.percentile_ms(Profiler.FRAME, 99) == pytest.approx(99)
+    assert profiler.recent_mean_ms('update') == pytest.approx(50.5)
+
+
+def test_rolling_window_evicts_oldest_frames(counter: FakeCounter) -> None:
+    """Test that only the last `window` frames count towards recent statistics."""
+    # arrange
+    profiler = Profiler(window=3)
+    # act
+    for update_ms in (100, 1, 2, 3):
+        run_frame(profiler, counter, update_ms)
+    # assert
+    assert len(profiler.history) == 3
+    assert profiler.percentile_ms('update', 100) == pytest.approx(3)
+    assert profiler.recent_mean_ms('update') == pytest.approx(2)
+    assert profiler.mean_ms()['update'] == pytest.approx(106 / 4)
+
+
+def test_exported_trace_has_complete_events(
+    counter: FakeCounter, tmp_path: Path
+) -> None:
+    """Test that scopes and frames are exported as Chrome complete events."""
+    # arrange
+    profiler = Profiler()
+    path = tmp_path / 'trace.json'
+    run_frame(profiler, counter, 2)
+    run_frame(profiler, counter, 3)
+    # act
+    profiler.export_trace(path)
+    # assert
+    events = json.loads(path.read_text())['traceEvents']
+    assert [event['name'] for event in events] == [
+        'update',
+        Profiler.FRAME,
+        'update',
+        Profiler.FRAME,
+    ]
+    assert all(event['ph'] == 'X' for event in events)
+    assert [event['ts'] for event in events] == pytest.approx([0, 0, 2000, 2000])
+    assert [event['dur'] for event in events] == pytest.approx([2000, 2000, 3000, 3000])
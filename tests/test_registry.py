@@ -0,0 +1,72 @@
+from pathlib import Path
+
+import pytest
+
+from src.registry import ContentRegistry
+
+CONTENT_PATH = Path(__file__).parent.parent / 'data/content.json'
+
+
+def test_load_content_file() -> None:
+    """Test that the game's content file loads, with unknown IDs using the default."""
+    # arrange
+    # act
+    registry = ContentRegistry.load(CONTENT_PATH)
+    # assert
+    assert registry.zombie_class('a') is registry.default_zombie_class
+    assert registry.zombie_class('z') is registry.default_zombie_class
+    assert registry.zombie_class('k').health > registry.zombie_class('a').health
+    assert (CONTENT_PATH.parent.parent / registry.zombie_class('k').image).exists()
+
+
+def test_weapon_categories_are_built_afresh() -> None:
+    """Test that each call returns new weapons, so play doesn't change the content."""
+    # arrange
+    registry = ContentRegistry.load(CONTENT_PATH)
+    first = registry.weapon_categories()
+    first[0].weapons[0].ammo = 0
+    # act
+    second = registry.weapon_categories()
+    # assert
+    assert second[0].weapons[0] is not first[0].weapons[0]
+    assert second[0].weapons[0].ammo == second[0].weapons[0].max_ammo
+
+
+def test_unknown_weapon_sound_raises() -> None:
+    """Test that a weapon naming an unregistered sound is rejected at load time."""
+    # arrange
+    data = {
+        'sounds': {'weapons': ['glock']},
+        'zombie_classes': [
+            {
+                'id': 'a',
+                'health': 50,
+                'speed': 1.0,
+                'score': 5,
+                'xp': 1,
+                'image': 'images/zombie1.png',
+            }
+        ],
+        'weapon_categories': [
+            {
+                'name': 'pistols',
+                'weapons': [
+                    {
+                        'name': 'Glock(PDW)',
+                        'projectile_speed': 20,
+                        'fire_rate': 200,
+                        'damage': 24,
+                        'spread_angle': 0.08,
+                        'max_ammo': 15,
+                        'reload_time': 1900,
+                        'penetration': 1,
+                        'sounds': ['beretta'],
+                    }
+                ],
+            }
+        ],
+    }
+    # act
+    # assert
+    with pytest.raises(KeyError):
+        ContentRegistry(data)
@@ -0,0 +1,33 @@
+import pygame
+
+from src.renderer import DirtyRenderer
+
+
+def test_restore_erases_last_frame() -> None:
+    """Test that a still view is redrawn only where things moved or were drawn."""
+    # arrange
+    surface = pygame.Surface((100, 100))
+    sprite = pygame.Surface((10, 10))
+    sprite.fill((255, 0, 0))
+    backdrop = pygame.Surface((100, 100))
+    backdrop.fill((0, 0, 255))
+    renderer = DirtyRenderer(surface)
+    full_redraws = []
+    # act
+    for x in (10, 40, 70):
+        full = renderer.begin_frame(view='menu')
+        full_redraws.append(full)
+        if full:
+            surface.blit(backdrop, (0, 0))
+        else:
+            renderer.restore(backdrop)
+        renderer.blit(sprite, (x, 10))
+        renderer.blit(sprite, (200, 200))
+    expected = pygame.Surface((100, 100))
+    expected.fill((0, 0, 255))
+    expected.blit(sprite, (70, 10))
+    # assert
+    assert full_redraws == [True, False, False]
+    assert renderer.stale_rects == [pygame.Rect(40, 10, 10, 10)]
+    assert pygame.image.tobytes(surface, 'RGB') == pygame.image.tobytes(expected, 'RGB')
+    assert renderer.begin_frame(view='game')
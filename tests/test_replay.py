@@ -0,0 +1,42 @@
+from pathlib import Path
+
+import pygame
+
+from src.replay import FrameInput, HeldKeys, InputRecorder, InputReplay
+
+
+def test_recording_plays_back_input_and_settings(tmp_path: Path) -> None:
+    """Test that frames written by the recorder are read back unchanged, in order."""
+    # arrange
+    path = tmp_path / 'session.rec'
+    frames = [
+        FrameInput(16, (10, 20), (True, False, False), HeldKeys(frozenset())),
+        FrameInput(
+            17.5,
+            (11, 21),
+            (False, False, True),
+            HeldKeys(frozenset({pygame.K_w, pygame.K_d})),
+            [
+                pygame.event.Event(pygame.KEYDOWN, key=pygame.K_r),
+                pygame.event.Event(pygame.MOUSEWHEEL, y=-1),
+                pygame.event.Event(pygame.QUIT),
+            ],
+        ),
+    ]
+    recorder = InputRecorder(path, seed=42, settings={'sim_rate': 60})
+    for frame in frames:
+        recorder.record(frame)
+    recorder.close()
+    # act
+    replay = InputReplay(path)
+    played = [replay.next_frame(), replay.next_frame(), replay.next_frame()]
+    # assert
+    assert replay.seed == 42
+    assert replay.settings == {'sim_rate': 60}
+    assert played[2] is None
+    assert [frame.encode() for frame in played[:2]] == [
+        frame.encode() for frame in frames
+    ]
+    assert played[1].held_keys[pygame.K_w]
+    assert not played[1].held_keys[pygame.K_a]
+    assert played[1].events[0].key == pygame.K_r
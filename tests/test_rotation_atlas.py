@@ -0,0 +1,20 @@
+import pygame
+
+from src.rotation_atlas import RotationAtlas
+
+
+def test_tinted_frames_are_cached() -> None:
+    """Test that flashed and faded frames are made once and reused."""
+    # arrange
+    image = pygame.Surface((8, 8), pygame.SRCALPHA)
+    image.fill((100, 0, 0, 255))
+    atlas = RotationAtlas(image, steps=4)
+    # act
+    flashed = atlas.flash_frame(1)
+    faded = atlas.faded_frame(1, 120)
+    # assert
+    assert flashed is atlas.flash_frame(1)
+    assert flashed.get_at((4, 4)) == (255, 255, 255, 255)
+    assert faded is atlas.faded_frame(1, 125)
+    assert faded.get_alpha() == 119
+    assert atlas.frames[1].get_at((4, 4)) == (100, 0, 0, 255)
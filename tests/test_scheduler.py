@@ -0,0 +1,44 @@
+from collections.abc import Callable
+
+from src import game_clock
+from src.scheduler import Scheduler
+
+
+def test_run_due_runs_timers_in_time_order() -> None:
+    """Test that only due timers run, earliest first, and cancelled ones don't."""
+    # arrange
+    scheduler = Scheduler()
+    calls = []
+    scheduler.call_at(30, calls.append, 'c')
+    scheduler.call_at(10, calls.append, 'a')
+    cancelled = scheduler.call_at(20, calls.append, 'x')
+    scheduler.call_at(20, calls.append, 'b')
+    scheduler.call_at(50, calls.append, 'd')
+    scheduler.cancel(cancelled)
+    # act
+    ran = scheduler.run_due(40)
+    # assert
+    assert calls == ['a', 'b', 'c']
+    assert ran == 3
+    assert not cancelled.active
+    assert len(scheduler) == 1
+
+
+def test_repeating_timer_catches_up_once(
+    install_clock: Callable[[game_clock.Clock], None],
+) -> None:
+    """Test that a repeating timer which fell behind runs once, then from now on."""
+    # arrange
+    install_clock(game_clock.FixedStepClock())
+    scheduler = Scheduler()
+    calls = []
+    timer = scheduler.call_every(100, calls.append, 'tick')
+    # act
+    scheduler.run_due(100)
+    scheduler.run_due(550)
+    scheduler.run_due(600)
+    scheduler.run_due(650)
+    # assert
+    assert calls == ['tick', 'tick', 'tick']
+    assert timer.time == 750
+    assert timer.active
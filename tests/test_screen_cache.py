@@ -0,0 +1,27 @@
+import pygame
+
+from src.screen_cache import ScreenCache
+
+
+def test_get_draws_once_until_invalidated() -> None:
+    """Test that a screen is drawn on first use and after invalidation only."""
+    # arrange
+    screen = pygame.Surface((20, 10))
+    cache = ScreenCache(screen)
+    draws = []
+
+    def draw() -> None:
+        draws.append(len(draws))
+        screen.fill((len(draws), 0, 0))
+
+    # act
+    first = cache.get('menu', draw)
+    screen.fill((0, 0, 0))
+    second = cache.get('menu', draw)
+    cache.invalidate('menu')
+    third = cache.get('menu', draw)
+    # assert
+    assert second is first
+    assert first.get_at((0, 0)) == (1, 0, 0)
+    assert third.get_at((0, 0)) == (2, 0, 0)
+    assert len(draws) == 2
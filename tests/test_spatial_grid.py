@@ -0,0 +1,36 @@
+import pygame
+
+from src.spatial_grid import SpatialGrid
+
+
+def _sprite_at(pos: tuple[int, int]) -> pygame.sprite.Sprite:
+    sprite = pygame.sprite.Sprite()
+    sprite.rect = pygame.Rect(0, 0, 10, 10)
+    sprite.rect.center = pos
+    return sprite
+
+
+def test_query_radius() -> None:
+    """Test that only sprites within the radius are returned."""
+    # arrange
+    near = _sprite_at((100, 100))
+    far = _sprite_at((300, 100))
+    grid = SpatialGrid()
+    grid.rebuild([near, far])
+    # act
+    found = grid.query_radius((110, 100), 50)
+    # assert
+    assert found == [near]
+
+
+def test_query_segment() -> None:
+    """Test that sprites near a segment crossing several cells are returned."""
+    # arrange
+    on_path = _sprite_at((200, 205))
+    off_path = _sprite_at((200, 600))
+    grid = SpatialGrid()
+    grid.rebuild([on_path, off_path])
+    # act
+    found = grid.query_segment((0, 200), (400, 200), margin=16)
+    # assert
+    assert found == [on_path]
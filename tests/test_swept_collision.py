@@ -0,0 +1,34 @@
+import pygame
+
+from src.spatial_grid import SpatialGrid
+from src.swept_collision import SweptCollisions
+
+
+class Mover:
+    def __init__(self, start: tuple[float, float], end: tuple[float, float]) -> None:
+        self.previous_pos = pygame.math.Vector2(start)
+        self.pos = pygame.math.Vector2(end)
+
+
+def _target_at(pos: tuple[int, int]) -> pygame.sprite.Sprite:
+    sprite = pygame.sprite.Sprite()
+    sprite.rect = pygame.Rect(0, 0, 20, 20)
+    sprite.rect.center = pos
+    sprite.hitbox = sprite.rect.copy()
+    return sprite
+
+
+def test_hits_are_swept_and_ordered_along_path() -> None:
+    """Test that targets crossed within one step are hit, nearest first."""
+    # arrange
+    far = _target_at((300, 100))
+    near = _target_at((150, 100))
+    missed = _target_at((200, 300))
+    grid = SpatialGrid()
+    grid.rebuild([far, near, missed])
+    collisions = SweptCollisions(grid, margin=10)
+    mover = Mover((100, 100), (400, 100))
+    # act
+    hits = collisions.hits([mover, Mover((0, 0), (10, 0))])
+    # assert
+    assert hits == [(mover, [near, far])]
@@ -0,0 +1,20 @@
+import pygame
+
+from src.text_cache import TextCache
+
+
+def test_render_evicts_least_recently_used() -> None:
+    """Test that cached surfaces are reused and the oldest is evicted."""
+    # arrange
+    pygame.font.init()
+    font = pygame.font.Font(None, 20)
+    cache = TextCache(max_size=2)
+    first = cache.render(font, 'a', (255, 255, 255))
+    cache.render(font, 'b', (255, 255, 255))
+    # act
+    reused = cache.render(font, 'a', (255, 255, 255))
+    cache.render(font, 'c', (255, 255, 255))
+    # assert
+    assert reused is first
+    assert len(cache) == 2
+    assert cache.render(font, 'a', (255, 255, 255)) is first
@@ -0,0 +1,44 @@
+import pygame
+
+from src.flow_field import FlowField
+from src.zombie_swarm import ZombieSwarm
+
+
+class Member:
+    def __init__(self) -> None:
+        self.rect = pygame.Rect(0, 0, 10, 10)
+        self.swarm_slot: int | None = None
+
+
+def test_step_seeks_separates_and_syncs() -> None:
+    """Test that members move towards the goal, apart from each other and to rects."""
+    # arrange
+    swarm = ZombieSwarm()
+    flow_field = FlowField(goal=(5, 5), grid_size=(10, 10))
+    members = [Member(), Member()]
+    for member, y in zip(members, (40.0, 41.0), strict=True):
+        swarm.add(member, pos=(40.0, y), speed=1.0, size=(10, 10))
+    # act
+    for _ in range(10):
+        swarm.step(flow_field=flow_field, fallback_target=(0, 0), now=0)
+    swarm.sync()
+    # assert
+    assert all(member.rect.centerx > 40 for member in members)
+    assert members[1].rect.centery - members[0].rect.centery > 1
+    assert (swarm.frame_indices[:2] >= 0).all()
+
+
+def test_remove_moves_last_member_into_slot() -> None:
+    """Test that removing a member keeps the arrays packed."""
+    # arrange
+    swarm = ZombieSwarm(capacity=1)
+    members = [Member(), Member(), Member()]
+    for i, member in enumerate(members):
+        swarm.add(member, pos=(float(i), 0.0), speed=1.0, size=(10, 10))
+    # act
+    swarm.remove(members[0])
+    # assert
+    assert len(swarm) == 2
+    assert members[0].swarm_slot is None
+    assert members[2].swarm_slot == 0
+    assert swarm.positions[0].tolist() == [2.0, 0.0]